@@ -5,7 +5,9 @@ The dispatch parser's win is on the PER-FRAME comment line, so it is amortised
 away on single huge frames (see bench_read.py) and shows up on files with many
 small frames. This sweeps atoms-per-frame at a fixed total atom count and times
 the C reader both ways (per-atom tokenizer in both; only the comment parser
-differs).
+differs). The last column is the full ASE read (dispatch parser) through
+``read_cextxyz_batch``, which converts all frames to Atoms together, relative
+to the per-frame ``ase.io.read``.
 
 Run::
 
@@ -23,6 +25,7 @@ from pathlib import Path
 import ase.io
 import ase_extxyz.io  # noqa: F401  (registers the 'cextxyz' format)
 import extxyz
+from ase_extxyz.io import read_cextxyz_batch
 
 from bench_read import make_xyz   # reuse the synthetic-frame generator
 
@@ -47,7 +50,8 @@ def main():
     per_frame = [5, 10, 20, 50, 100, 500, 2000]
 
     hdr = (f'{"atoms/frame":>11}  {"frames":>7}  {"MB":>6}  '
-           f'{"cleri":>9}  {"dispatch":>9}  {"speedup":>8}  {"full rd speedup":>15}')
+           f'{"cleri":>9}  {"dispatch":>9}  {"speedup":>8}  {"full rd speedup":>15}  '
+           f'{"batch":>9}  {"batch speedup":>13}')
     print(hdr); print('-' * len(hdr))
 
     rows = []
@@ -66,18 +70,22 @@ def main():
                                                      use_cleri=True), args.repeats)
             t_disp_full = _best(lambda: ase.io.read(sp, format='cextxyz', index=':',
                                                     use_cleri=False), args.repeats)
+            t_batch = _best(lambda: read_cextxyz_batch(sp, use_cleri=False), args.repeats)
 
             speedup = t_cleri / t_disp if t_disp else float('nan')
             full_speedup = t_cleri_full / t_disp_full if t_disp_full else float('nan')
+            batch_speedup = t_disp_full / t_batch if t_batch else float('nan')
             rows.append(dict(atoms_per_frame=nat, frames=nframes, file_mb=mb,
                              read_dicts_cleri_s=t_cleri, read_dicts_dispatch_s=t_disp,
                              dispatch_speedup=speedup,
                              full_read_cleri_s=t_cleri_full,
                              full_read_dispatch_s=t_disp_full,
-                             full_read_speedup=full_speedup))
+                             full_read_speedup=full_speedup,
+                             full_read_batch_s=t_batch,
+                             batch_speedup=batch_speedup))
             print(f'{nat:>11}  {nframes:>7}  {mb:>6.1f}  '
                   f'{t_cleri:>8.3f}s  {t_disp:>8.3f}s  {speedup:>7.2f}x  '
-                  f'{full_speedup:>14.2f}x')
+                  f'{full_speedup:>14.2f}x  {t_batch:>8.3f}s  {batch_speedup:>12.2f}x')
 
     args.out.parent.mkdir(parents=True, exist_ok=True)
     with args.out.open('w', newline='') as f:
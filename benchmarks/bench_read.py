@@ -8,12 +8,19 @@ Run::
 
     python benchmarks/bench_read.py [--out benchmarks/results.csv]
                                     [--max-atoms 100000]
-                                    [--repeats 3]
+                                    [--repeats 3] [--tokenizer-only]
 
 Output:
 - CSV table at the chosen path with columns:
     natoms, frames, file_mb, builtin_s, cextxyz_s, speedup
 - Stdout: pretty table for the README.
+
+``--tokenizer-only`` times just the default tokenizer read (``read_dicts``
+with ``use_regex=False``) and prints MB/s instead, without writing the CSV.
+Run it once on a normal build and once on a build with the SIMD field
+splitter compiled out, to measure that path end to end::
+
+    CFLAGS=-DEXTXYZ_SCALAR_SCAN pip install --no-build-isolation .
 """
 from __future__ import annotations
 
@@ -93,6 +100,19 @@ def time_read_dicts_fast(path: Path, repeats: int) -> float:
     return _best_of(lambda: extxyz.read_dicts(str(path), use_regex=False), repeats)
 
 
+def tokenizer_sweep(sizes, frames: int, repeats: int):
+    header = f'{"N atoms":>10}  {"frames":>6}  {"file MB":>8}  {"rd_fast":>9}  {"MB/s":>8}'
+    print(header)
+    print('-' * len(header))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n in sizes:
+            path = Path(tmpdir) / f'bench_{n}.xyz'
+            file_mb = make_xyz(path, n, frames) / 1e6
+            t = time_read_dicts_fast(path, repeats)
+            print(f'{n:>10}  {frames:>6}  {file_mb:>8.2f}  {t:>9.4f}  '
+                  f'{file_mb / t:>8.1f}')
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--out', type=Path,
@@ -102,6 +122,8 @@ def main():
                         help='frames per file (default 1)')
     parser.add_argument('--repeats', type=int, default=3,
                         help='best-of-N timings (default 3)')
+    parser.add_argument('--tokenizer-only', action='store_true',
+                        help='time only the tokenizer read_dicts, print MB/s')
     args = parser.parse_args()
 
     # Geometric sweep of system sizes.
@@ -115,6 +137,10 @@ def main():
     if sizes[-1] != args.max_atoms:
         sizes.append(args.max_atoms)
 
+    if args.tokenizer_only:
+        tokenizer_sweep(sizes, args.frames, args.repeats)
+        return
+
     rows = []
     args.out.parent.mkdir(parents=True, exist_ok=True)
     header = (f'{"N atoms":>10}  {"frames":>6}  {"file MB":>8}  '
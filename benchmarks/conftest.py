@@ -0,0 +1,178 @@
+"""pytest-benchmark regression suite for the hot read/write paths.
+
+Run::
+
+    pytest benchmarks                        # quick mode: pre-merge check
+    pytest benchmarks --bench-mode full      # every frame size, more rounds
+    pytest benchmarks --bench-update         # re-record baselines.json
+
+Every benchmark works on synthetic frames generated with numpy and written by
+``extxyz.write_dicts`` (no ASE, chemfiles or network). Each round is
+normalised by a fixed pure-Python calibration workload, timed on the same
+machine in the benchmark's ``setup`` just before that round (so that both see
+the same load), and ``baselines.json`` carries over between machines to first
+order. A benchmark fails when the median of its normalised rounds exceeds the
+baseline by more than ``--bench-threshold`` (default 30%); benchmarks without
+a baseline only report. Quick mode runs the smallest and largest frame sizes
+only, with fewer rounds; the file size per frame size is the same in both
+modes, so they share baselines.
+"""
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+try:
+    import pytest_benchmark  # noqa: F401
+except ImportError:
+    collect_ignore_glob = ['test_*.py']
+
+from extxyz import Frame, write_dicts
+
+BASELINES = Path(__file__).with_name('baselines.json')
+
+#: atoms per frame; each file holds about TOTAL_ATOMS atoms
+FRAME_SIZES = {'quick': [8, 2048], 'full': [1, 8, 64, 512, 2048]}
+TOTAL_ATOMS = 40_000
+ROUNDS = {'quick': 5, 'full': 15}
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('extxyz benchmarks')
+    group.addoption('--bench-mode', choices=('quick', 'full'), default='quick',
+                    help='quick: two frame sizes, few rounds (default); '
+                         'full: every frame size')
+    group.addoption('--bench-threshold', type=float, default=0.3,
+                    help='allowed slowdown over the baseline, as a fraction '
+                         '(default 0.3)')
+    group.addoption('--bench-update', action='store_true',
+                    help='write the measured times to baselines.json '
+                         'instead of checking them')
+
+
+def pytest_generate_tests(metafunc):
+    if 'natoms' in metafunc.fixturenames:
+        mode = metafunc.config.getoption('--bench-mode')
+        metafunc.parametrize('natoms', FRAME_SIZES[mode],
+                             ids=lambda n: f'{n}at')
+
+
+def _calibration_workload():
+    # float formatting and parsing, the same kind of work as the code under
+    # test, but in the interpreter only so it does not change with extxyz
+    values = [i * 0.37 - 1234.5 for i in range(20_000)]
+    text = ' '.join('%16.8f' % v for v in values)
+    return sum(float(t) for t in text.split())
+
+
+def calibrate(rounds=2):
+    """Best time (s) of the calibration workload on this machine, now."""
+    best = float('inf')
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        _calibration_workload()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def relative_time(fn, rounds):
+    """Median over ``rounds`` of the time of ``fn`` over the calibration time
+    measured just before it."""
+    ratios = []
+    for _ in range(rounds):
+        calibration = calibrate()
+        t0 = time.perf_counter()
+        fn()
+        ratios.append((time.perf_counter() - t0) / calibration)
+    return statistics.median(ratios)
+
+
+def make_frames(natoms, nframes, seed=0):
+    """``nframes`` frames of ``natoms`` atoms with info, pos, forces and an
+    integer column, as a training-set trajectory would have."""
+    rng = np.random.default_rng(seed)
+    species = np.array(['Si', 'O', 'H', 'C'])
+    return [Frame(natoms=natoms, cell=np.eye(3) * 10.0 + rng.random((3, 3)),
+                  pbc=np.array([True, True, True]),
+                  info={'energy': float(rng.normal()), 'step': k,
+                        'config_type': 'md'},
+                  arrays={'species': species[rng.integers(0, 4, natoms)],
+                          'pos': rng.random((natoms, 3)) * 10.0,
+                          'forces': rng.standard_normal((natoms, 3)),
+                          'tag': rng.integers(0, 100, natoms)})
+            for k in range(nframes)]
+
+
+@pytest.fixture(scope='session')
+def bench_data(tmp_path_factory):
+    """``bench_data(natoms)``: (frames, path) of a file of that frame size,
+    generated once per session."""
+    root = tmp_path_factory.mktemp('bench')
+    cache = {}
+
+    def get(natoms):
+        if natoms not in cache:
+            frames = make_frames(natoms, max(1, TOTAL_ATOMS // natoms))
+            path = root / f'{natoms}at.xyz'
+            write_dicts(path, frames, use_cextxyz=True)
+            cache[natoms] = frames, path
+        return cache[natoms]
+    return get
+
+
+@pytest.fixture(scope='session')
+def _baselines(request):
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    measured = {}
+    yield baselines, measured
+    if request.config.getoption('--bench-update') and measured:
+        baselines.update(measured)
+        BASELINES.write_text(json.dumps(dict(sorted(baselines.items())),
+                                        indent=1) + '\n')
+
+
+@pytest.fixture
+def run_bench(request, benchmark, _baselines):
+    """``run_bench(fn)`` times ``fn`` and checks it against the baseline.
+
+    The time of each round is divided by that of the calibration workload run
+    just before it, and the median of these ratios is compared. A run over the
+    threshold is measured twice more, keeping the best, before it fails.
+    """
+    baselines, measured = _baselines
+    rounds = ROUNDS[request.config.getoption('--bench-mode')]
+    threshold = request.config.getoption('--bench-threshold')
+    name = request.node.name
+
+    def run(fn):
+        calibrations = []
+        result = benchmark.pedantic(
+            fn, setup=lambda: calibrations.append(calibrate()),
+            rounds=rounds, warmup_rounds=1)
+        if benchmark.disabled:
+            return result
+        # the warmup round has a calibration but no timing
+        times = benchmark.stats.stats.data
+        relative = statistics.median(
+            t / c for t, c in zip(times, calibrations[1:]))
+        update = request.config.getoption('--bench-update')
+        if not update and name in baselines:
+            limit = baselines[name] * (1 + threshold)
+            for _ in range(2):
+                if relative <= limit:
+                    break
+                relative = min(relative, relative_time(fn, rounds))
+            assert relative <= limit, (
+                f'{name}: {relative:.3f} calibration units, baseline '
+                f'{baselines[name]:.3f} '
+                f'(+{100 * (relative / baselines[name] - 1):.0f}%, '
+                f'threshold {100 * threshold:.0f}%)')
+        benchmark.extra_info['relative'] = relative
+        measured[name] = round(relative, 4)
+        return result
+    return run
@@ -0,0 +1,29 @@
+"""Regression benchmarks of the C read and write paths (see conftest.py).
+
+Reading is timed for each per-atom parser (tokenizer or PCRE2 regex) and
+comment-line parser (libcleri grammar or first-character dispatch), writing
+for the C writer with the default and an explicit float format; both at each
+frame size, over files of about the same number of atoms.
+"""
+import pytest
+
+from extxyz import read_dicts, write_dicts
+
+
+@pytest.mark.parametrize('use_cleri', [True, False], ids=['cleri', 'dispatch'])
+@pytest.mark.parametrize('use_regex', [False, True], ids=['tokenizer', 'regex'])
+def test_read(run_bench, bench_data, natoms, use_regex, use_cleri):
+    frames, path = bench_data(natoms)
+    got = run_bench(lambda: read_dicts(path, use_regex=use_regex,
+                                       use_cleri=use_cleri))
+    assert len(got) == len(frames) if len(frames) > 1 else got.natoms == natoms
+
+
+@pytest.mark.parametrize('float_format', [None, '%.10e'],
+                         ids=['default', 'e10'])
+def test_write(run_bench, bench_data, natoms, tmp_path, float_format):
+    frames, _ = bench_data(natoms)
+    out = tmp_path / 'out.xyz'
+    kw = {} if float_format is None else {'format_dict': {'R': float_format}}
+    run_bench(lambda: write_dicts(out, frames, use_cextxyz=True, **kw))
+    assert out.stat().st_size > 0
@@ -1,6 +1,5 @@
 '''extxyz key=value Grammar.'''
-from pyleri import (Ref, Choice, Grammar, Regex, Keyword, Optional,
-                    Repeat, Sequence, List)
+import functools
 
 # These regexs are defined outside grammar so they can be reused
 properties_val_re = '([a-zA-Z_][a-zA-Z_0-9]*):([RILS]):([0-9]+)'
@@ -36,79 +35,96 @@ integer_fmt = '%8d'
 string_fmt = '%s'
 bool_fmt = '%.1s'
 
-class ExtxyzKVGrammar(Grammar):
-    r_barestring = Regex(barestring_re)
-    r_dq_quotedstring = Regex(dq_quotedstring_re)
-    r_cb_quotedstring = Regex(cb_quotedstring_re)
-    r_sb_quotedstring = Regex(sb_quotedstring_re)
-    r_string = Choice(r_barestring, r_dq_quotedstring, r_cb_quotedstring, r_sb_quotedstring)
-
-    r_integer = Regex(integer_re)
-    r_float = Regex(float_re)
-
-    r_true = Regex(true_re)
-    r_false = Regex(false_re)
-
-    ints = List(r_integer, mi=1)
-    floats = List(r_float, mi=1)
-    bools = List(Choice(r_true, r_false), mi=1)
-    strings = List(r_string, mi=1)
-
-    ints_sp = Repeat(r_integer, mi=1)
-    floats_sp = Repeat(r_float, mi=1)
-    bools_sp = Repeat(Choice(r_true, r_false), mi=1)
-    strings_sp = Repeat(r_string, mi=1)
-
-    # Single quotes are a backward-compatible quote container equivalent to
-    # double quotes (the old Fortran/C reader treated ', " and {} alike):
-    # ints/floats/bools only, no strings. (A string-only single-quote
-    # container is a separate, deferred proposal — issue #5.)
-    old_one_d_array = Choice(Sequence('"', Choice(ints_sp, ints, floats_sp, floats, bools_sp, bools), '"'),
-                             Sequence("'", Choice(ints_sp, ints, floats_sp, floats, bools_sp, bools), "'"),
-                             Sequence('{', Choice(ints_sp, ints, floats_sp, floats, bools_sp, bools, strings_sp, strings), '}'))
-
-    one_d_array_i = Sequence('[', ints, ']')
-    one_d_array_f = Sequence('[', floats, ']')
-    one_d_array_b = Sequence('[', bools, ']')
-    one_d_array_s = Sequence('[', strings, ']')
-
-    # one_d_arrays = List(one_d_array, mi=1)
-    one_d_arrays = Choice(List(one_d_array_i, mi=1), List(one_d_array_f, mi=1),
-                          List(one_d_array_b, mi=1), List(one_d_array_s, mi=1))
-
-    two_d_array = Sequence('[', one_d_arrays, ']')
-
-    key_item = Choice(r_string)
-
-    val_item = Choice(
-        r_integer,
-        r_float,
-        r_true,
-        r_false,
-        two_d_array,
-        old_one_d_array,
-        one_d_array_i,
-        one_d_array_f,
-        one_d_array_b,
-        one_d_array_s,
-        r_string)
-
-    kv_pair = Sequence(key_item, '=', val_item, Regex(r'\s*'))
-   
-    properties = Keyword('Properties', ign_case=True)
-    properties_val_str = Regex(rf'^{properties_val_re}(:{properties_val_re})*')
-    properties_kv_pair = Sequence(properties, '=', 
-                                  properties_val_str, Regex(r'\s*'))
-    
-    all_kv_pair = Choice(properties_kv_pair, kv_pair, most_greedy=False)
-
-    START = Repeat(all_kv_pair)
+# The pyleri grammar class is only built (and pyleri only imported) when
+# ExtxyzKVGrammar is first looked up, so the regex and format strings above
+# can be imported without paying for it.
+@functools.cache
+def _grammar_class():
+    from pyleri import (Ref, Choice, Grammar, Regex, Keyword, Optional,
+                        Repeat, Sequence, List)
+
+    class ExtxyzKVGrammar(Grammar):
+        r_barestring = Regex(barestring_re)
+        r_dq_quotedstring = Regex(dq_quotedstring_re)
+        r_cb_quotedstring = Regex(cb_quotedstring_re)
+        r_sb_quotedstring = Regex(sb_quotedstring_re)
+        r_string = Choice(r_barestring, r_dq_quotedstring, r_cb_quotedstring, r_sb_quotedstring)
+
+        r_integer = Regex(integer_re)
+        r_float = Regex(float_re)
+
+        r_true = Regex(true_re)
+        r_false = Regex(false_re)
+
+        ints = List(r_integer, mi=1)
+        floats = List(r_float, mi=1)
+        bools = List(Choice(r_true, r_false), mi=1)
+        strings = List(r_string, mi=1)
+
+        ints_sp = Repeat(r_integer, mi=1)
+        floats_sp = Repeat(r_float, mi=1)
+        bools_sp = Repeat(Choice(r_true, r_false), mi=1)
+        strings_sp = Repeat(r_string, mi=1)
+
+        # Single quotes are a backward-compatible quote container equivalent to
+        # double quotes (the old Fortran/C reader treated ', " and {} alike):
+        # ints/floats/bools only, no strings. (A string-only single-quote
+        # container is a separate, deferred proposal — issue #5.)
+        old_one_d_array = Choice(Sequence('"', Choice(ints_sp, ints, floats_sp, floats, bools_sp, bools), '"'),
+                                 Sequence("'", Choice(ints_sp, ints, floats_sp, floats, bools_sp, bools), "'"),
+                                 Sequence('{', Choice(ints_sp, ints, floats_sp, floats, bools_sp, bools, strings_sp, strings), '}'))
+
+        one_d_array_i = Sequence('[', ints, ']')
+        one_d_array_f = Sequence('[', floats, ']')
+        one_d_array_b = Sequence('[', bools, ']')
+        one_d_array_s = Sequence('[', strings, ']')
+
+        # one_d_arrays = List(one_d_array, mi=1)
+        one_d_arrays = Choice(List(one_d_array_i, mi=1), List(one_d_array_f, mi=1),
+                              List(one_d_array_b, mi=1), List(one_d_array_s, mi=1))
+
+        two_d_array = Sequence('[', one_d_arrays, ']')
+
+        key_item = Choice(r_string)
+
+        val_item = Choice(
+            r_integer,
+            r_float,
+            r_true,
+            r_false,
+            two_d_array,
+            old_one_d_array,
+            one_d_array_i,
+            one_d_array_f,
+            one_d_array_b,
+            one_d_array_s,
+            r_string)
+
+        kv_pair = Sequence(key_item, '=', val_item, Regex(r'\s*'))
+
+        properties = Keyword('Properties', ign_case=True)
+        properties_val_str = Regex(rf'^{properties_val_re}(:{properties_val_re})*')
+        properties_kv_pair = Sequence(properties, '=', 
+                                      properties_val_str, Regex(r'\s*'))
+
+        all_kv_pair = Choice(properties_kv_pair, kv_pair, most_greedy=False)
+
+        START = Repeat(all_kv_pair)
+
+    return ExtxyzKVGrammar
+
+
+def __getattr__(name):
+    if name == 'ExtxyzKVGrammar':
+        return _grammar_class()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 def to_C_str(s):
     return '"' + s.replace('\\', '\\\\').replace('"', '\\"') + '"'
 
 def write_grammar(dest_dir): 
-    src, hdr = ExtxyzKVGrammar().export_c(target='extxyz_kv_grammar', c_indent=' ' * 4)
+    src, hdr = _grammar_class()().export_c(target='extxyz_kv_grammar', c_indent=' ' * 4)
     with open(f'{dest_dir}/extxyz_kv_grammar.c', 'w') as fsrc, open(f'{dest_dir}/extxyz_kv_grammar.h', 'w') as fhdr:
         fsrc.write(src)
         fhdr.write(hdr)
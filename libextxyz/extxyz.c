@@ -1,6 +1,13 @@
+#include <errno.h>
+#include <limits.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
+#ifdef _WIN32
+#include <io.h>
+#else
+#include <unistd.h>
+#endif
 
 #define PCRE2_CODE_UNIT_WIDTH 8
 #include <pcre2.h>
@@ -10,6 +17,19 @@
 #include "extxyz.h"
 #include "extxyz_dispatch.h"
 #include "fast_format.h"
+#include "fast_parse.h"
+#include "fast_scan.h"
+#include "extxyz_thread.h"
+#include "extxyz_stats.h"
+
+// count allocations for the stats (see extxyz_stats.h)
+#define malloc(n) extxyz_stats_malloc(n)
+#define calloc(n, size) extxyz_stats_calloc(n, size)
+
+// Held around cleri_parse: libcleri parses mutate match data owned by the
+// grammar (see extxyz_read_ll_state). Everything else in the read and write
+// paths works on per-call or per-state data, so it needs no locking.
+static extxyz_mutex_t cleri_parse_lock = EXTXYZ_MUTEX_INIT;
 
 void init_DictEntry(DictEntry *entry, const char *key, const int key_len) {
     if (key) {
@@ -32,38 +52,20 @@ void init_DictEntry(DictEntry *entry, const char *key, const int key_len) {
     entry->next = 0;
 }
 
-// Fast path for the common per-atom float: "[+-]?int[.frac]" with no exponent
-// and <= 15 significant digits. Then the integer mantissa is < 2^53 and 10^frac
-// is an exact double, so the single `mant / 10^frac` is correctly rounded and
-// bit-identical to strtod. Returns 1 on success; 0 (fall back to strtod) for an
-// exponent, 16+ digits, or any trailing character — so high-precision and
-// scientific values keep strtod's correct rounding. ~2.5x faster than strtod.
+// Plain decimals, exponents (including Fortran d/D) and up to 19 significant
+// digits are parsed exactly by extxyz_parse_double (fast_parse.c); anything else
+// falls back to strtod/atof, which are also the arbiters of what is invalid.
 static int parse_double_fast(const char *s, double *out) {
-    static const double POW10[] = {1e0,1e1,1e2,1e3,1e4,1e5,1e6,1e7,1e8,
-                                   1e9,1e10,1e11,1e12,1e13,1e14,1e15};
-    const char *p = s;
-    int neg = 0;
-    if (*p == '-') { neg = 1; p++; } else if (*p == '+') { p++; }
-    unsigned long long mant = 0;
-    int dig = 0, frac = 0;
-    while (*p >= '0' && *p <= '9') { mant = mant*10 + (unsigned)(*p - '0'); p++; dig++; }
-    if (*p == '.') {
-        p++;
-        while (*p >= '0' && *p <= '9') { mant = mant*10 + (unsigned)(*p - '0'); p++; dig++; frac++; }
-    }
-    if (*p != '\0' || dig == 0 || dig > 15 || frac > 15) {
-        return 0;
-    }
-    double v = (double)mant / POW10[frac];
-    *out = neg ? -v : v;
-    return 1;
+    return extxyz_parse_double(s, s + strlen(s), out);
 }
 
 double atof_eEdD(char *str) {
     double v;
     if (parse_double_fast(str, &v)) {
+        EXTXYZ_STATS_ADD(FLOATS_FAST, 1);
         return v;
     }
+    EXTXYZ_STATS_ADD(FLOATS_STRTOD, 1);
     for (unsigned long i=0; i < strlen(str); i++) {
         if (str[i] == 'd' || str[i] == 'D') {
             str[i] = 'e';
@@ -73,43 +75,75 @@ double atof_eEdD(char *str) {
     return (atof(str));
 }
 
-// Validated per-atom field parsers for the tokenizer (use_tokenizer) path. The
-// regex path validates each field as a side effect of matching; the tokenizer
-// just splits on whitespace, so these reject malformed tokens (return 0) that
-// atoi/atof would silently accept (e.g. "NOTANUM" -> 0). Each token is
-// NUL-terminated.
-static int parse_int_field(const char *tok, int *out) {
-    char *end;
-    long v = strtol(tok, &end, 10);
-    if (end == tok || *end != '\0') return 0;   // empty or trailing junk
-    *out = (int) v;                              // truncates like atoi (parity)
+// Validated per-atom field parsers. The regex path validates each field as a
+// side effect of matching; the tokenizer just splits on whitespace, so these
+// reject malformed tokens (return 0) that atoi/atof would silently accept (e.g.
+// "NOTANUM" -> 0). Tokens are (pointer, length) and need not be NUL-terminated,
+// so the line being parsed is never written to.
+
+// [+-]?[0-9]+ within the range of int; out-of-range values are rejected
+// rather than wrapped.
+static int parse_int_field(const char *tok, size_t len, int *out) {
+    const char *p = tok, *end = tok + len;
+    int neg = 0;
+    if (p < end && (*p == '+' || *p == '-')) { neg = (*p == '-'); p++; }
+    if (p == end) return 0;
+    const unsigned long long limit = neg ? (unsigned long long) INT_MAX + 1 : (unsigned long long) INT_MAX;
+    unsigned long long v = 0;
+    for (; p < end; p++) {
+        unsigned d = (unsigned) (unsigned char) *p - '0';
+        if (d > 9) return 0;
+        v = v*10 + d;
+        if (v > limit) return 0;
+    }
+    *out = neg ? (int) -(long long) v : (int) v;
     return 1;
 }
 
-static int parse_double_field(char *tok, double *out) {
-    if (parse_double_fast(tok, out)) return 1;   // exact fast path
+static int parse_double_field(const char *tok, size_t len, double *out) {
+    if (extxyz_parse_double(tok, tok + len, out)) {   // exact fast path
+        EXTXYZ_STATS_ADD(FLOATS_FAST, 1);
+        return 1;
+    }
+    EXTXYZ_STATS_ADD(FLOATS_STRTOD, 1);
     // reject leads that strtod would otherwise accept (inf, nan, 0x hex)
     const char *p = tok;
-    if (*p == '+' || *p == '-') p++;
-    if (!((*p >= '0' && *p <= '9') || *p == '.')) return 0;
-    for (char *q = tok; *q; q++) { if (*q == 'd' || *q == 'D') { *q = 'e'; break; } }
+    if (p < tok + len && (*p == '+' || *p == '-')) p++;
+    if (!(p < tok + len && ((*p >= '0' && *p <= '9') || *p == '.'))) return 0;
+    // rare slow path (> 19 significant digits): strtod on a NUL-terminated copy
+    char buf[128], *copy = buf;
+    if (len >= sizeof buf && !(copy = (char *) malloc(len + 1))) return 0;
+    memcpy(copy, tok, len);
+    copy[len] = '\0';
+    for (char *q = copy; *q; q++) { if (*q == 'd' || *q == 'D') { *q = 'e'; break; } }
     char *end;
-    double v = strtod(tok, &end);
-    if (end == tok || *end != '\0') return 0;
-    *out = v;
-    return 1;
+    double v = strtod(copy, &end);
+    int ok = (end != copy && *end == '\0');
+    if (copy != buf) free(copy);
+    if (ok) *out = v;
+    return ok;
 }
 
-static int parse_bool_field(const char *tok, int *out) {
-    // accept exactly the BOOL_RE set; value computed as the regex fill does
-    // (tok[0]=='T'), so the two read modes agree bit-for-bit on valid input
-    if (strcmp(tok, "T") == 0 || strcmp(tok, "F") == 0 ||
-        strcmp(tok, "true") == 0 || strcmp(tok, "True") == 0 || strcmp(tok, "TRUE") == 0 ||
-        strcmp(tok, "false") == 0 || strcmp(tok, "False") == 0 || strcmp(tok, "FALSE") == 0) {
-        *out = (tok[0] == 'T');
-        return 1;
+// exactly the BOOL_RE language: T F true True TRUE false False FALSE
+static int parse_bool_field(const char *tok, size_t len, int *out) {
+    switch (len) {
+        case 1:
+            if (tok[0] != 'T' && tok[0] != 'F') return 0;
+            *out = (tok[0] == 'T');
+            return 1;
+        case 4:
+            if (!((tok[0] == 't' || tok[0] == 'T') && tok[1] == 'r' && tok[2] == 'u' && tok[3] == 'e') &&
+                !(tok[0] == 'T' && tok[1] == 'R' && tok[2] == 'U' && tok[3] == 'E')) return 0;
+            *out = 1;
+            return 1;
+        case 5:
+            if (!((tok[0] == 'f' || tok[0] == 'F') && tok[1] == 'a' && tok[2] == 'l' && tok[3] == 's' && tok[4] == 'e') &&
+                !(tok[0] == 'F' && tok[1] == 'A' && tok[2] == 'L' && tok[3] == 'S' && tok[4] == 'E')) return 0;
+            *out = 0;
+            return 1;
+        default:
+            return 0;
     }
-    return 0;
 }
 
 void unquote(char *str) {
@@ -572,6 +606,9 @@ void free_data(void *data, enum data_type data_t, int nrows, int ncols, int widt
 
 
 void free_dict(DictEntry *dict) {
+    if (! dict) {
+        return;
+    }
     DictEntry *next_entry = dict->next;
     for (DictEntry *entry = dict; entry; entry = next_entry) {
         if (entry->key) {
@@ -671,8 +708,11 @@ void strcat_realloc(char **str, unsigned long *len, char *add_str) {
 }
 
 char *read_line(char **line, unsigned long *line_len, FILE *fp) {
+    unsigned long long t;
+    EXTXYZ_STATS_START(t);
     char *stat = fgets(*line, *line_len, fp);
     if (!stat) {
+        EXTXYZ_STATS_STOP(LINE_IO_NS, t);
         return 0;
     }
     while (strlen(*line) == *line_len-1) {
@@ -685,17 +725,358 @@ char *read_line(char **line, unsigned long *line_len, FILE *fp) {
 
         stat = fgets(*line + *line_len - STR_INCR - 1, STR_INCR + 1, fp);
         if (!stat) {
+            EXTXYZ_STATS_STOP(LINE_IO_NS, t);
             return 0;
         }
     }
+    if (t) {
+        EXTXYZ_STATS_STOP(LINE_IO_NS, t);
+        extxyz_stats_add(EXTXYZ_STAT_LINES, 1);
+        extxyz_stats_add(EXTXYZ_STAT_BYTES, strlen(*line));
+    }
     return *line;
 }
 
-// use_tokenizer: if non-zero, parse per-atom lines by whitespace-tokenising and
-// validating each field, instead of compiling and matching a per-line PCRE2
-// regex. Faster, opt-in; slightly more lenient than the grammar on numeric
-// edge cases. extxyz_read_ll (below) is the regex default.
-int extxyz_read_ll_opts(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEntry **info, DictEntry **arrays, char *comment, char *error_message, int use_tokenizer, int use_cleri) {
+// A line read by read_line() that doesn't end in '\n' was cut off by EOF.
+static int line_incomplete(const char *line) {
+    size_t len = strlen(line);
+    return len == 0 || line[len-1] != '\n';
+}
+
+// Number of data items held by a DictEntry (scalar, vector or matrix).
+static size_t entry_n_items(const DictEntry *entry) {
+    if (entry->nrows == 0)
+        return entry->ncols == 0 ? 1 : (size_t) entry->ncols;
+    return (size_t) entry->nrows * (size_t) entry->ncols;
+}
+
+// Deep copy of a finalized dict (no data linked lists), or NULL if out of memory.
+static DictEntry *dict_copy(const DictEntry *dict) {
+    DictEntry *head = 0, **tail = &head;
+    for (const DictEntry *src = dict; src; src = src->next) {
+        DictEntry *dst = (DictEntry *) malloc(sizeof(DictEntry));
+        if (! dst) goto fail;
+        init_DictEntry(dst, src->key, src->key ? (int) strlen(src->key) : -1);
+        dst->data_t = src->data_t;
+        dst->nrows = src->nrows;
+        dst->ncols = src->ncols;
+        dst->n_in_row = src->n_in_row;
+        *tail = dst;
+        tail = &dst->next;
+        if (! src->data)
+            continue;
+        size_t n = entry_n_items(src);
+        if (src->data_t == data_s && src->n_in_row < 0) {
+            size_t nbytes = n * (size_t)(-src->n_in_row);
+            if (! (dst->data = malloc(nbytes))) goto fail;
+            memcpy(dst->data, src->data, nbytes);
+        } else if (src->data_t == data_s) {
+            if (! (dst->data = calloc(n, sizeof(char *)))) goto fail;
+            for (size_t i = 0; i < n; i++) {
+                const char *str = ((char **)(src->data))[i];
+                size_t len = strlen(str) + 1;
+                char *copy = (char *) malloc(len);
+                if (! copy) goto fail;
+                memcpy(copy, str, len);
+                ((char **)(dst->data))[i] = copy;
+            }
+        } else {
+            size_t nbytes = n * (src->data_t == data_f ? sizeof(double) : sizeof(int));
+            if (! (dst->data = malloc(nbytes))) goto fail;
+            memcpy(dst->data, src->data, nbytes);
+        }
+    }
+    return head;
+fail:
+    if (head) free_dict(head);
+    return 0;
+}
+
+// FNV-1a, 64 bit
+static unsigned long long comment_hash(const char *s) {
+    unsigned long long h = 14695981039346656037ULL;
+    for (; *s; s++) {
+        h ^= (unsigned char) *s;
+        h *= 1099511628211ULL;
+    }
+    return h;
+}
+
+static void cache_unlink(ExtxyzReadState *rs, ExtxyzCommentCacheEntry *ce) {
+    if (ce->prev) ce->prev->next = ce->next; else rs->cache_head = ce->next;
+    if (ce->next) ce->next->prev = ce->prev; else rs->cache_tail = ce->prev;
+    ce->prev = ce->next = 0;
+}
+
+static void cache_push_front(ExtxyzReadState *rs, ExtxyzCommentCacheEntry *ce) {
+    ce->prev = 0;
+    ce->next = rs->cache_head;
+    if (rs->cache_head) rs->cache_head->prev = ce; else rs->cache_tail = ce;
+    rs->cache_head = ce;
+}
+
+static void cache_entry_free(ExtxyzCommentCacheEntry *ce) {
+    free(ce->comment);
+    free_dict(ce->info);
+    free(ce);
+}
+
+// Copy of the cached info dict for comment line `s`, or NULL on a miss.
+static DictEntry *comment_cache_get(ExtxyzReadState *rs, const char *s, unsigned long long h) {
+    for (ExtxyzCommentCacheEntry *ce = rs->cache_head; ce; ce = ce->next) {
+        if (ce->hash == h && ! strcmp(ce->comment, s)) {
+            DictEntry *info = dict_copy(ce->info);
+            if (! info) break;
+            if (ce != rs->cache_head) {
+                cache_unlink(rs, ce);
+                cache_push_front(rs, ce);
+            }
+            rs->cache_hits++;
+            return info;
+        }
+    }
+    rs->cache_misses++;
+    return 0;
+}
+
+// Store a copy of `info` for comment line `s`, evicting the least recently
+// used entry when full. Failing to allocate just leaves it uncached.
+static void comment_cache_put(ExtxyzReadState *rs, const char *s, unsigned long long h, const DictEntry *info) {
+    ExtxyzCommentCacheEntry *ce = (ExtxyzCommentCacheEntry *) calloc(1, sizeof(ExtxyzCommentCacheEntry));
+    if (! ce) return;
+    size_t len = strlen(s) + 1;
+    ce->hash = h;
+    ce->comment = (char *) malloc(len);
+    ce->info = dict_copy(info);
+    if (! ce->comment || ! ce->info) {
+        free(ce->comment);
+        if (ce->info) free_dict(ce->info);
+        free(ce);
+        return;
+    }
+    memcpy(ce->comment, s, len);
+    cache_push_front(rs, ce);
+    if (++rs->cache_len > rs->cache_max) {
+        ExtxyzCommentCacheEntry *lru = rs->cache_tail;
+        cache_unlink(rs, lru);
+        cache_entry_free(lru);
+        rs->cache_len--;
+    }
+}
+
+// One per-atom column of a Properties string.
+typedef struct {
+    char *key;
+    enum data_type data_t;
+    int ncols;
+    DictEntry *entry;       // the column's array in the frame being read
+} ColumnStep;
+
+// Column plan compiled from a Properties string: the flat list of columns the
+// atom-line loops walk, plus the per-line regex (regex mode, built on first
+// use). Kept in ExtxyzReadState and reused while Properties is unchanged.
+typedef struct extxyz_column_plan_struct {
+    char *props;
+    int n, tot_cols;
+    ColumnStep *steps;
+    size_t *field_start, *field_end;    // tokenizer scratch, tot_cols each
+    pcre2_code *re;
+    pcre2_match_data *match_data;
+} ColumnPlan;
+
+static void column_plan_free(ColumnPlan *plan) {
+    if (! plan) return;
+    for (int ci = 0; ci < plan->n; ci++)
+        free(plan->steps[ci].key);
+    free(plan->steps);
+    free(plan->field_start);
+    free(plan->field_end);
+    free(plan->props);
+    pcre2_match_data_free(plan->match_data);
+    pcre2_code_free(plan->re);
+    free(plan);
+}
+
+// malloc'd copy of s, or NULL if out of memory
+static char *copy_str(const char *s) {
+    size_t len = strlen(s) + 1;
+    char *copy = (char *) malloc(len);
+    if (copy) memcpy(copy, s, len);
+    return copy;
+}
+
+// Reentrant strtok(..., sep) for a single separator character: returns the
+// next non-empty field of *save (NUL-terminated in place), or NULL at the end.
+static char *next_field(char **save, char sep) {
+    char *p = *save;
+    while (*p == sep) p++;
+    if (! *p) {
+        *save = p;
+        return NULL;
+    }
+    char *tok = p;
+    while (*p && *p != sep) p++;
+    if (*p) *p++ = '\0';
+    *save = p;
+    return tok;
+}
+
+// Parse a Properties string ("name:T:ncols:..."), or NULL with error_message set.
+static ColumnPlan *column_plan_new(const char *props, char *error_message) {
+    ColumnPlan *plan = (ColumnPlan *) calloc(1, sizeof(ColumnPlan));
+    if (! plan) {
+        sprintf(error_message, "ERROR: out of memory parsing Properties");
+        return 0;
+    }
+    plan->props = copy_str(props);
+    // next_field modifies its argument, so work on another copy
+    char *buf = copy_str(props), *save = buf;
+    if (! plan->props || ! buf) goto oom;
+    int steps_cap = 0;
+
+    char *pf = next_field(&save, ':');
+    int prop_i = 0;
+    while (pf) {
+        if (plan->n == steps_cap) {
+            steps_cap = steps_cap ? 2 * steps_cap : 8;
+            ColumnStep *steps = (ColumnStep *) realloc(plan->steps, steps_cap * sizeof(ColumnStep));
+            if (! steps) goto oom;
+            plan->steps = steps;
+        }
+        ColumnStep *step = &plan->steps[plan->n++];
+        memset(step, 0, sizeof(ColumnStep));
+        step->key = copy_str(pf);
+        if (! step->key) goto oom;
+
+        // advance to col type
+        pf = next_field(&save, ':');
+        if (! pf) {
+            sprintf(error_message, "Failed to parse Properties: missing type field for property '%s' (# %d)", step->key, prop_i);
+            goto fail;
+        }
+        if (strlen(pf) != 1) {
+            sprintf(error_message, "Failed to parse property type '%s' for property '%s' (# %d)", pf, step->key, prop_i);
+            goto fail;
+        }
+        char col_type = pf[0];
+
+        // advance to col num
+        pf = next_field(&save, ':');
+        if (! pf) {
+            sprintf(error_message, "Failed to parse Properties: missing column count for property '%s' (# %d)", step->key, prop_i);
+            goto fail;
+        }
+        if (sscanf(pf, "%d", &step->ncols) != 1) {
+            sprintf(error_message, "Failed to parse int property ncolumns from '%s' for property '%s' (# %d)", pf, step->key, prop_i);
+            goto fail;
+        }
+
+        switch (col_type) {
+            case 'I': step->data_t = data_i; break;
+            case 'R': step->data_t = data_f; break;
+            case 'L': step->data_t = data_b; break;
+            case 'S': step->data_t = data_s; break;
+            default:
+                sprintf(error_message, "Unknown property type '%c' for property key '%s' (# %d)", col_type, step->key, prop_i);
+                goto fail;
+        }
+
+        // ready to next triplet
+        pf = next_field(&save, ':');
+        prop_i++;
+        plan->tot_cols += step->ncols;
+    }
+    free(buf);
+    buf = 0;
+    plan->field_start = (size_t *) malloc((plan->tot_cols + 1) * sizeof(size_t));
+    plan->field_end = (size_t *) malloc((plan->tot_cols + 1) * sizeof(size_t));
+    if (! plan->field_start || ! plan->field_end) goto oom;
+    return plan;
+
+oom:
+    sprintf(error_message, "ERROR: out of memory parsing Properties");
+fail:
+    free(buf);
+    column_plan_free(plan);
+    return 0;
+}
+
+// Build and compile the per-line regex for a plan. Returns 0 on success.
+static int column_plan_compile(ColumnPlan *plan, const char *re_at_eol, char *error_message) {
+    unsigned long re_str_len = 20;
+    char *re_str = (char *) malloc (re_str_len * sizeof(char));
+    re_str[0] = 0;
+    strcat_realloc(&re_str, &re_str_len, "^\\s*");
+    for (int ci = 0; ci < plan->n; ci++) {
+        char *this_re;
+        switch (plan->steps[ci].data_t) {
+            case data_i: this_re = INTEGER_RE; break;       // "[+-]?[0-9]+"
+            case data_f: this_re = FLOAT_RE; break;         // "[+-]?(?:[0-9]+[.]?[0-9]*|\\.[0-9]+)(?:[dDeE][+-]?[0-9]+)?"
+            case data_b: this_re = BOOL_RE; break;          // "(?:[TF]|[tT]rue|[fF]alse|TRUE|FALSE)"
+            default:     this_re = SIMPLESTRING_RE; break;  // "\\S+"
+        }
+        for (int col_i = 0; col_i < plan->steps[ci].ncols; col_i++) {
+            strcat_realloc(&re_str, &re_str_len, "(");
+            strcat_realloc(&re_str, &re_str_len, this_re);
+            strcat_realloc(&re_str, &re_str_len, ")");
+            strcat_realloc(&re_str, &re_str_len, WHITESPACE_RE); // "\\s+");
+        }
+    }
+    // trim off last \s+
+    re_str[strlen(re_str)-3] = 0;
+    // tack on to EOL
+    strcat_realloc(&re_str, &re_str_len, (char *) re_at_eol);
+
+    int pcre2_error;
+    PCRE2_SIZE erroffset;
+    // PCRE2_ANCHORED: our pattern starts with "^\s*" so anchoring at offset 0
+    // saves the engine from probing every starting position.
+    plan->re = pcre2_compile((unsigned char *)re_str, PCRE2_ZERO_TERMINATED,
+                             PCRE2_ANCHORED, &pcre2_error, &erroffset, NULL);
+    if (plan->re == NULL) {
+        unsigned char pcre2_message[256];
+        pcre2_get_error_message(pcre2_error, pcre2_message, sizeof(pcre2_message));
+        sprintf(error_message, "ERROR %s compiling pcre pattern for atoms lines offset %zu re '%.600s'", pcre2_message, erroffset, re_str);
+        free(re_str);
+        return 1;
+    }
+    free(re_str);
+    // Try to JIT-compile. PCRE2 with JIT is typically 5-30× faster on the
+    // hot pcre2_match per-atom-line loop. Silently fall through to the
+    // interpreter if PCRE2 was built without JIT support — pcre2_match
+    // auto-detects whether JIT is available.
+    (void) pcre2_jit_compile(plan->re, PCRE2_JIT_COMPLETE);
+    plan->match_data = pcre2_match_data_create_from_pattern(plan->re, NULL);
+    return 0;
+}
+
+// Frees the cached comment lines and column plan. cache_max and the counters are kept, so the
+// state can be reused.
+void extxyz_read_state_free(ExtxyzReadState *rs) {
+    ExtxyzCommentCacheEntry *next;
+    for (ExtxyzCommentCacheEntry *ce = rs->cache_head; ce; ce = next) {
+        next = ce->next;
+        cache_entry_free(ce);
+    }
+    rs->cache_head = rs->cache_tail = 0;
+    rs->cache_len = 0;
+    column_plan_free(rs->plan);
+    rs->plan = 0;
+}
+
+int extxyz_read_ll_flags(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEntry **info, DictEntry **arrays, char *comment, char *error_message, int flags) {
+    return extxyz_read_ll_state(0, kv_grammar, fp, nat, info, arrays, comment, error_message, flags);
+}
+
+// flags: EXTXYZ_READ_* bits (see extxyz.h). A frame cut short by EOF after its
+// natoms line fails with an error_message starting "Truncated frame"; with
+// EXTXYZ_READ_COMPLETE_LINES a last line without '\n' counts as cut short too.
+// rs may be NULL (no comment cache).
+int extxyz_read_ll_state(ExtxyzReadState *rs, cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEntry **info, DictEntry **arrays, char *comment, char *error_message, int flags) {
+    const int use_tokenizer = (flags & EXTXYZ_READ_TOKENIZER) != 0;
+    const int use_cleri = (flags & EXTXYZ_READ_CLERI) != 0;
+    const int complete_lines = (flags & EXTXYZ_READ_COMPLETE_LINES) != 0;
+    const int skip_atoms = (flags & EXTXYZ_READ_SKIP_ATOMS) != 0;
     char *line;
     unsigned long line_len;
     unsigned long line_len_init = 1024;
@@ -723,23 +1104,43 @@ int extxyz_read_ll_opts(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEnt
         free(line);
         return 0;
     }
+    if (complete_lines && line_incomplete(line)) {
+        sprintf(error_message, "Truncated frame: incomplete natoms line");
+        free(line);
+        return 0;
+    }
 
     // info
     stat = read_line(&line, &line_len, fp);
-    if (! stat) {
+    if (! stat || (complete_lines && line_incomplete(line))) {
+        sprintf(error_message, "Truncated frame: end of file in comment line");
         free(line);
         return 0;
     }
     // actually parse - optionally replace line read from file with `comment` argument
     // use_cleri (default) walks the libcleri grammar; otherwise the equivalent
     // first-char-dispatch parser (extxyz_dispatch_parse) builds the same dict.
-    if (use_cleri) {
-        cleri_parse_t * tree;
-        if (comment != NULL) {
-            tree = cleri_parse(kv_grammar, comment);
-        } else {
-            tree = cleri_parse(kv_grammar, line);
-        }
+    const char *to_parse = comment != NULL ? comment : line;
+    unsigned long long t_phase;
+    EXTXYZ_STATS_START(t_phase);
+    const int use_cache = rs && rs->cache_max > 0;
+    unsigned long long to_parse_hash = 0;
+    *info = 0;
+    if (use_cache) {
+        to_parse_hash = comment_hash(to_parse);
+        *info = comment_cache_get(rs, to_parse, to_parse_hash);
+    }
+    const int cache_hit = *info != 0;
+    if (cache_hit) {
+        // a copy of the dict parsed from an identical comment line
+        EXTXYZ_STATS_ADD(COMMENTS_CACHED, 1);
+    } else if (use_cleri) {
+        EXTXYZ_STATS_ADD(COMMENTS_CLERI, 1);
+        // a cleri_grammar_t keeps its pcre2 match data in the grammar itself,
+        // so concurrent cleri_parse calls on one grammar must be serialised
+        extxyz_mutex_lock(&cleri_parse_lock);
+        cleri_parse_t * tree = cleri_parse(kv_grammar, to_parse);
+        extxyz_mutex_unlock(&cleri_parse_lock);
         if (! tree->is_valid) {
             sprintf(error_message, "Failed to parse string at pos %zd", tree->pos);
             cleri_parse_free(tree);
@@ -754,23 +1155,24 @@ int extxyz_read_ll_opts(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEnt
             return 0;
         }
     } else {
-        *info = extxyz_dispatch_parse(comment != NULL ? comment : line, error_message);
+        EXTXYZ_STATS_ADD(COMMENTS_DISPATCH, 1);
+        *info = extxyz_dispatch_parse(to_parse, error_message);
         if (! *info) {
             free(line);
             return 0;
         }
     }
+    if (use_cache && ! cache_hit)
+        comment_cache_put(rs, to_parse, to_parse_hash, *info);
+    EXTXYZ_STATS_STOP(COMMENT_NS, t_phase);
 
-    // grab and parse Properties string
-    char *props = 0;
+    // grab the Properties string (points into the info dict, not modified)
+    const char *props = 0;
     if ((*info)->key) {
         // only try if first entry has key, otherwise must have parsed nothing
         for (DictEntry *entry = *info; entry; entry = entry->next) {
             if (! strcmp(entry->key, "Properties")) {
-                // copy into props, so strtok doesn't modify copy in info dict
-                char *p = ((char **)(entry->data))[0];
-                props = (char *) malloc((strlen(p)+1)*sizeof(char));
-                strcpy(props, p);
+                props = ((char **)(entry->data))[0];
                 break;
             }
         }
@@ -799,233 +1201,193 @@ int extxyz_read_ll_opts(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEnt
     if (! props) {
         // either nothing parsed, or something parsed but no Properties
         // should we assume default xyz instead, and if so species or Z, or just species?
-        char *p = "species:S:1:pos:R:3";
-        props = (char *) malloc((strlen(p)+1)*sizeof(char));
-        strcpy(props, p);
+        props = "species:S:1:pos:R:3";
         // fprintf(stderr, "ERROR: failed to find Properties keyword");
         // free(line);
         // return 0;
     }
 
-    // from here on every return should also free re_str first;
-    unsigned long re_str_len = 20;
-    char *re_str = (char *) malloc (re_str_len * sizeof(char));
-    re_str[0] = 0;
-    strcat_realloc(&re_str, &re_str_len, "^\\s*");
-
-    *arrays = (DictEntry *) 0;
-    // initialised to silence a GCC -Wmaybe-uninitialized false positive; it is
-    // always assigned at the top of the loop below before any use.
-    DictEntry *cur_array = (DictEntry *) 0;
-
-    char *pf = strtok(props, ":");
-    int prop_i = 0, tot_col_num = 0;
-    while (pf) {
-        if (! *arrays) {
-            *arrays = (DictEntry *) malloc(sizeof(DictEntry));
-            cur_array = *arrays;
-        } else {
-            DictEntry *new_array = (DictEntry *) malloc(sizeof(DictEntry));
-            cur_array->next = new_array;
-            cur_array = cur_array->next;
-        }
-
-        init_DictEntry(cur_array, pf, strlen(pf));
-
-        // advance to col type
-        pf = strtok(NULL, ":");
-        if (! pf) {
-            sprintf(error_message, "Failed to parse Properties: missing type field for property '%s' (# %d)", cur_array->key, prop_i);
-            free(props);
-            free(line); free(re_str);
-            free_partial_dicts(info, arrays);
-            return 0;
-        }
-        if (strlen(pf) != 1) {
-            sprintf(error_message, "Failed to parse property type '%s' for property '%s' (# %d)", pf, cur_array->key, prop_i);
-            free(props);
-            free(line); free(re_str);
-            free_partial_dicts(info, arrays);
-            return 0;
+    // Skip the atom lines: the caller only wants natoms and the info dict
+    // (e.g. to parse the columns later, from the bytes of the frame)
+    if (skip_atoms) {
+        *arrays = (DictEntry *) 0;
+        for (int li=0; li < (*nat); li++) {
+            stat = read_line(&line, &line_len, fp);
+            if (! stat || (complete_lines && line_incomplete(line))) {
+                sprintf(error_message, "Truncated frame: end of file after %d of %d atom lines", li, *nat);
+                free(line);
+                free_partial_dicts(info, arrays);
+                return 0;
+            }
         }
-        char col_type = pf[0];
+        free(line);
+        EXTXYZ_STATS_ADD(FRAMES, 1);
+        return 1;
+    }
 
-        // advance to col num
-        pf = strtok(NULL, ":");
-        if (! pf) {
-            sprintf(error_message, "Failed to parse Properties: missing column count for property '%s' (# %d)", cur_array->key, prop_i);
-            free(props);
-            free(line); free(re_str);
+    // Column plan: reused from the previous frame read with the same state
+    // when its Properties string is unchanged, otherwise parsed again.
+    // from here on every return should also free owned_plan first;
+    ColumnPlan *plan;
+    ColumnPlan *owned_plan = 0;     // NULL when rs owns the plan
+    EXTXYZ_STATS_START(t_phase);
+    if (rs && rs->plan && ! strcmp(rs->plan->props, props)) {
+        plan = rs->plan;
+    } else {
+        EXTXYZ_STATS_ADD(PLANS_BUILT, 1);
+        plan = column_plan_new(props, error_message);
+        if (! plan) {
+            free(line);
             free_partial_dicts(info, arrays);
             return 0;
         }
-        int col_num;
-        int col_num_stat = sscanf(pf, "%d", &col_num);
-        if (col_num_stat != 1) {
-            sprintf(error_message, "Failed to parse int property ncolumns from '%s' for property '%s' (# %d)", pf, cur_array->key, prop_i);
-            free(props);
-            free(line); free(re_str);
-            free_partial_dicts(info, arrays);
-            return 0;
+        if (rs) {
+            column_plan_free(rs->plan);
+            rs->plan = plan;
+        } else {
+            owned_plan = plan;
         }
+    }
 
-        // make an nat x ncol matrix
+    // allocate one nat x ncol matrix per column
+    *arrays = (DictEntry *) 0;
+    DictEntry **next_array = arrays;
+    for (int ci = 0; ci < plan->n; ci++) {
+        ColumnStep *step = &plan->steps[ci];
+        DictEntry *cur_array = (DictEntry *) malloc(sizeof(DictEntry));
+        init_DictEntry(cur_array, step->key, strlen(step->key));
+        *next_array = cur_array;
+        next_array = &cur_array->next;
         cur_array->nrows = *nat;
-        cur_array->ncols = col_num;
-
-        char *this_re;
-        switch (col_type) {
-            case 'I':
-                cur_array->data_t = data_i;
-                cur_array->data = malloc(((*nat)*col_num)*sizeof(int));
-                this_re = INTEGER_RE; // "[+-]?[0-9]+";
-                break;
-            case 'R':
-                cur_array->data_t = data_f;
-                cur_array->data = malloc(((*nat)*col_num)*sizeof(double));
-                this_re = FLOAT_RE; // "[+-]?(?:[0-9]+[.]?[0-9]*|\\.[0-9]+)(?:[dDeE][+-]?[0-9]+)?";
+        cur_array->ncols = step->ncols;
+        cur_array->data_t = step->data_t;
+        size_t n_cells = (size_t)(*nat) * step->ncols;
+        switch (step->data_t) {
+            case data_i:
+            case data_b:
+                cur_array->data = malloc(n_cells * sizeof(int));
                 break;
-            case 'L':
-                cur_array->data_t = data_b;
-                cur_array->data = malloc(((*nat)*col_num)*sizeof(int));
-                this_re = BOOL_RE; // "(?:[TF]|[tT]rue|[fF]alse|TRUE|FALSE)";
+            case data_f:
+                cur_array->data = malloc(n_cells * sizeof(double));
                 break;
-            case 'S':
-                cur_array->data_t = data_s;
+            default:
                 // One contiguous fixed-width buffer for the whole column (not an
                 // array of N malloc'd pointers). n_in_row carries the NEGATED
                 // cell width and marks the column as contiguous (n_in_row < 0);
                 // it grows on demand during the fill. calloc zero-fills so cells
                 // are NUL-padded.
                 cur_array->n_in_row = -STR_CELL_W0;
-                cur_array->data = calloc((size_t)(*nat)*col_num, STR_CELL_W0);
-                this_re = SIMPLESTRING_RE; // "\\S+";
+                cur_array->data = calloc(n_cells, STR_CELL_W0);
                 break;
-            default:
-                sprintf(error_message, "Unknown property type '%c' for property key '%s' (# %d)", col_type, cur_array->key, prop_i);
-                free(props);
-                free(line); free(re_str);
-                // free_partial_dicts frees cur_array (incl. its data) via *arrays
-                free_partial_dicts(info, arrays);
-                return 0;
-        }
-
-        if (! use_tokenizer) {
-            for (int ci=0; ci < col_num; ci++) {
-                strcat_realloc(&re_str, &re_str_len, "(");
-                strcat_realloc(&re_str, &re_str_len, this_re);
-                strcat_realloc(&re_str, &re_str_len, ")");
-                strcat_realloc(&re_str, &re_str_len, WHITESPACE_RE); // "\\s+");
-            }
         }
+        step->entry = cur_array;
+    }
+    const int tot_col_num = plan->tot_cols;
 
-        // ready to next triplet
-        pf = strtok(NULL, ":");
-        prop_i++;
-        tot_col_num += col_num;
-    }
-
-    free(props);
-
-    // Build/compile the per-line regex only in regex mode. In tokenizer mode
-    // re/match_data stay NULL (pcre2_*_free(NULL) is a no-op) and re_str is left
-    // as-is (still freed below).
-    pcre2_code *re = NULL;
-    pcre2_match_data *match_data = NULL;
-    if (! use_tokenizer) {
-        // trim off last \s+
-        re_str[strlen(re_str)-3] = 0;
-        // tack on to EOL
-        strcat_realloc(&re_str, &re_str_len, re_at_eol);
-
-        int pcre2_error;
-        PCRE2_SIZE erroffset;
-        // PCRE2_ANCHORED: our pattern starts with "^\s*" so anchoring at offset 0
-        // saves the engine from probing every starting position.
-        re = pcre2_compile((unsigned char *)re_str, PCRE2_ZERO_TERMINATED,
-                           PCRE2_ANCHORED, &pcre2_error, &erroffset, NULL);
-        if (re == NULL) {
-            pcre2_get_error_message(pcre2_error, (unsigned char *)line, line_len);
-            sprintf(error_message, "ERROR %s compiling pcre pattern for atoms lines offset %zu re '%s'", line, erroffset, re_str);
-            free(line); free(re_str);
+    // Build/compile the per-line regex only in regex mode, once per plan. In
+    // tokenizer mode re/match_data stay NULL.
+    if (! use_tokenizer && ! plan->re) {
+        if (column_plan_compile(plan, re_at_eol, error_message)) {
+            column_plan_free(owned_plan);
+            free(line);
             free_partial_dicts(info, arrays);
             return 0;
         }
-        // Try to JIT-compile. PCRE2 with JIT is typically 5-30× faster on the
-        // hot pcre2_match per-atom-line loop. Silently fall through to the
-        // interpreter if PCRE2 was built without JIT support — pcre2_match
-        // auto-detects whether JIT is available.
-        (void) pcre2_jit_compile(re, PCRE2_JIT_COMPLETE);
-        match_data = pcre2_match_data_create_from_pattern(re, NULL);
     }
+    pcre2_code *re = plan->re;
+    pcre2_match_data *match_data = plan->match_data;
+    char *pf;
+    EXTXYZ_STATS_STOP(PLAN_NS, t_phase);
 
     // read per-atom data
     for (int li=0; li < (*nat); li++) {
         stat = read_line(&line, &line_len, fp);
-        if (! stat) {
-            pcre2_match_data_free(match_data); pcre2_code_free(re);
-            free(line); free(re_str);
+        // split into tokenizing (or regex matching) and field conversion
+        unsigned long long t_line, t_fields = 0;
+        EXTXYZ_STATS_START(t_line);
+        if (! stat || (complete_lines && line_incomplete(line))) {
+            sprintf(error_message, "Truncated frame: end of file after %d of %d atom lines", li, *nat);
+            column_plan_free(owned_plan);
+            free(line);
             free_partial_dicts(info, arrays);
             return 0;
         }
+        // a last line cut off by EOF that then fails to parse is reported as
+        // truncated rather than malformed
+        const int partial = line_incomplete(line);
 
         if (use_tokenizer) {
-            // Split the line on whitespace into exactly tot_col_num fields and
-            // parse each by column type, validating numeric/bool fields.
-            char *p = line;
-            int field_err = 0;
-            for (DictEntry *cur_array = *arrays; cur_array && !field_err; cur_array = cur_array->next) {
-                int nc = cur_array->ncols;
-                for (int col_i = 0; col_i < nc; col_i++) {
-                    while (*p == ' ' || *p == '\t') p++;
-                    if (*p == '\0' || *p == '\n' || *p == '\r') { field_err = 1; break; }
-                    char *tok = p;
-                    while (*p && *p != ' ' && *p != '\t' && *p != '\n' && *p != '\r') p++;
-                    size_t len = (size_t)(p - tok);
-                    char sep = *p;
-                    *p = '\0';
+            // Split the line on whitespace (see fast_scan.c) and parse the
+            // first tot_col_num fields by column type, validating
+            // numeric/bool fields; then check the field count.
+            const int n_fields = extxyz_split_fields(line, plan->field_start, plan->field_end, tot_col_num);
+            if (t_line) {
+                t_fields = extxyz_stats_now();
+                extxyz_stats_add(EXTXYZ_STAT_TOKENIZE_NS, t_fields - t_line);
+            }
+            const int n_parse = n_fields < tot_col_num ? n_fields : tot_col_num;
+            int field_i = 0;
+            for (int ci = 0; ci < plan->n && field_i < n_parse; ci++) {
+                const ColumnStep *step = &plan->steps[ci];
+                const int nc = step->ncols;
+                void *data = step->entry->data;
+                for (int col_i = 0; col_i < nc && field_i < n_parse; col_i++, field_i++) {
+                    const char *tok = line + plan->field_start[field_i];
+                    size_t len = plan->field_end[field_i] - plan->field_start[field_i];
                     int ok = 1;
-                    if (cur_array->data_t == data_i) {
-                        ok = parse_int_field(tok, &((int *)(cur_array->data))[li*nc + col_i]);
-                    } else if (cur_array->data_t == data_f) {
-                        ok = parse_double_field(tok, &((double *)(cur_array->data))[li*nc + col_i]);
-                    } else if (cur_array->data_t == data_b) {
-                        ok = parse_bool_field(tok, &((int *)(cur_array->data))[li*nc + col_i]);
-                    } else if (cur_array->data_t == data_s) {
-                        size_t cell = (size_t)(li*nc + col_i);
-                        if (store_str_cell((char **)&cur_array->data, &cur_array->n_in_row,
-                                           (size_t)(*nat)*nc, cell, cell, tok, len)) {
-                            sprintf(error_message, "ERROR: out of memory storing string on atom line %d", li);
-                            pcre2_match_data_free(match_data); pcre2_code_free(re);
-                            free(line); free(re_str);
-                            free_partial_dicts(info, arrays);
-                            return 0;
+                    switch (step->data_t) {
+                        case data_i:
+                            ok = parse_int_field(tok, len, &((int *)data)[li*nc + col_i]);
+                            break;
+                        case data_f:
+                            ok = parse_double_field(tok, len, &((double *)data)[li*nc + col_i]);
+                            break;
+                        case data_b:
+                            ok = parse_bool_field(tok, len, &((int *)data)[li*nc + col_i]);
+                            break;
+                        default: {
+                            size_t cell = (size_t)(li*nc + col_i);
+                            if (store_str_cell((char **)&step->entry->data, &step->entry->n_in_row,
+                                               (size_t)(*nat)*nc, cell, cell, tok, len)) {
+                                sprintf(error_message, "ERROR: out of memory storing string on atom line %d", li);
+                                column_plan_free(owned_plan);
+                                free(line);
+                                free_partial_dicts(info, arrays);
+                                return 0;
+                            }
                         }
                     }
                     if (! ok) {
-                        sprintf(error_message, "ERROR: invalid field '%s' for property '%s' on atom line %d", tok, cur_array->key, li);
-                        pcre2_match_data_free(match_data); pcre2_code_free(re);
-                        free(line); free(re_str);
+                        if (partial)
+                            sprintf(error_message, "Truncated frame: end of file in atom line %d of %d", li, *nat);
+                        else
+                            sprintf(error_message, "ERROR: invalid field '%.*s' for property '%s' on atom line %d",
+                                    (int) (len < 64 ? len : 64), tok, step->key, li);
+                        column_plan_free(owned_plan);
+                        free(line);
                         free_partial_dicts(info, arrays);
                         return 0;
                     }
-                    if (sep) p++;   // step past the separator we overwrote
                 }
             }
-            while (*p == ' ' || *p == '\t') p++;
-            if (field_err || (*p != '\0' && *p != '\n' && *p != '\r')) {
-                sprintf(error_message, "ERROR: expected %d fields on atom line %d", tot_col_num, li);
-                pcre2_match_data_free(match_data); pcre2_code_free(re);
-                free(line); free(re_str);
+            if (n_fields != tot_col_num) {
+                if (partial)
+                    sprintf(error_message, "Truncated frame: end of file in atom line %d of %d", li, *nat);
+                else
+                    sprintf(error_message, "ERROR: expected %d fields on atom line %d", tot_col_num, li);
+                column_plan_free(owned_plan);
+                free(line);
                 free_partial_dicts(info, arrays);
                 return 0;
             }
         } else {
-        // read data with PCRE + atoi/f
+        // read data with PCRE + the validated field parsers
         // apply PCRE
         int rc = pcre2_match(re, (unsigned char *)line, PCRE2_ZERO_TERMINATED, 0, 0, match_data, NULL);
         if (rc != tot_col_num+1) {
-            if (rc < 0) {
+            if (partial) {
+                sprintf(error_message, "Truncated frame: end of file in atom line %d of %d", li, *nat);
+            } else if (rc < 0) {
                 if (rc == PCRE2_ERROR_NOMATCH) {
                     sprintf(error_message, "ERROR: pcre2 regexp got NOMATCH on atom line %d", li);
                 } else {
@@ -1036,44 +1398,56 @@ int extxyz_read_ll_opts(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEnt
             } else {
                 sprintf(error_message, "ERROR: pcre2 regexp failed on atom line %d at group %d", li, rc-1);
             }
-            pcre2_match_data_free(match_data); pcre2_code_free(re);
-            free(line); free(re_str);
+            column_plan_free(owned_plan);
+            free(line);
             free_partial_dicts(info, arrays);
             return 0;
         }
+        if (t_line) {
+            t_fields = extxyz_stats_now();
+            extxyz_stats_add(EXTXYZ_STAT_TOKENIZE_NS, t_fields - t_line);
+        }
         // loop through parsed strings and fill in allocated data structures
         PCRE2_SIZE *ovector = pcre2_get_ovector_pointer(match_data);
         int field_i = 1;
-        for (DictEntry *cur_array = *arrays; cur_array; cur_array = cur_array->next) {
-            int nc = cur_array->ncols;
+        for (int ci = 0; ci < plan->n; ci++) {
+            const ColumnStep *step = &plan->steps[ci];
+            const int nc = step->ncols;
             for (int col_i = 0; col_i < nc; col_i++) {
                 pf = line + ovector[2*field_i];
-                // overwrite end of field, must be at least one space so won't damage anything
-                line[ovector[2*field_i+1]] = 0;
-                if (cur_array->data_t == data_i) {
-                    ((int *)(cur_array->data))[li*nc + col_i] = atoi(pf);
-                } else if (cur_array->data_t == data_f) {
-                    ((double *)(cur_array->data))[li*nc + col_i] = atof_eEdD(pf);
-                } else if (cur_array->data_t == data_b) {
-                    ((int *)(cur_array->data))[li*nc + col_i] = (pf[0] == 'T');
-                } else if (cur_array->data_t == data_s) {
-                    // field bounds from the PCRE2 capture (pf is NUL-terminated
-                    // at line[ovector[2*field_i+1]] above)
-                    size_t len = (size_t)(ovector[2*field_i+1] - ovector[2*field_i]);
+                size_t len = (size_t)(ovector[2*field_i+1] - ovector[2*field_i]);
+                int ok = 1;
+                if (step->data_t == data_i) {
+                    ok = parse_int_field(pf, len, &((int *)(step->entry->data))[li*nc + col_i]);
+                } else if (step->data_t == data_f) {
+                    ok = parse_double_field(pf, len, &((double *)(step->entry->data))[li*nc + col_i]);
+                } else if (step->data_t == data_b) {
+                    ok = parse_bool_field(pf, len, &((int *)(step->entry->data))[li*nc + col_i]);
+                } else if (step->data_t == data_s) {
                     size_t cell = (size_t)(li*nc + col_i);
-                    if (store_str_cell((char **)&cur_array->data, &cur_array->n_in_row,
+                    if (store_str_cell((char **)&step->entry->data, &step->entry->n_in_row,
                                        (size_t)(*nat)*nc, cell, cell, pf, len)) {
                         sprintf(error_message, "ERROR: out of memory storing string on atom line %d", li);
-                        pcre2_match_data_free(match_data); pcre2_code_free(re);
-                        free(line); free(re_str);
+                        column_plan_free(owned_plan);
+                        free(line);
                         free_partial_dicts(info, arrays);
                         return 0;
                     }
                 }
+                if (! ok) {
+                    // the regex has validated the syntax, so this is an out-of-range int
+                    sprintf(error_message, "ERROR: invalid field '%.*s' for property '%s' on atom line %d",
+                            (int) (len < 64 ? len : 64), pf, step->key, li);
+                    column_plan_free(owned_plan);
+                    free(line);
+                    free_partial_dicts(info, arrays);
+                    return 0;
+                }
                 field_i++;
             }
         }
         }
+        EXTXYZ_STATS_STOP(FIELDS_NS, t_fields);
         /* {
             // use strtok + sscanf
             char *pf = strtok(line, " ");
@@ -1108,11 +1482,22 @@ int extxyz_read_ll_opts(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEnt
     }
 
     // return true
-    pcre2_match_data_free(match_data); pcre2_code_free(re);
-    free(line); free(re_str);
+    column_plan_free(owned_plan);
+    free(line);
+    EXTXYZ_STATS_ADD(FRAMES, 1);
     return 1;
 }
 
+// use_tokenizer: if non-zero, parse per-atom lines by whitespace-tokenising and
+// validating each field, instead of compiling and matching a per-line PCRE2
+// regex. Faster, opt-in; slightly more lenient than the grammar on numeric
+// edge cases. extxyz_read_ll (below) is the regex default.
+int extxyz_read_ll_opts(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEntry **info, DictEntry **arrays, char *comment, char *error_message, int use_tokenizer, int use_cleri) {
+    return extxyz_read_ll_flags(kv_grammar, fp, nat, info, arrays, comment, error_message,
+                                (use_tokenizer ? EXTXYZ_READ_TOKENIZER : 0) |
+                                (use_cleri ? EXTXYZ_READ_CLERI : 0));
+}
+
 // Backward-compatible reader: per-atom lines parsed with the PCRE2 regex,
 // comment line parsed with the libcleri grammar.
 int extxyz_read_ll(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEntry **info, DictEntry **arrays, char *comment, char *error_message) {
@@ -1282,14 +1667,57 @@ int concat_entry(char **str, unsigned long *str_len, DictEntry *entry, int old_s
     return 0;
 }
 
-// Write with caller-supplied per-atom column formats. Any of fmt_i/fmt_f/
-// fmt_b/fmt_s may be NULL to use the compiled-in default. The formats apply to
-// the per-atom data columns only (matching the pure-Python writer's
-// format_dict); info-line values keep the default formatting. fmt_f must
-// consume a double, fmt_i an int, fmt_b/fmt_s a char* ("T"/"F" or the string).
-int extxyz_write_ll_fmt(FILE *fp, int nat, DictEntry *info, DictEntry *arrays,
-                        const char *fmt_i, const char *fmt_f,
-                        const char *fmt_b, const char *fmt_s) {
+// Hand n bytes to the OS for fp's descriptor, bypassing (the already flushed)
+// stdio buffering, retrying on short writes and EINTR. Returns 0 on success.
+static int write_fd_all(FILE *fp, const char *buf, size_t n) {
+#ifdef _WIN32
+    int fd = _fileno(fp);
+#else
+    int fd = fileno(fp);
+#endif
+    while (n > 0) {
+#ifdef _WIN32
+        int chunk = _write(fd, buf, (unsigned int)(n > 0x40000000u ? 0x40000000u : n));
+#else
+        ssize_t chunk = write(fd, buf, n);
+#endif
+        if (chunk < 0) {
+            if (errno == EINTR) { continue; }
+            return -1;
+        }
+        buf += chunk;
+        n -= (size_t)chunk;
+    }
+    return 0;
+}
+
+// Release the buffers held by a writer state; it keeps its settings (atomic)
+// and can be reused after.
+void extxyz_write_state_free(ExtxyzWriteState *ws) {
+    free(ws->wbuf);
+    free(ws->entry_str);
+    free(ws->props_str);
+    free(ws->props_last);
+    free(ws->props_quoted);
+    int atomic = ws->atomic;
+    memset(ws, 0, sizeof(*ws));
+    ws->atomic = atomic;
+}
+
+// Write one frame through a persistent writer state (see extxyz.h). The whole
+// frame -- natoms line, comment line and per-atom data -- is built in ws->wbuf
+// and handed to stdio in blocks of about WBUF_FLUSH bytes. The info and the
+// column types are checked while building the comment line, before the first
+// block, so nothing is written for a frame rejected on them; the caller must
+// pass nat rows of every column. Without ws->atomic a failure later on (out
+// of memory) can leave the blocks of a large frame already written. With
+// ws->atomic the frame is formatted completely and written with a single
+// write() on the descriptor (return 8 on an I/O error). Formats as for
+// extxyz_write_ll_fmt.
+int extxyz_write_ll_state(ExtxyzWriteState *ws, FILE *fp, int nat,
+                          DictEntry *info, DictEntry *arrays,
+                          const char *fmt_i, const char *fmt_f,
+                          const char *fmt_b, const char *fmt_s) {
     const char *FMT_I = fmt_i ? fmt_i : INTEGER_FMT;
     const char *FMT_F = fmt_f ? fmt_f : FLOAT_FMT;
     const char *FMT_B = fmt_b ? fmt_b : BOOL_FMT;
@@ -1298,12 +1726,70 @@ int extxyz_write_ll_fmt(FILE *fp, int nat, DictEntry *info, DictEntry *arrays,
     // (format_dict, #22) keep using snprintf via WB_FMT.
     const int f_default = (fmt_f == NULL);
 
-    fprintf(fp, "%d\n", nat);
+    if (! ws->wbuf) {
+        ws->wbuf_cap = 1u << 16;
+        ws->wbuf = (char *) malloc(ws->wbuf_cap);
+        if (! ws->wbuf) { ws->wbuf_cap = 0; return 7; }
+    }
+    if (! ws->entry_str) {
+        ws->entry_str_len = 100;
+        ws->entry_str = (char *) malloc(ws->entry_str_len * sizeof(char));
+        if (! ws->entry_str) { return 7; }
+    }
+    if (! ws->props_str) {
+        ws->props_str_len = 100;
+        ws->props_str = (char *) malloc(ws->props_str_len * sizeof(char));
+        if (! ws->props_str) { return 7; }
+    }
 
-    // Write info
+    // Build each line in a growable memory buffer with snprintf and fwrite it
+    // in blocks, instead of one (FILE-locked) fprintf per value -- same output
+    // bytes, fewer locked stdio calls. Flush at line boundaries once the
+    // buffer passes WBUF_FLUSH so a line is never split.
+    char *wbuf = ws->wbuf;
+    size_t wbuf_cap = ws->wbuf_cap, wbuf_n = 0;
+    const size_t WBUF_FLUSH = 1u << 15;
+    // make room for `need` more bytes; on failure the old buffer is kept in
+    // ws (realloc leaves it valid) and freed by extxyz_write_state_free.
+    #define WB_RESERVE(need) do { \
+        if (wbuf_n + (size_t)(need) > wbuf_cap) { \
+            while (wbuf_n + (size_t)(need) > wbuf_cap) wbuf_cap *= 2; \
+            char *_nb = (char *) realloc(wbuf, wbuf_cap); \
+            if (! _nb) { return 7; } \
+            wbuf = ws->wbuf = _nb; ws->wbuf_cap = wbuf_cap; \
+        } \
+    } while (0)
+    // append `fmt`-formatted `val`, growing the buffer (and re-formatting) only
+    // if it didn't fit -- for a flushed buffer it almost always fits first time.
+    #define WB_FMT(fmt, val) do { \
+        int _l = snprintf(wbuf + wbuf_n, wbuf_cap - wbuf_n, (fmt), (val)); \
+        if (_l < 0) { return 7; } \
+        if ((size_t)_l >= wbuf_cap - wbuf_n) { \
+            WB_RESERVE((size_t)_l + 1); \
+            snprintf(wbuf + wbuf_n, wbuf_cap - wbuf_n, (fmt), (val)); \
+        } \
+        wbuf_n += (size_t)_l; \
+    } while (0)
+    #define WB_CH(c) do { \
+        WB_RESERVE(1); \
+        wbuf[wbuf_n++] = (c); \
+    } while (0)
+    #define WB_STR(s) do { \
+        size_t _sl = strlen(s); \
+        WB_RESERVE(_sl); \
+        memcpy(wbuf + wbuf_n, (s), _sl); \
+        wbuf_n += _sl; \
+    } while (0)
+    // append a default-formatted ("%16.8f") double via the fast exact formatter,
+    // reserving its worst-case width first.
+    #define WB_FLOAT(val) do { \
+        WB_RESERVE(FMT_F16_8_BUFSIZE); \
+        wbuf_n += (size_t)fmt_default_f16_8(wbuf + wbuf_n, (val)); \
+    } while (0)
 
-    unsigned long entry_str_len=100;
-    char *entry_str = (char *)malloc(entry_str_len * sizeof(char));
+    WB_FMT("%d\n", nat);
+
+    // Write info
 
     for (DictEntry *entry=info; entry; entry = entry->next) {
         // should this be necessary?
@@ -1311,106 +1797,72 @@ int extxyz_write_ll_fmt(FILE *fp, int nat, DictEntry *info, DictEntry *arrays,
             continue;
         }
 
-        entry_str[0] = 0;
+        ws->entry_str[0] = 0;
         // key
         char *quoted_key = quoted(entry->key);
-        strcat_realloc(&entry_str, &entry_str_len, quoted_key);
+        strcat_realloc(&ws->entry_str, &ws->entry_str_len, quoted_key);
         free(quoted_key);
 
         // =
-        strcat_realloc(&entry_str, &entry_str_len, "=");
+        strcat_realloc(&ws->entry_str, &ws->entry_str_len, "=");
 
         // value
         // (only) Lattice is always written as old style 3x3
         int old_style_3_3 = !strcmp(entry->key, "Lattice");
-        int err_stat = concat_entry(&entry_str, &entry_str_len, entry, old_style_3_3);
-        if (err_stat) { free(entry_str); return err_stat; }
+        int err_stat = concat_entry(&ws->entry_str, &ws->entry_str_len, entry, old_style_3_3);
+        if (err_stat) { return err_stat; }
 
-        fprintf(fp, "%s", entry_str);
+        WB_STR(ws->entry_str);
         if (entry->next) {
-            fprintf(fp, " ");
+            WB_CH(' ');
         }
     }
-    free (entry_str);
 
     // create and write Properties
 
-    unsigned long properties_str_len=100;
-    char *properties_str = (char *)malloc(properties_str_len * sizeof(char));
-    properties_str[0] = 0;
+    ws->props_str[0] = 0;
     for (DictEntry *entry=arrays; entry; entry = entry->next) {
-        strcat_realloc(&properties_str, &properties_str_len, entry->key);
-        strcat_realloc(&properties_str, &properties_str_len, ":");
+        strcat_realloc(&ws->props_str, &ws->props_str_len, entry->key);
+        strcat_realloc(&ws->props_str, &ws->props_str_len, ":");
         switch (entry->data_t) {
-            case data_i: strcat_realloc(&properties_str, &properties_str_len, "I");
+            case data_i: strcat_realloc(&ws->props_str, &ws->props_str_len, "I");
                 break;
-            case data_f: strcat_realloc(&properties_str, &properties_str_len, "R");
+            case data_f: strcat_realloc(&ws->props_str, &ws->props_str_len, "R");
                 break;
-            case data_b: strcat_realloc(&properties_str, &properties_str_len, "L");
+            case data_b: strcat_realloc(&ws->props_str, &ws->props_str_len, "L");
                 break;
-            case data_s: strcat_realloc(&properties_str, &properties_str_len, "S");
+            case data_s: strcat_realloc(&ws->props_str, &ws->props_str_len, "S");
                 break;
             default:
-                free (properties_str);
                 return 5;
         }
-        strcat_realloc(&properties_str, &properties_str_len, ":");
+        strcat_realloc(&ws->props_str, &ws->props_str_len, ":");
         char col_num_str[IFB_STR_LEN];
         sprintf(col_num_str, "%d", (entry->nrows == 0 ? 1 : entry->ncols));
-        strcat_realloc(&properties_str, &properties_str_len, col_num_str);
+        strcat_realloc(&ws->props_str, &ws->props_str_len, col_num_str);
         if (entry->next) {
-            strcat_realloc(&properties_str, &properties_str_len, ":");
+            strcat_realloc(&ws->props_str, &ws->props_str_len, ":");
         }
     }
+    const char *props = ws->props_str;
+
+    // quote in case there are special characters in keys; a trajectory keeps
+    // the same columns, so only re-quote when they change
+    if (! ws->props_last || strcmp(ws->props_last, props)) {
+        size_t props_len = strlen(props) + 1;
+        char *last = (char *) malloc(props_len);
+        if (! last) { return 7; }
+        memcpy(last, props, props_len);
+        free(ws->props_last);
+        free(ws->props_quoted);
+        ws->props_last = last;
+        ws->props_quoted = quoted(last);
+    }
+    WB_STR(" Properties=");
+    WB_STR(ws->props_quoted);
+    WB_CH('\n');
 
-    // quote in case there are special characters in keys
-    char *quoted_properties_str = quoted(properties_str);
-    fprintf(fp, " Properties=%s\n", quoted_properties_str);
-    free(quoted_properties_str);
-    free(properties_str);
-
-    // write per-atom data. Build each line in a growable memory buffer with
-    // snprintf and fwrite it in blocks, instead of one (FILE-locked) fprintf per
-    // value — same output bytes, fewer locked stdio calls. Flush at line
-    // boundaries once the buffer passes WBUF_FLUSH so a line is never split.
-    size_t wbuf_cap = 1u << 16, wbuf_n = 0;
-    const size_t WBUF_FLUSH = 1u << 15;
-    char *wbuf = (char *) malloc(wbuf_cap);
-    if (! wbuf) { return 7; }
-    // append `fmt`-formatted `val`, growing the buffer (and re-formatting) only
-    // if it didn't fit — for a flushed buffer it almost always fits first time.
-    #define WB_FMT(fmt, val) do { \
-        int _l = snprintf(wbuf + wbuf_n, wbuf_cap - wbuf_n, (fmt), (val)); \
-        if (_l < 0) { free(wbuf); return 7; } \
-        if ((size_t)_l >= wbuf_cap - wbuf_n) { \
-            while (wbuf_n + (size_t)_l + 1 > wbuf_cap) wbuf_cap *= 2; \
-            char *_nb = (char *) realloc(wbuf, wbuf_cap); \
-            if (! _nb) { free(wbuf); return 7; } \
-            wbuf = _nb; \
-            snprintf(wbuf + wbuf_n, wbuf_cap - wbuf_n, (fmt), (val)); \
-        } \
-        wbuf_n += (size_t)_l; \
-    } while (0)
-    #define WB_CH(c) do { \
-        if (wbuf_n + 1 > wbuf_cap) { \
-            wbuf_cap *= 2; \
-            char *_nb = (char *) realloc(wbuf, wbuf_cap); \
-            if (! _nb) { free(wbuf); return 7; } \
-            wbuf = _nb; \
-        } \
-        wbuf[wbuf_n++] = (c); \
-    } while (0)
-    // append a default-formatted ("%16.8f") double via the fast exact formatter,
-    // reserving its worst-case width first.
-    #define WB_FLOAT(val) do { \
-        if (wbuf_cap - wbuf_n < FMT_F16_8_BUFSIZE) { \
-            while (wbuf_n + FMT_F16_8_BUFSIZE > wbuf_cap) wbuf_cap *= 2; \
-            char *_nb = (char *) realloc(wbuf, wbuf_cap); \
-            if (! _nb) { free(wbuf); return 7; } \
-            wbuf = _nb; \
-        } \
-        wbuf_n += (size_t)fmt_default_f16_8(wbuf + wbuf_n, (val)); \
-    } while (0)
+    // write per-atom data
 
     for (int i_at=0; i_at < nat; i_at++) {
         for (DictEntry *entry = arrays; entry; entry = entry->next) {
@@ -1449,23 +1901,160 @@ int extxyz_write_ll_fmt(FILE *fp, int nat, DictEntry *info, DictEntry *arrays,
                     }
                     break;
                 default:
-                    free(wbuf);
                     return 6;
             }
             if (entry->next) { WB_CH(' '); WB_CH(' '); WB_CH(' '); }
         }
         WB_CH('\n');
-        if (wbuf_n >= WBUF_FLUSH) { fwrite(wbuf, 1, wbuf_n, fp); wbuf_n = 0; }
+        if (! ws->atomic && wbuf_n >= WBUF_FLUSH) { fwrite(wbuf, 1, wbuf_n, fp); wbuf_n = 0; }
     }
-    if (wbuf_n) { fwrite(wbuf, 1, wbuf_n, fp); }
-    free(wbuf);
+    if (ws->atomic) {
+        // the whole frame in one write(): with O_APPEND ("a" mode) frames from
+        // concurrent writers never interleave, and a writer killed mid-frame
+        // leaves at most one short frame at the end of the file
+        if (fflush(fp) != 0 || write_fd_all(fp, wbuf, wbuf_n) != 0) { return 8; }
+    } else if (wbuf_n) { fwrite(wbuf, 1, wbuf_n, fp); }
+    #undef WB_RESERVE
     #undef WB_FMT
     #undef WB_CH
+    #undef WB_STR
     #undef WB_FLOAT
 
     return 0;
 }
 
+// Write with caller-supplied per-atom column formats. Any of fmt_i/fmt_f/
+// fmt_b/fmt_s may be NULL to use the compiled-in default. The formats apply to
+// the per-atom data columns only (matching the pure-Python writer's
+// format_dict); info-line values keep the default formatting. fmt_f must
+// consume a double, fmt_i an int, fmt_b/fmt_s a char* ("T"/"F" or the string).
+int extxyz_write_ll_fmt(FILE *fp, int nat, DictEntry *info, DictEntry *arrays,
+                        const char *fmt_i, const char *fmt_f,
+                        const char *fmt_b, const char *fmt_s) {
+    ExtxyzWriteState ws = {0};
+    int err_stat = extxyz_write_ll_state(&ws, fp, nat, info, arrays,
+                                         fmt_i, fmt_f, fmt_b, fmt_s);
+    extxyz_write_state_free(&ws);
+    return err_stat;
+}
+
+// Buffered line reader for extxyz_scan_frames(): lines are located with
+// memchr() in large fread() chunks instead of fgets() one at a time.
+typedef struct {
+    FILE *fp;
+    char *buf;
+    size_t cap, len, pos;   // buf[pos:len] is unread
+    long base;              // file offset of buf[0]
+    int eof;
+} ScanBuf;
+
+// Find the next line of sb: [*start, *stop) indexes buf, excluding the '\n'.
+// Returns 0 at EOF, 1 for a line ending in '\n' and 2 for a last line cut off
+// by EOF. The line is valid until the next call.
+static int scan_line(ScanBuf *sb, size_t *start, size_t *stop) {
+    size_t searched = sb->pos;
+    for (;;) {
+        char *nl = searched < sb->len ?
+            memchr(sb->buf + searched, '\n', sb->len - searched) : 0;
+        if (nl) {
+            *start = sb->pos;
+            *stop = (size_t) (nl - sb->buf);
+            sb->pos = *stop + 1;
+            return 1;
+        }
+        if (sb->eof) {
+            if (sb->pos == sb->len)
+                return 0;
+            *start = sb->pos;
+            *stop = sb->pos = sb->len;
+            return 2;
+        }
+        // keep the partial line, move it to the front and read more
+        if (sb->pos > 0) {
+            memmove(sb->buf, sb->buf + sb->pos, sb->len - sb->pos);
+            sb->base += (long) sb->pos;
+            sb->len -= sb->pos;
+            sb->pos = 0;
+        }
+        searched = sb->len;
+        if (sb->len == sb->cap) {
+            char *grown = (char *) realloc(sb->buf, 2 * sb->cap);
+            if (! grown) {
+                sb->eof = 1;
+                continue;
+            }
+            sb->buf = grown;
+            sb->cap *= 2;
+        }
+        size_t got = fread(sb->buf + sb->len, 1, sb->cap - sb->len, sb->fp);
+        sb->len += got;
+        if (got == 0)
+            sb->eof = 1;
+    }
+}
+
+// The natoms value of a natoms line, as sscanf("%d") reads it, or -1 if the
+// line doesn't start with a non-negative int.
+static long scan_natoms(const char *p, const char *end) {
+    while (p < end && (*p == ' ' || *p == '\t' || *p == '\r' || *p == '\v' || *p == '\f'))
+        p++;
+    if (p < end && *p == '+')
+        p++;
+    if (p == end || *p < '0' || *p > '9')
+        return -1;
+    long natoms = 0;
+    for (; p < end && *p >= '0' && *p <= '9'; p++) {
+        if (natoms > (INT_MAX - (*p - '0')) / 10)
+            return -1;
+        natoms = 10 * natoms + (*p - '0');
+    }
+    return natoms;
+}
+
+// Frame boundary scan, for random access to the frames of a file: starting at
+// the current position of fp, store the byte offsets at which up to max_frames
+// complete frames start, counting lines only (the comment and atom lines are
+// not parsed). Returns the number of offsets stored, or -1 if fp can't tell
+// its position. *end is set to the offset just past the last frame stored, and
+// fp is left there: it is the end of the file unless max_frames was reached or
+// the scan stopped at something extxyz_read_ll() won't read as a complete
+// frame -- a frame cut short by EOF, a line that is not a natoms line, etc.
+// flags: EXTXYZ_READ_COMPLETE_LINES as for extxyz_read_ll_flags().
+long extxyz_scan_frames(FILE *fp, long *offsets, long max_frames, int flags, long *end) {
+    const int complete_lines = (flags & EXTXYZ_READ_COMPLETE_LINES) != 0;
+    ScanBuf sb = {fp, 0, 1 << 20, 0, 0, ftell(fp), 0};
+    *end = sb.base;
+    if (sb.base < 0)
+        return -1;
+    sb.buf = (char *) malloc(sb.cap);
+    if (! sb.buf)
+        return -1;
+
+    long n = 0;
+    size_t start, stop;
+    while (n < max_frames) {
+        const long frame_start = sb.base + (long) sb.pos;
+        int st = scan_line(&sb, &start, &stop);
+        if (! st || (complete_lines && st == 2))
+            break;
+        long natoms = scan_natoms(sb.buf + start, sb.buf + stop);
+        if (natoms < 0)
+            break;
+        // the comment line and natoms atom lines
+        for (long li = 0; li <= natoms; li++) {
+            st = scan_line(&sb, &start, &stop);
+            if (! st || (complete_lines && st == 2))
+                goto done;
+        }
+        offsets[n++] = frame_start;
+        *end = sb.base + (long) sb.pos;
+    }
+done:
+    free(sb.buf);
+    fseek(fp, *end, SEEK_SET);
+    return n;
+}
+
 // Backward-compatible writer: default per-atom column formats.
 int extxyz_write_ll(FILE *fp, int nat, DictEntry *info, DictEntry *arrays) {
     return extxyz_write_ll_fmt(fp, nat, info, arrays, NULL, NULL, NULL, NULL);
@@ -1498,3 +2087,7 @@ long extxyz_ftell(FILE *fp) {
 int extxyz_fseek(FILE *fp, long offset, int whence) {
     return fseek(fp, offset, whence);
 }
+
+int extxyz_fflush(FILE *fp) {
+    return fflush(fp);
+}
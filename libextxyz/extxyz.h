@@ -10,7 +10,8 @@
      DictEntry **arrays: pointer to allocated storage for arrays dict, will return pointer to first entry in linked list
      char *comment: NULL or pointer to replacement comment line. Useful if a previous call failed due to parse error.
    Returns
-     int 0 for failure and 1 for success.
+     int 0 for failure and 1 for success. At end of file error_message is empty; a frame
+     cut short by end of file fails with an error_message starting "Truncated frame".
 
    Usage:
       compile grammar (once)
@@ -20,6 +21,14 @@
       use info and arrays to construct output data structures
       call free_fict(dict) for each of them to free C-allocated memory
 
+   Threads:
+      the readers and writers may be called concurrently from any number of
+      threads, each on its own FILE * (and ExtxyzReadState/ExtxyzWriteState, if
+      used), sharing one compiled grammar. libcleri keeps match data inside the
+      grammar, so comment lines parsed with EXTXYZ_READ_CLERI are serialised
+      on an internal lock; the dispatch parser (flags without
+      EXTXYZ_READ_CLERI) and the per-atom parsers run fully in parallel.
+
    DictEntry data type:
     char *key - null-terminated C string with entry key
     void *data - pointer to C-allocated data
@@ -66,17 +75,87 @@ typedef struct dict_entry_struct {
     int n_in_row;
 } DictEntry;
 
+/* Reusable writer state for writing many frames to one stream.
+
+   extxyz_write_ll_fmt() allocates its per-atom line buffer, info scratch
+   string and Properties header on every call and frees them on return. A
+   caller writing a trajectory can instead keep an ExtxyzWriteState alive and
+   call extxyz_write_ll_state(): the buffers keep their capacity across frames
+   and the quoted Properties header is only rebuilt when the column layout
+   changes. Zero-initialise before first use (ExtxyzWriteState ws = {0};) and
+   release with extxyz_write_state_free(). All fields except `atomic` are
+   internal.
+*/
+typedef struct extxyz_write_state_struct {
+    char *wbuf;                     // frame output buffer
+    size_t wbuf_cap;
+    char *entry_str;                // scratch for one info entry
+    unsigned long entry_str_len;
+    char *props_str;                // scratch for this frame's Properties
+    unsigned long props_str_len;
+    char *props_last;               // Properties of the previous frame
+    char *props_quoted;             // quoted(props_last), reused while unchanged
+    int atomic;                     // set to write each frame with one write(), see extxyz.c
+} ExtxyzWriteState;
+
+/* Reusable reader state for reading many frames from one stream.
+
+   Zero-initialise (ExtxyzReadState rs = {0};), set cache_max and pass to
+   extxyz_read_ll_state() for each frame; release with
+   extxyz_read_state_free().
+
+   cache_max > 0 enables an LRU cache of up to cache_max parsed comment lines,
+   keyed by the exact comment string: a frame whose comment line is
+   byte-identical to a recently seen one gets a copy of the cached info dict
+   instead of re-running the comment-line parser. cache_hits and cache_misses
+   count lookups.
+
+   The reader also keeps the column plan compiled from the last Properties
+   string (and, in regex mode, its per-line regex) and reuses it for the next
+   frame whose Properties is unchanged. The other fields are internal.
+*/
+typedef struct extxyz_comment_cache_entry_struct {
+    unsigned long long hash;
+    char *comment;
+    DictEntry *info;
+    struct extxyz_comment_cache_entry_struct *prev, *next;
+} ExtxyzCommentCacheEntry;
+
+typedef struct extxyz_read_state_struct {
+    int cache_max;                      // capacity, 0 disables the cache
+    int cache_len;
+    ExtxyzCommentCacheEntry *cache_head;  // most recently used
+    ExtxyzCommentCacheEntry *cache_tail;  // least recently used
+    unsigned long cache_hits, cache_misses;
+    struct extxyz_column_plan_struct *plan;  // plan for the last Properties
+} ExtxyzReadState;
+
 void print_dict(DictEntry *dict);
 void free_dict(DictEntry *dict);
 int extxyz_read_ll(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEntry **info, DictEntry **arrays, char *comment, char *error_message);
+// flags for extxyz_read_ll_flags
+#define EXTXYZ_READ_TOKENIZER       1  // whitespace tokenizer instead of PCRE2 for atom lines
+#define EXTXYZ_READ_CLERI           2  // libcleri grammar instead of the dispatch parser for the comment
+#define EXTXYZ_READ_COMPLETE_LINES  4  // a last line without '\n' makes the frame truncated
+#define EXTXYZ_READ_SKIP_ATOMS      8  // skip the atom lines unparsed; *arrays is set to NULL
+int extxyz_read_ll_flags(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEntry **info, DictEntry **arrays, char *comment, char *error_message, int flags);
+int extxyz_read_ll_state(ExtxyzReadState *rs, cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEntry **info, DictEntry **arrays, char *comment, char *error_message, int flags);
+void extxyz_read_state_free(ExtxyzReadState *rs);
+long extxyz_scan_frames(FILE *fp, long *offsets, long max_frames, int flags, long *end);
 int extxyz_read_ll_opts(cleri_grammar_t *kv_grammar, FILE *fp, int *nat, DictEntry **info, DictEntry **arrays, char *comment, char *error_message, int use_tokenizer, int use_cleri);
 int extxyz_write_ll(FILE *fp, int nat, DictEntry *info, DictEntry *arrays);
 int extxyz_write_ll_fmt(FILE *fp, int nat, DictEntry *info, DictEntry *arrays,
                         const char *fmt_i, const char *fmt_f,
                         const char *fmt_b, const char *fmt_s);
+int extxyz_write_ll_state(ExtxyzWriteState *ws, FILE *fp, int nat,
+                          DictEntry *info, DictEntry *arrays,
+                          const char *fmt_i, const char *fmt_f,
+                          const char *fmt_b, const char *fmt_s);
+void extxyz_write_state_free(ExtxyzWriteState *ws);
 void* extxyz_malloc(size_t nbytes);
 
 FILE *extxyz_fopen(const char *filename, const char *mode);
 int extxyz_fclose(FILE *fp);
 long extxyz_ftell(FILE *fp);
 int extxyz_fseek(FILE *fp, long offset, int whence);
+int extxyz_fflush(FILE *fp);
@@ -6,10 +6,13 @@
  * alternative(s) are tried instead of libcleri walking the whole ordered
  * Choice, and folds parse + marshalling into one pass.
  *
- * Token extents are validated with the EXACT grammar PCRE2 patterns (the same
- * INTEGER_RE/FLOAT_RE/BOOL_RE the generated grammar uses), so the accepted
- * language matches by construction. Output parity is then guaranteed by reusing
- * the real finalize (DataLinkedList_to_data) + helpers from extxyz.c.
+ * Scalar token extents (int, float, bool, bare string) come from hand-written
+ * scanners that return exactly what an anchored match of the grammar's
+ * INTEGER_RE/FLOAT_RE/BOOL_RE/barestring regex would (checked by fuzzing against
+ * PCRE2 through extxyz_dispatch_token, tests/test_dispatch_parity.py). Quoted
+ * strings and Properties still use the grammar's PCRE2 patterns, with one
+ * match_data per parse. Output parity is then guaranteed by reusing the real
+ * finalize (DataLinkedList_to_data) + helpers from extxyz.c.
  */
 #include <stdio.h>
 #include <stdlib.h>
@@ -23,6 +26,11 @@
 #include "extxyz.h"
 #include "extxyz_kv_grammar.h"   /* INTEGER_RE, FLOAT_RE, BOOL_RE */
 #include "extxyz_dispatch.h"
+#include "extxyz_thread.h"
+#include "extxyz_stats.h"
+
+// count allocations for the stats (see extxyz_stats.h)
+#define malloc(n) extxyz_stats_malloc(n)
 
 /* ---- reused from extxyz.c (non-static) ---- */
 extern void init_DictEntry(DictEntry *entry, const char *key, const int key_len);
@@ -41,35 +49,138 @@ enum { RX_INT, RX_FLOAT, RX_BOOL, RX_BARE, RX_DQ, RX_CB, RX_SB, RX_PROP, NRX };
 static pcre2_code *g_rx[NRX];
 static const char *g_rx_src[NRX] = { INTEGER_RE, FLOAT_RE, BOOL_RE, BARESTRING_RE, DQ_RE, CB_RE, SB_RE, PROP_RE };
 static int g_initialized = 0;
+static extxyz_mutex_t g_lock = EXTXYZ_MUTEX_INIT;   /* guards g_rx / g_initialized */
 
+/* The compiled patterns are only read while parsing (each parse has its own
+   match data), so once initialised they can be shared by any number of threads. */
 void extxyz_dispatch_init(void) {
-    if (g_initialized) return;
-    int err; PCRE2_SIZE eo;
-    for (int i = 0; i < NRX; i++) {
-        g_rx[i] = pcre2_compile((PCRE2_SPTR)g_rx_src[i], PCRE2_ZERO_TERMINATED, 0, &err, &eo, NULL);
-        if (!g_rx[i]) { fprintf(stderr, "extxyz_dispatch: regex %d compile fail at %zu\n", i, eo); exit(2); }
-        pcre2_jit_compile(g_rx[i], PCRE2_JIT_COMPLETE);
+    extxyz_mutex_lock(&g_lock);
+    if (!g_initialized) {
+        int err; PCRE2_SIZE eo;
+        for (int i = 0; i < NRX; i++) {
+            g_rx[i] = pcre2_compile((PCRE2_SPTR)g_rx_src[i], PCRE2_ZERO_TERMINATED, 0, &err, &eo, NULL);
+            if (!g_rx[i]) { fprintf(stderr, "extxyz_dispatch: regex %d compile fail at %zu\n", i, eo); exit(2); }
+            pcre2_jit_compile(g_rx[i], PCRE2_JIT_COMPLETE);
+        }
+        g_initialized = 1;
     }
-    g_initialized = 1;
+    extxyz_mutex_unlock(&g_lock);
 }
 
 void extxyz_dispatch_free(void) {
-    if (!g_initialized) return;
-    for (int i = 0; i < NRX; i++) { pcre2_code_free(g_rx[i]); g_rx[i] = NULL; }
-    g_initialized = 0;
+    extxyz_mutex_lock(&g_lock);
+    if (g_initialized) {
+        for (int i = 0; i < NRX; i++) { pcre2_code_free(g_rx[i]); g_rx[i] = NULL; }
+        g_initialized = 0;
+    }
+    extxyz_mutex_unlock(&g_lock);
 }
 
-/* anchored match of pattern i at s+pos; returns match length, or -1 if no match. */
-static int rmatch(int i, const char *s, size_t len, size_t pos) {
-    pcre2_match_data *md = pcre2_match_data_create_from_pattern(g_rx[i], NULL);
+/* anchored match of pattern i at s+pos; returns match length, or -1 if no match.
+   md is the caller's match data, created once per parse (see new_match_data). */
+static int rmatch(pcre2_match_data *md, int i, const char *s, size_t len, size_t pos) {
     int rc = pcre2_match(g_rx[i], (PCRE2_SPTR)s, len, pos, PCRE2_ANCHORED, md, NULL);
-    int out = -1;
-    if (rc >= 0) {
-        PCRE2_SIZE *ov = pcre2_get_ovector_pointer(md);
-        out = (int)(ov[1] - ov[0]);
+    if (rc < 0) return -1;
+    PCRE2_SIZE *ov = pcre2_get_ovector_pointer(md);
+    return (int)(ov[1] - ov[0]);
+}
+
+/* match data large enough for any of the g_rx patterns */
+static pcre2_match_data *new_match_data(void) {
+    uint32_t max_pairs = 1;
+    for (int i = 0; i < NRX; i++) {
+        uint32_t n;
+        pcre2_pattern_info(g_rx[i], PCRE2_INFO_CAPTURECOUNT, &n);
+        if (n + 1 > max_pairs) max_pairs = n + 1;
     }
-    pcre2_match_data_free(md);
-    return out;
+    return pcre2_match_data_create(max_pairs, NULL);
+}
+
+/* ---- hand-written scanners for the scalar token regexes ----
+   Each returns the length of the anchored match of the corresponding regex at
+   s+pos (as rmatch would), or -1. PCRE2 without UCP: \w is [A-Za-z0-9_] and
+   \s is [ \t\n\v\f\r]. */
+static int is_word(const char *s, size_t len, size_t i) {
+    if (i >= len) return 0;
+    char c = s[i];
+    return (c>='a'&&c<='z') || (c>='A'&&c<='Z') || (c>='0'&&c<='9') || c=='_';
+}
+static int is_digit(const char *s, size_t len, size_t i) { return i < len && s[i]>='0' && s[i]<='9'; }
+static size_t digit_run(const char *s, size_t len, size_t i) { size_t n=0; while (is_digit(s,len,i+n)) n++; return n; }
+
+/* INTEGER_RE: [+-]?(?:0|[1-9][0-9]*)\b */
+static int scan_int(const char *s, size_t len, size_t pos) {
+    size_t q = pos;
+    if (q<len && (s[q]=='+'||s[q]=='-')) q++;
+    if (!is_digit(s,len,q)) return -1;
+    size_t e = (s[q]=='0') ? q+1 : q+digit_run(s,len,q);
+    return is_word(s,len,e) ? -1 : (int)(e-pos);
+}
+
+/* FLOAT_RE's num_end at e: (?:(?<=\d)(?!\.)\b|(?<=\.)(?!\w)) */
+static int float_end_ok(const char *s, size_t len, size_t e) {
+    char prev = s[e-1];
+    if (prev>='0' && prev<='9') return !is_word(s,len,e) && !(e<len && s[e]=='.');
+    if (prev=='.') return !is_word(s,len,e);
+    return 0;
+}
+
+/* optional exponent [dDeE][+-]?[0-9]+ at e: returns its end, or e if absent */
+static size_t float_exp(const char *s, size_t len, size_t e) {
+    if (!(e<len && (s[e]=='d'||s[e]=='D'||s[e]=='e'||s[e]=='E'))) return e;
+    size_t t = e+1;
+    if (t<len && (s[t]=='+'||s[t]=='-')) t++;
+    size_t m = digit_run(s,len,t);
+    return m ? t+m : e;
+}
+
+/* FLOAT_RE: [+-]?(?:(?:int\.|\.)[0-9]*exp?|int exp?|int)num_end, int=0|[1-9][0-9]*.
+   Only maximal digit runs can satisfy num_end, so PCRE2's backtracking reduces
+   to trying (with exponent, without) for the decimal branch, then the int one. */
+static int scan_float(const char *s, size_t len, size_t pos) {
+    size_t q = pos;
+    if (q<len && (s[q]=='+'||s[q]=='-')) q++;
+    size_t nint = 0;
+    if (is_digit(s,len,q)) nint = (s[q]=='0') ? 1 : digit_run(s,len,q);
+    size_t r = 0;
+    if (nint && q+nint<len && s[q+nint]=='.') r = q+nint+1;
+    else if (!nint && q<len && s[q]=='.') r = q+1;
+    if (r) {
+        size_t e = r+digit_run(s,len,r), x = float_exp(s,len,e);
+        if (x>e && float_end_ok(s,len,x)) return (int)(x-pos);
+        if (float_end_ok(s,len,e)) return (int)(e-pos);
+    }
+    if (nint) {
+        size_t e = q+nint, x = float_exp(s,len,e);
+        if (x>e && float_end_ok(s,len,x)) return (int)(x-pos);
+        if (float_end_ok(s,len,e)) return (int)(e-pos);
+    }
+    return -1;
+}
+
+/* BOOL_RE: \b(?:[tT]rue|[fF]alse|TRUE|FALSE|[TF])\b */
+static int scan_bool(const char *s, size_t len, size_t pos) {
+    if (pos>0 && is_word(s,len,pos-1)) return -1;
+    const char *p = s+pos; size_t avail = len-pos;
+    if (avail>=4 && (!strncmp(p,"true",4)||!strncmp(p,"True",4)||!strncmp(p,"TRUE",4)) && !is_word(s,len,pos+4)) return 4;
+    if (avail>=5 && (!strncmp(p,"false",5)||!strncmp(p,"False",5)||!strncmp(p,"FALSE",5)) && !is_word(s,len,pos+5)) return 5;
+    if (avail>=1 && (p[0]=='T'||p[0]=='F') && !is_word(s,len,pos+1)) return 1;
+    return -1;
+}
+
+/* BARESTRING_RE: (?:[^\s=",}{\]\[\\]|\\[\s=",}{\]\[\\])+ */
+static int is_bare_special(char c) {
+    return c==' '||c=='\t'||c=='\n'||c=='\v'||c=='\f'||c=='\r'||c=='='||c=='"'||c==','||
+           c=='}'||c=='{'||c==']'||c=='['||c=='\\';
+}
+static int scan_bare(const char *s, size_t len, size_t pos) {
+    size_t p = pos;
+    while (p<len) {
+        if (!is_bare_special(s[p])) p++;
+        else if (s[p]=='\\' && p+1<len && is_bare_special(s[p+1])) p+=2;
+        else break;
+    }
+    return p>pos ? (int)(p-pos) : -1;
 }
 
 /* ---- DataLinkedList append (mirrors parse_tree) ---- */
@@ -135,12 +246,12 @@ static int parse_old_body(const char *s, size_t len, size_t *pp, char close,
         /* dispatch the element on its first char to avoid trying every type */
         char ec=s[p]; enum data_type et; int n;
         if ((ec>='0'&&ec<='9')||ec=='+'||ec=='-'||ec=='.') {
-            int ni=rmatch(RX_INT,s,len,p), nf=rmatch(RX_FLOAT,s,len,p);
+            int ni=scan_int(s,len,p), nf=scan_float(s,len,p);
             if (ni>0 && ni>=nf) { et=data_i; n=ni; }
             else if (nf>0)      { et=data_f; n=nf; }
             else return -1;
         } else {
-            int nb=rmatch(RX_BOOL,s,len,p);
+            int nb=scan_bool(s,len,p);
             if (nb>0) { et=data_b; n=nb; }
             else return -1; /* not numeric/bool -> caller falls back to string */
         }
@@ -160,7 +271,7 @@ static int parse_old_body(const char *s, size_t len, size_t *pp, char close,
 /* parse a list of r_string elements until `close` (one_d_array_s / strings_sp).
    Returns count, or -1 if an element isn't a valid string or close is missing.
    require_comma as in parse_old_body. */
-static int parse_string_list(const char *s, size_t len, size_t *pp, char close,
+static int parse_string_list(pcre2_match_data *md, const char *s, size_t len, size_t *pp, char close,
                              DictEntry *e, int require_comma) {
     size_t p=*pp; int count=0;
     for (;;) {
@@ -170,8 +281,8 @@ static int parse_string_list(const char *s, size_t len, size_t *pp, char close,
         if (count>0 && !consume_sep(s, len, &p, close, require_comma)) return -1;
         char c=s[p]; int n; int which=-1;
         if (c=='"') which=RX_DQ; else if (c=='{') which=RX_CB; else if (c=='[') which=RX_SB;
-        if (which>=0) { n=rmatch(which,s,len,p); }
-        else { n=rmatch(RX_BARE,s,len,p); }
+        if (which>=0) { n=rmatch(md,which,s,len,p); }
+        else { n=scan_bare(s,len,p); }
         if (n<=0) return -1;
         char *tok=dupn(s,p,n); if (which>=0) unquote(tok);
         append_item(e,data_s,0,0,0,tok);
@@ -189,7 +300,7 @@ static void reset_entry_data(DictEntry *e) {
 }
 
 /* parse one value into entry e; returns end pos or (size_t)-1 on failure */
-static size_t parse_value(const char *s, size_t len, size_t pos, DictEntry *e) {
+static size_t parse_value(pcre2_match_data *md, const char *s, size_t len, size_t pos, DictEntry *e) {
     skip_ws(s, len, &pos);
     if (pos>=len) return (size_t)-1;
     char c = s[pos];
@@ -210,7 +321,7 @@ static size_t parse_value(const char *s, size_t len, size_t pos, DictEntry *e) {
                 size_t rs=p+1, rp=p+1; enum data_type t;
                 int n=parse_old_body(s,len,&rp,']',e,&t,1);
                 if (n<0) { /* string row (one_d_array_s) */
-                    rp=rs; n=parse_string_list(s,len,&rp,']',e,1);
+                    rp=rs; n=parse_string_list(md,s,len,&rp,']',e,1);
                     if (n<0) return (size_t)-1;
                 }
                 p=rp;
@@ -222,10 +333,10 @@ static size_t parse_value(const char *s, size_t len, size_t pos, DictEntry *e) {
             enum data_type t; int n=parse_old_body(s,len,&p,']',e,&t,1);
             if (n<0) {  /* one_d_array_s: all-string [...]; else sb-string scalar */
                 reset_entry_data(e);
-                size_t ps=pos+1; int sc=parse_string_list(s,len,&ps,']',e,1);
+                size_t ps=pos+1; int sc=parse_string_list(md,s,len,&ps,']',e,1);
                 if (sc>0) { e->nrows=0; e->ncols=sc; return ps; }
                 reset_entry_data(e);
-                int sl=rmatch(RX_SB,s,len,pos);
+                int sl=rmatch(md,RX_SB,s,len,pos);
                 if (sl<0) return (size_t)-1;
                 char *tok=dupn(s,pos,sl); unquote(tok);
                 append_item(e,data_s,0,0,0,tok); e->nrows=e->ncols=0;
@@ -251,7 +362,7 @@ static size_t parse_value(const char *s, size_t len, size_t pos, DictEntry *e) {
         /* {…} also allows a string list (old_one_d_array strings branch) */
         if (c=='{') {
             reset_entry_data(e);
-            size_t ps=pos+1; int sc=parse_string_list(s,len,&ps,'}',e,0);
+            size_t ps=pos+1; int sc=parse_string_list(md,s,len,&ps,'}',e,0);
             if (sc>0) {
                 if (sc==1){e->nrows=0;e->ncols=0;} else if (sc==9){e->nrows=-3;e->ncols=-3;}
                 else {e->nrows=0;e->ncols=sc;}
@@ -263,7 +374,7 @@ static size_t parse_value(const char *s, size_t len, size_t pos, DictEntry *e) {
         reset_entry_data(e);
         if (c=='\'') return (size_t)-1;
         int which = (c=='"') ? RX_DQ : RX_CB;
-        int sl=rmatch(which,s,len,pos);
+        int sl=rmatch(md,which,s,len,pos);
         if (sl<0) return (size_t)-1;
         char *tok=dupn(s,pos,sl); unquote(tok);
         append_item(e,data_s,0,0,0,tok); e->nrows=e->ncols=0;
@@ -271,8 +382,8 @@ static size_t parse_value(const char *s, size_t len, size_t pos, DictEntry *e) {
     }
 
     /* --- scalar: most_greedy over {int,float,bool,bare-string} --- */
-    int ni=rmatch(RX_INT,s,len,pos), nf=rmatch(RX_FLOAT,s,len,pos);
-    int nb=rmatch(RX_BOOL,s,len,pos), ns=rmatch(RX_BARE,s,len,pos);
+    int ni=scan_int(s,len,pos), nf=scan_float(s,len,pos);
+    int nb=scan_bool(s,len,pos), ns=scan_bare(s,len,pos);
     int best=-1, which=-1;
     if (ni>best){best=ni;which=RX_INT;}
     if (nf>best){best=nf;which=RX_FLOAT;}
@@ -285,17 +396,17 @@ static size_t parse_value(const char *s, size_t len, size_t pos, DictEntry *e) {
 }
 
 /* parse a key into *keyout (NUL-terminated, unquoted); returns end pos or -1 */
-static size_t parse_key(const char *s, size_t len, size_t pos, char **keyout, int *keylen) {
+static size_t parse_key(pcre2_match_data *md, const char *s, size_t len, size_t pos, char **keyout, int *keylen) {
     skip_ws(s,len,&pos);
     if (pos>=len) return (size_t)-1;
     char c=s[pos];
     if (c=='"'||c=='{'||c=='[') {
         int which=(c=='"')?RX_DQ:(c=='{')?RX_CB:RX_SB;
-        int n=rmatch(which,s,len,pos); if (n<0) return (size_t)-1;
+        int n=rmatch(md,which,s,len,pos); if (n<0) return (size_t)-1;
         char *k=dupn(s,pos,n); unquote(k); *keyout=k; *keylen=(int)strlen(k);
         return pos+n;
     }
-    int n=rmatch(RX_BARE,s,len,pos); if (n<0) return (size_t)-1;
+    int n=scan_bare(s,len,pos); if (n<0) return (size_t)-1;
     *keyout=dupn(s,pos,n); *keylen=n;
     return pos+n;
 }
@@ -308,6 +419,7 @@ static void set_parse_error(char *error_message, size_t pos) {
 DictEntry *extxyz_dispatch_parse(const char *s, char *error_message) {
     extxyz_dispatch_init();   /* idempotent; no-op once compiled */
     size_t len=strlen(s), pos=0;
+    pcre2_match_data *md=new_match_data();
     DictEntry *dict=(DictEntry*)malloc(sizeof(DictEntry));
     init_DictEntry(dict,0,-1);
     DictEntry *cur=dict;
@@ -321,7 +433,7 @@ DictEntry *extxyz_dispatch_parse(const char *s, char *error_message) {
             if (p>=len || !(isalnum((unsigned char)s[p])||s[p]=='_')) { /* keyword \b */
                 skip_ws(s,len,&p);
                 if (p<len && s[p]=='='){ p++; skip_ws(s,len,&p);
-                    int pl=rmatch(RX_PROP,s,len,p);
+                    int pl=rmatch(md,RX_PROP,s,len,p);
                     if (pl>0) {
                         if (cur->key){ DictEntry*ne=malloc(sizeof(DictEntry)); cur->next=ne; cur=ne; }
                         init_DictEntry(cur,"Properties",10);
@@ -334,20 +446,22 @@ DictEntry *extxyz_dispatch_parse(const char *s, char *error_message) {
         }
         if (!handled) {
             char *key; int klen;
-            size_t kp=parse_key(s,len,pos,&key,&klen);
-            if (kp==(size_t)-1){ free_dict(dict); set_parse_error(error_message,pos); return NULL; }
+            size_t kp=parse_key(md,s,len,pos,&key,&klen);
+            if (kp==(size_t)-1){ pcre2_match_data_free(md); free_dict(dict); set_parse_error(error_message,pos); return NULL; }
             skip_ws(s,len,&kp);
-            if (kp>=len || s[kp]!='='){ free(key); free_dict(dict); set_parse_error(error_message,kp); return NULL; }
+            if (kp>=len || s[kp]!='='){ pcre2_match_data_free(md); free(key); free_dict(dict); set_parse_error(error_message,kp); return NULL; }
             kp++;
             if (cur->key){ DictEntry*ne=malloc(sizeof(DictEntry)); cur->next=ne; cur=ne; }
             init_DictEntry(cur,key,klen); free(key);
-            size_t vp=parse_value(s,len,kp,cur);
-            if (vp==(size_t)-1){ free_dict(dict); set_parse_error(error_message,kp); return NULL; }
+            size_t vp=parse_value(md,s,len,kp,cur);
+            if (vp==(size_t)-1){ pcre2_match_data_free(md); free_dict(dict); set_parse_error(error_message,kp); return NULL; }
             pos=vp;
         }
         skip_ws(s,len,&pos);
     }
 
+    pcre2_match_data_free(md);
+
     char err[1024];
     if (DataLinkedList_to_data(dict,err)) {
         free_dict(dict);
@@ -356,3 +470,25 @@ DictEntry *extxyz_dispatch_parse(const char *s, char *error_message) {
     }
     return dict;
 }
+
+/* Public, for conformance tests: anchored match length of scalar token class
+   `kind` (0 int, 1 float, 2 bool, 3 bare string) at s+pos, using the grammar
+   regex (use_regex != 0) or the hand-written scanner. -1 if no match. */
+int extxyz_dispatch_token(int kind, const char *s, size_t pos, int use_regex) {
+    static const int rx[] = { RX_INT, RX_FLOAT, RX_BOOL, RX_BARE };
+    size_t len = strlen(s);
+    if (kind < 0 || kind > 3 || pos > len) return -1;
+    if (use_regex) {
+        extxyz_dispatch_init();
+        pcre2_match_data *md = new_match_data();
+        int n = rmatch(md, rx[kind], s, len, pos);
+        pcre2_match_data_free(md);
+        return n;
+    }
+    switch (kind) {
+        case 0: return scan_int(s, len, pos);
+        case 1: return scan_float(s, len, pos);
+        case 2: return scan_bool(s, len, pos);
+        default: return scan_bare(s, len, pos);
+    }
+}
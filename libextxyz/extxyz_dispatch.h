@@ -8,21 +8,27 @@
  * provability is maintained by a differential conformance test against cleri
  * (tests/test_dispatch_parity.py), with cleri retained as the canonical grammar.
  *
- * Selected at read time by use_cleri=0 (see extxyz_read_ll_opts). Reuses the
- * grammar's own PCRE2 token patterns (INTEGER_RE/FLOAT_RE/BOOL_RE/...), so the
- * accepted token language is identical by construction.
+ * Selected at read time by use_cleri=0 (see extxyz_read_ll_opts). Scalar
+ * tokens are recognised by hand-written scanners equivalent to the grammar's
+ * INTEGER_RE/FLOAT_RE/BOOL_RE/barestring patterns (fuzzed against PCRE2 via
+ * extxyz_dispatch_token); quoted strings and Properties reuse the grammar's
+ * own PCRE2 patterns.
  */
 #ifndef EXTXYZ_DISPATCH_H
 #define EXTXYZ_DISPATCH_H
 
+#include <stddef.h>
+
 struct dict_entry_struct;
 
-/* Compile + JIT the token regexes once. Idempotent; safe to call repeatedly.
- * Called eagerly at Python import and lazily on first parse otherwise. */
+/* Compile + JIT the token regexes once. Idempotent and thread-safe; safe to
+ * call repeatedly and concurrently. Called eagerly at Python import and lazily
+ * on first parse otherwise. extxyz_dispatch_parse may then run concurrently on
+ * any number of threads. */
 void extxyz_dispatch_init(void);
 
 /* Free the cached compiled regexes (process-exit cleanup, mirrors the grammar
- * free); leaves the parser re-initialisable. */
+ * free); leaves the parser re-initialisable. Must not race with parses. */
 void extxyz_dispatch_free(void);
 
 /* Parse comment line `s`. Returns a DictEntry linked list identical to
@@ -30,4 +36,9 @@ void extxyz_dispatch_free(void);
  * set to a "Failed to parse string ..." message matching the cleri path). */
 struct dict_entry_struct *extxyz_dispatch_parse(const char *s, char *error_message);
 
+/* Conformance hook: length of the anchored match of scalar token class `kind`
+ * (0 int, 1 float, 2 bool, 3 bare string) at s+pos, from the grammar regex
+ * (use_regex != 0) or the dispatcher's scanner; -1 if no match. */
+int extxyz_dispatch_token(int kind, const char *s, size_t pos, int use_regex);
+
 #endif /* EXTXYZ_DISPATCH_H */
@@ -0,0 +1,72 @@
+#include <string.h>
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <time.h>
+#endif
+
+#include "extxyz_stats.h"
+
+volatile int extxyz_stats_on = 0;
+unsigned long long extxyz_stats_values[EXTXYZ_STAT_N];
+
+// in enum extxyz_stat order
+static const char *stat_names[EXTXYZ_STAT_N] = {
+    "line_io_ns", "comment_ns", "plan_ns", "tokenize_ns", "fields_ns",
+    "marshal_ns", "frames", "lines", "bytes", "comments_cleri",
+    "comments_dispatch", "comments_cached", "plans_built", "floats_fast",
+    "floats_strtod", "mallocs",
+};
+
+void extxyz_stats_enable(int on) {
+    extxyz_stats_on = on != 0;
+}
+
+int extxyz_stats_enabled(void) {
+    return extxyz_stats_on;
+}
+
+// Zero all timers and counters. Reads in progress on other threads may still
+// add to them afterwards.
+void extxyz_stats_reset(void) {
+    for (int i = 0; i < EXTXYZ_STAT_N; i++) {
+#if defined(_MSC_VER) && !defined(__clang__)
+        _InterlockedExchange64((volatile long long *) &extxyz_stats_values[i], 0);
+#else
+        __atomic_store_n(&extxyz_stats_values[i], 0, __ATOMIC_RELAXED);
+#endif
+    }
+}
+
+int extxyz_stats_count(void) {
+    return EXTXYZ_STAT_N;
+}
+
+const char *extxyz_stats_name(int which) {
+    return which >= 0 && which < EXTXYZ_STAT_N ? stat_names[which] : 0;
+}
+
+unsigned long long extxyz_stats_value(int which) {
+    if (which < 0 || which >= EXTXYZ_STAT_N)
+        return 0;
+#if defined(_MSC_VER) && !defined(__clang__)
+    return (unsigned long long) _InterlockedOr64((volatile long long *) &extxyz_stats_values[which], 0);
+#else
+    return __atomic_load_n(&extxyz_stats_values[which], __ATOMIC_RELAXED);
+#endif
+}
+
+unsigned long long extxyz_stats_now(void) {
+#ifdef _WIN32
+    static LARGE_INTEGER freq;
+    LARGE_INTEGER now;
+    if (! freq.QuadPart)
+        QueryPerformanceFrequency(&freq);
+    QueryPerformanceCounter(&now);
+    return (unsigned long long) ((double) now.QuadPart * 1e9 / (double) freq.QuadPart);
+#else
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (unsigned long long) ts.tv_sec * 1000000000ull + (unsigned long long) ts.tv_nsec;
+#endif
+}
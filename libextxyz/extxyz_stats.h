@@ -0,0 +1,75 @@
+#ifndef EXTXYZ_STATS_H
+#define EXTXYZ_STATS_H
+
+#include <stdlib.h>
+#if defined(_MSC_VER) && !defined(__clang__)
+#include <intrin.h>
+#endif
+
+// Optional instrumentation of the reader: cumulative per-phase timers (in
+// nanoseconds) and counters, shared by all threads. It is compiled in but off
+// until extxyz_stats_enable(1); while off each instrumented site costs one
+// test of extxyz_stats_on. While on, timing an atom line takes a few reads of
+// the monotonic clock, so the totals include some overhead of their own.
+
+enum extxyz_stat {
+    EXTXYZ_STAT_LINE_IO_NS,     // reading lines from the stream
+    EXTXYZ_STAT_COMMENT_NS,     // parsing comment lines (cleri, dispatch or cache)
+    EXTXYZ_STAT_PLAN_NS,        // finding or building the column plan, allocating the columns
+    EXTXYZ_STAT_TOKENIZE_NS,    // splitting atom lines into fields (or regex matching)
+    EXTXYZ_STAT_FIELDS_NS,      // converting fields to values: mostly float parsing
+    EXTXYZ_STAT_MARSHAL_NS,     // building the Python objects (C-API read path)
+    EXTXYZ_STAT_FRAMES,         // frames read
+    EXTXYZ_STAT_LINES,          // lines read
+    EXTXYZ_STAT_BYTES,          // bytes read
+    EXTXYZ_STAT_COMMENTS_CLERI,     // comment lines parsed by the libcleri grammar
+    EXTXYZ_STAT_COMMENTS_DISPATCH,  // ... by the first-char dispatch parser
+    EXTXYZ_STAT_COMMENTS_CACHED,    // ... found in the comment-line cache
+    EXTXYZ_STAT_PLANS_BUILT,    // column plans built (not reused)
+    EXTXYZ_STAT_FLOATS_FAST,    // floats parsed by extxyz_parse_double
+    EXTXYZ_STAT_FLOATS_STRTOD,  // floats that fell back to strtod/atof
+    EXTXYZ_STAT_MALLOCS,        // malloc/calloc calls by the C core
+    EXTXYZ_STAT_N
+};
+
+extern volatile int extxyz_stats_on;
+extern unsigned long long extxyz_stats_values[EXTXYZ_STAT_N];
+
+void extxyz_stats_enable(int on);
+int extxyz_stats_enabled(void);
+void extxyz_stats_reset(void);
+int extxyz_stats_count(void);
+const char *extxyz_stats_name(int which);
+unsigned long long extxyz_stats_value(int which);
+unsigned long long extxyz_stats_now(void);  // monotonic clock, in ns
+
+static inline void extxyz_stats_add(int which, unsigned long long n) {
+#if defined(_MSC_VER) && !defined(__clang__)
+    _InterlockedExchangeAdd64((volatile long long *) &extxyz_stats_values[which], (long long) n);
+#else
+    __atomic_fetch_add(&extxyz_stats_values[which], n, __ATOMIC_RELAXED);
+#endif
+}
+
+// Add n to a counter, if the stats are on
+#define EXTXYZ_STATS_ADD(which, n) \
+    do { if (extxyz_stats_on) extxyz_stats_add(EXTXYZ_STAT_##which, (n)); } while (0)
+
+// Start and stop a timer: t is an unsigned long long local, 0 while the stats
+// are off
+#define EXTXYZ_STATS_START(t) ((t) = extxyz_stats_on ? extxyz_stats_now() : 0)
+#define EXTXYZ_STATS_STOP(which, t) \
+    do { if (t) extxyz_stats_add(EXTXYZ_STAT_##which, extxyz_stats_now() - (t)); } while (0)
+
+// Counted allocation, for the #define malloc/calloc in the C core's sources
+static inline void *extxyz_stats_malloc(size_t n) {
+    EXTXYZ_STATS_ADD(MALLOCS, 1);
+    return malloc(n);
+}
+
+static inline void *extxyz_stats_calloc(size_t n, size_t size) {
+    EXTXYZ_STATS_ADD(MALLOCS, 1);
+    return calloc(n, size);
+}
+
+#endif
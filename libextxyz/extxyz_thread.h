@@ -0,0 +1,21 @@
+#ifndef EXTXYZ_THREAD_H
+#define EXTXYZ_THREAD_H
+
+// Minimal statically-initialised mutex, for the few places the C core has to
+// serialise access to shared state: SRW locks on Windows, pthreads elsewhere.
+
+#ifdef _WIN32
+#include <windows.h>
+typedef SRWLOCK extxyz_mutex_t;
+#define EXTXYZ_MUTEX_INIT SRWLOCK_INIT
+static inline void extxyz_mutex_lock(extxyz_mutex_t *m) { AcquireSRWLockExclusive(m); }
+static inline void extxyz_mutex_unlock(extxyz_mutex_t *m) { ReleaseSRWLockExclusive(m); }
+#else
+#include <pthread.h>
+typedef pthread_mutex_t extxyz_mutex_t;
+#define EXTXYZ_MUTEX_INIT PTHREAD_MUTEX_INITIALIZER
+static inline void extxyz_mutex_lock(extxyz_mutex_t *m) { pthread_mutex_lock(m); }
+static inline void extxyz_mutex_unlock(extxyz_mutex_t *m) { pthread_mutex_unlock(m); }
+#endif
+
+#endif
@@ -0,0 +1,203 @@
+#include <float.h>
+#include <stdint.h>
+#include <string.h>
+
+#include "fast_parse.h"
+#include "fast_parse_table.h"
+
+#if (defined(__BYTE_ORDER__) && __BYTE_ORDER__ == __ORDER_LITTLE_ENDIAN__) || defined(_WIN32)
+// Eight ASCII digits at a time (SWAR): an 8-byte little-endian load holds the
+// digits lowest-address first, i.e. most significant digit in the low byte.
+#define SWAR_DIGITS 1
+
+static inline uint64_t load8(const char *p) {
+    uint64_t v;
+    memcpy(&v, p, 8);
+    return v;
+}
+
+static inline int is_eight_digits(uint64_t v) {
+    return (((v & 0xF0F0F0F0F0F0F0F0ULL) |
+             (((v + 0x0606060606060606ULL) & 0xF0F0F0F0F0F0F0F0ULL) >> 4))
+            == 0x3333333333333333ULL);
+}
+
+static inline uint64_t eight_digits_value(uint64_t v) {
+    const uint64_t mask = 0x000000FF000000FFULL;
+    v -= 0x3030303030303030ULL;
+    v = (v * 10) + (v >> 8);   // pairs of digits
+    return (((v & mask) * 0x000F424000000064ULL) +
+            (((v >> 16) & mask) * 0x0000271000000001ULL)) >> 32;
+}
+#endif
+
+// 64x64 -> 128-bit product
+#if defined(__SIZEOF_INT128__)
+static inline void mul128(uint64_t a, uint64_t b, uint64_t *hi, uint64_t *lo) {
+    unsigned __int128 r = (unsigned __int128) a * b;
+    *hi = (uint64_t) (r >> 64);
+    *lo = (uint64_t) r;
+}
+#elif defined(_MSC_VER) && defined(_M_X64)
+#include <intrin.h>
+static inline void mul128(uint64_t a, uint64_t b, uint64_t *hi, uint64_t *lo) {
+    *lo = _umul128(a, b, hi);
+}
+#else
+static inline void mul128(uint64_t a, uint64_t b, uint64_t *hi, uint64_t *lo) {
+    uint64_t a_lo = (uint32_t) a, a_hi = a >> 32, b_lo = (uint32_t) b, b_hi = b >> 32;
+    uint64_t ll = a_lo * b_lo, lh = a_lo * b_hi, hl = a_hi * b_lo, hh = a_hi * b_hi;
+    uint64_t mid = (ll >> 32) + (uint32_t) lh + (uint32_t) hl;
+    *hi = hh + (lh >> 32) + (hl >> 32) + (mid >> 32);
+    *lo = (mid << 32) | (uint32_t) ll;
+}
+#endif
+
+static inline int leading_zeroes(uint64_t x) {
+#if defined(_MSC_VER) && !defined(__clang__) && defined(_M_X64)
+    unsigned long i;
+    _BitScanReverse64(&i, x);
+    return 63 - (int) i;
+#elif defined(__GNUC__) || defined(__clang__)
+    return __builtin_clzll(x);
+#else
+    int n = 0;
+    while (! (x & 0x8000000000000000ULL)) { x <<= 1; n++; }
+    return n;
+#endif
+}
+
+// Eisel-Lemire: w * 10^q (w != 0, exact) as the bits of the nearest double,
+// without the sign. The two-word product is always sufficient when w is exact
+// (Mushtak & Lemire, "Fast number parsing without fallback", 2023).
+static uint64_t eisel_lemire(int64_t q, uint64_t w) {
+    const int mantissa_bits = 52;
+    const int min_exponent = -1023;
+    const int infinite_power = 0x7FF;
+
+    if (q < POW5_SMALLEST_POWER_OF_TEN)
+        return 0;
+    if (q > POW5_LARGEST_POWER_OF_TEN)
+        return (uint64_t) infinite_power << mantissa_bits;
+
+    int lz = leading_zeroes(w);
+    w <<= lz;
+
+    // product of w with the 128-bit power of five, to 55 bits of precision
+    const int index = 2 * (int) (q - POW5_SMALLEST_POWER_OF_TEN);
+    uint64_t hi, lo;
+    mul128(w, POW5_128[index], &hi, &lo);
+    const uint64_t precision_mask = 0xFFFFFFFFFFFFFFFFULL >> (mantissa_bits + 3);
+    if ((hi & precision_mask) == precision_mask) {
+        uint64_t hi2, lo2;
+        mul128(w, POW5_128[index + 1], &hi2, &lo2);
+        lo += hi2;
+        if (hi2 > lo) hi++;
+    }
+
+    const int upperbit = (int) (hi >> 63);
+    const int shift = upperbit + 64 - mantissa_bits - 3;
+    uint64_t mantissa = hi >> shift;
+    // floor(log2(10^q)) + 63, exact over the table range
+    int32_t power2 = (int32_t) (((((152170 + 65536) * q) >> 16) + 63) + upperbit - lz - min_exponent);
+
+    if (power2 <= 0) {   // subnormal
+        if (-power2 + 1 >= 64)
+            return 0;
+        mantissa >>= -power2 + 1;
+        mantissa += (mantissa & 1);
+        mantissa >>= 1;
+        power2 = (mantissa < ((uint64_t) 1 << mantissa_bits)) ? 0 : 1;
+        return (mantissa & ~((uint64_t) 1 << mantissa_bits)) | ((uint64_t) power2 << mantissa_bits);
+    }
+
+    // exactly halfway between two doubles: round to even, not up
+    if (lo <= 1 && q >= -4 && q <= 23 && (mantissa & 3) == 1) {
+        if ((mantissa << shift) == hi)
+            mantissa &= ~(uint64_t) 1;
+    }
+    mantissa += (mantissa & 1);
+    mantissa >>= 1;
+    if (mantissa >= ((uint64_t) 2 << mantissa_bits)) {
+        mantissa = (uint64_t) 1 << mantissa_bits;
+        power2++;
+    }
+    mantissa &= ~((uint64_t) 1 << mantissa_bits);
+    if (power2 >= infinite_power)
+        return (uint64_t) infinite_power << mantissa_bits;
+    return mantissa | ((uint64_t) power2 << mantissa_bits);
+}
+
+int extxyz_parse_double(const char *s, const char *end, double *out) {
+    static const double POW10[] = {1e0,1e1,1e2,1e3,1e4,1e5,1e6,1e7,1e8,1e9,1e10,
+                                   1e11,1e12,1e13,1e14,1e15,1e16,1e17,1e18,1e19,
+                                   1e20,1e21,1e22};
+    const char *p = s;
+    int neg = 0;
+    if (p < end && *p == '-') { neg = 1; p++; } else if (p < end && *p == '+') { p++; }
+
+    // mantissa digits; leading zeros are not significant
+    uint64_t w = 0;
+    int n_digits = 0, sig = 0;
+    int64_t q = 0;
+    while (p < end && *p >= '0' && *p <= '9') {
+        w = w*10 + (uint64_t)(*p - '0');
+        n_digits++;
+        if (w) sig++;
+        p++;
+    }
+    if (p < end && *p == '.') {
+        p++;
+        const char *frac_start = p;
+        if (w == 0)   // 0.000ddd: skip zeros cheaply, they only shift q
+            while (p < end && *p == '0') p++;
+#ifdef SWAR_DIGITS
+        while (end - p >= 8 && sig <= 11 && is_eight_digits(load8(p))) {
+            w = w*100000000ULL + eight_digits_value(load8(p));
+            sig += 8;
+            p += 8;
+        }
+#endif
+        while (p < end && *p >= '0' && *p <= '9') {
+            w = w*10 + (uint64_t)(*p - '0');
+            if (w) sig++;
+            p++;
+        }
+        n_digits += (int) (p - frac_start);
+        q = -(int64_t) (p - frac_start);
+    }
+    if (n_digits == 0 || sig > 19)
+        return 0;
+
+    if (p < end && (*p == 'e' || *p == 'E' || *p == 'd' || *p == 'D')) {
+        p++;
+        int eneg = 0;
+        if (p < end && *p == '-') { eneg = 1; p++; } else if (p < end && *p == '+') { p++; }
+        if (p == end || *p < '0' || *p > '9')
+            return 0;
+        int64_t e = 0;
+        while (p < end && *p >= '0' && *p <= '9') {
+            if (e < 0x10000) e = e*10 + (*p - '0');
+            p++;
+        }
+        q += eneg ? -e : e;
+    }
+    if (p != end)
+        return 0;
+
+    double v;
+    if (w == 0) {
+        v = 0.0;
+#if FLT_EVAL_METHOD == 0
+    } else if (q >= -22 && q <= 22 && w <= ((uint64_t) 1 << 53)) {
+        // Clinger: w and 10^|q| are exact doubles, one correctly rounded op
+        v = (double) w;
+        v = q < 0 ? v / POW10[-q] : v * POW10[q];
+#endif
+    } else {
+        uint64_t bits = eisel_lemire(q, w);
+        memcpy(&v, &bits, sizeof v);
+    }
+    *out = neg ? -v : v;
+    return 1;
+}
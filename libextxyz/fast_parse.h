@@ -0,0 +1,16 @@
+#ifndef EXTXYZ_FAST_PARSE_H
+#define EXTXYZ_FAST_PARSE_H
+
+// Parse the decimal float in [s, end) into *out, correctly rounded (bit-identical
+// to strtod). Accepts [+-]?digits[.digits][(e|E|d|D)[+-]?digits] with at least
+// one mantissa digit, including the Fortran d/D exponent. Returns 1 on success,
+// 0 if the text is not in that form or has more than 19 significant digits —
+// callers then fall back to strtod, which also decides what is invalid.
+//
+// Values whose mantissa fits a double exactly and whose power of ten is small
+// take Clinger's single-operation path; everything else uses the Eisel-Lemire
+// algorithm with a 128-bit table of powers of five (fast_parse_table.h,
+// generated by gen_fast_parse_table.py).
+int extxyz_parse_double(const char *s, const char *end, double *out);
+
+#endif
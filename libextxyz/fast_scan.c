@@ -0,0 +1,104 @@
+#include <stdint.h>
+#include <string.h>
+
+#include "fast_scan.h"
+
+#if defined(EXTXYZ_SCALAR_SCAN)
+// scalar loop only, to measure the vector path against it
+#elif defined(__SSE2__) || defined(_M_X64) || (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#include <emmintrin.h>
+#define SCAN_SSE2 1
+#elif defined(__aarch64__) || defined(_M_ARM64)
+#include <arm_neon.h>
+#define SCAN_NEON 1
+#endif
+
+#if defined(SCAN_SSE2) || defined(SCAN_NEON)
+#if defined(_MSC_VER) && !defined(__clang__)
+#include <intrin.h>
+static inline int ctz32(unsigned x) {
+    unsigned long i;
+    _BitScanForward(&i, x);
+    return (int) i;
+}
+#else
+static inline int ctz32(unsigned x) {
+    return __builtin_ctz(x);
+}
+#endif
+
+// Bit i of *sep / *eol is set if byte i of the 16 at p is ' '/'\t' or '\n'/'\r'.
+static inline void classify16(const char *p, unsigned *sep, unsigned *eol) {
+#if defined(SCAN_SSE2)
+    __m128i b = _mm_loadu_si128((const __m128i *) p);
+    __m128i s = _mm_or_si128(_mm_cmpeq_epi8(b, _mm_set1_epi8(' ')),
+                             _mm_cmpeq_epi8(b, _mm_set1_epi8('\t')));
+    __m128i e = _mm_or_si128(_mm_cmpeq_epi8(b, _mm_set1_epi8('\n')),
+                             _mm_cmpeq_epi8(b, _mm_set1_epi8('\r')));
+    *sep = (unsigned) _mm_movemask_epi8(s);
+    *eol = (unsigned) _mm_movemask_epi8(e);
+#else
+    static const uint8_t weights[16] = {1, 2, 4, 8, 16, 32, 64, 128,
+                                        1, 2, 4, 8, 16, 32, 64, 128};
+    const uint8x16_t w = vld1q_u8(weights);
+    uint8x16_t b = vld1q_u8((const uint8_t *) p);
+    uint8x16_t s = vorrq_u8(vceqq_u8(b, vdupq_n_u8(' ')), vceqq_u8(b, vdupq_n_u8('\t')));
+    uint8x16_t e = vorrq_u8(vceqq_u8(b, vdupq_n_u8('\n')), vceqq_u8(b, vdupq_n_u8('\r')));
+    s = vandq_u8(s, w);
+    e = vandq_u8(e, w);
+    *sep = (unsigned) vaddv_u8(vget_low_u8(s)) | ((unsigned) vaddv_u8(vget_high_u8(s)) << 8);
+    *eol = (unsigned) vaddv_u8(vget_low_u8(e)) | ((unsigned) vaddv_u8(vget_high_u8(e)) << 8);
+#endif
+}
+#endif
+
+int extxyz_split_fields(const char *line, size_t *starts, size_t *ends, int max_fields) {
+    const size_t len = strlen(line);
+    size_t i = 0;
+    int n = 0;           // fields started so far
+    int in_field = 0;
+
+#if defined(SCAN_SSE2) || defined(SCAN_NEON)
+    for (; i + 16 <= len; i += 16) {
+        unsigned sep, eol;
+        classify16(line + i, &sep, &eol);
+        unsigned valid = 0xFFFFu;
+        if (eol)
+            valid = (1u << ctz32(eol)) - 1;
+        unsigned tok = ~(sep | eol) & valid;
+        unsigned prev = (tok << 1) | (unsigned) in_field;
+        unsigned bounds = ((tok & ~prev) | (~tok & prev)) & valid;
+        while (bounds) {
+            int bit = ctz32(bounds);
+            bounds &= bounds - 1;
+            if (! in_field) {
+                if (n < max_fields) starts[n] = i + bit;
+                if (++n > max_fields) return n;
+            } else if (n <= max_fields) {
+                ends[n-1] = i + bit;
+            }
+            in_field = ! in_field;
+        }
+        if (eol) {
+            if (in_field && n <= max_fields) ends[n-1] = i + ctz32(eol);
+            return n;
+        }
+    }
+#endif
+
+    for (; i < len; i++) {
+        char c = line[i];
+        if (c == '\n' || c == '\r')
+            break;
+        int is_tok = c != ' ' && c != '\t';
+        if (is_tok && ! in_field) {
+            if (n < max_fields) starts[n] = i;
+            if (++n > max_fields) return n;
+        } else if (! is_tok && in_field && n <= max_fields) {
+            ends[n-1] = i;
+        }
+        in_field = is_tok;
+    }
+    if (in_field && n <= max_fields) ends[n-1] = i;
+    return n;
+}
@@ -0,0 +1,20 @@
+#ifndef EXTXYZ_FAST_SCAN_H
+#define EXTXYZ_FAST_SCAN_H
+
+#include <stddef.h>
+
+// Split an atom line into whitespace-separated fields, as the tokenizer read
+// mode sees them: fields are separated by ' ' or '\t', and the line ends at
+// the first '\n', '\r' or NUL. Stores the [start, end) byte offsets of the
+// first `max_fields` fields and returns the number of fields found, counting
+// at most max_fields + 1 (enough to tell "too many" from "exact").
+//
+// Whitespace and line-end bytes are classified 16 at a time (SSE2 on x86-64,
+// NEON on AArch64 — both baseline for those targets, so no runtime dispatch is
+// needed) and field boundaries are read off the resulting bit masks; other
+// targets use the equivalent scalar loop. Defining EXTXYZ_SCALAR_SCAN (e.g.
+// CFLAGS=-DEXTXYZ_SCALAR_SCAN) forces the scalar loop everywhere, for
+// benchmarks/bench_read.py --tokenizer-only comparisons.
+int extxyz_split_fields(const char *line, size_t *starts, size_t *ends, int max_fields);
+
+#endif
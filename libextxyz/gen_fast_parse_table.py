@@ -0,0 +1,48 @@
+"""Generate fast_parse_table.h: 128-bit truncated powers of five for the
+Eisel-Lemire float parser in fast_parse.c (same table as fast_float).
+
+Run from libextxyz/::
+
+    python gen_fast_parse_table.py
+"""
+import os
+
+SMALLEST_POWER_OF_TEN = -342
+LARGEST_POWER_OF_TEN = 308
+
+
+def pow5_128(q):
+    """5**q scaled by a power of two into [2**127, 2**128): truncated for
+    q >= 0, rounded up for q < 0."""
+    if q >= 0:
+        c = 5 ** q
+        while c < (1 << 127):
+            c *= 2
+        while c >= (1 << 128):
+            c //= 2
+        return c
+    power5 = 5 ** -q
+    z = power5.bit_length()
+    if q >= -27:
+        return 2 ** (z + 127) // power5 + 1
+    c = 2 ** (2 * z + 2 * 64) // power5 + 1
+    while c >= (1 << 128):
+        c //= 2
+    return c
+
+
+def write_table(dirname):
+    mask = (1 << 64) - 1
+    with open(os.path.join(dirname, 'fast_parse_table.h'), 'w') as fh:
+        fh.write('// Generated by gen_fast_parse_table.py -- do not edit.\n')
+        fh.write('#define POW5_SMALLEST_POWER_OF_TEN (%d)\n' % SMALLEST_POWER_OF_TEN)
+        fh.write('#define POW5_LARGEST_POWER_OF_TEN %d\n\n' % LARGEST_POWER_OF_TEN)
+        fh.write('static const uint64_t POW5_128[] = {\n')
+        for q in range(SMALLEST_POWER_OF_TEN, LARGEST_POWER_OF_TEN + 1):
+            c = pow5_128(q)
+            fh.write('    0x%016xULL, 0x%016xULL,  // 5^%d\n' % (c >> 64, c & mask, q))
+        fh.write('};\n')
+
+
+if __name__ == '__main__':
+    write_table(os.path.dirname(os.path.abspath(__file__)))
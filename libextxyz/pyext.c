@@ -1,4 +1,4 @@
-/* CPython C-API entry point for the fast read path.
+/* CPython C-API entry point for the fast read and write paths.
  *
  * This translation unit is compiled ONLY into the `_extxyz` Python extension
  * module (see libextxyz/meson.build) — never into the standalone libextxyz
@@ -6,22 +6,27 @@
  * Python/numpy dependency. It calls the unchanged C core (extxyz_read_ll_opts)
  * and marshals the resulting DictEntry linked lists straight into Python
  * dicts of numpy arrays / scalars, replacing the former per-node ctypes loop
- * in cextxyz.py (c_to_py_dict).
+ * in cextxyz.py (c_to_py_dict). On the write side, write_frame and the
+ * Writer type convert Python dicts to DictEntry lists here instead of
+ * cextxyz.py_to_c_dict.
  *
  * The marshalling here must stay byte-for-byte equivalent to c_to_py_dict;
  * benchmarks/verify_marshal.py checks new-vs-legacy output on real data.
+ * tests/test_write_marshal_parity.py does the same for the write side.
  */
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
 #define NPY_NO_DEPRECATED_API NPY_1_7_API_VERSION
 #include <numpy/arrayobject.h>
 
+#include <limits.h>
 #include <stdint.h>
 #include <stdio.h>
 #include <string.h>
 
 #include <cleri/cleri.h>
 #include "extxyz.h"
+#include "extxyz_stats.h"
 
 /* Module-level exception, mirrors cextxyz.ExtXYZError. */
 static PyObject *ExtXYZError = NULL;
@@ -165,10 +170,107 @@ static PyObject *dict_to_py(DictEntry *head)
     return result;
 }
 
+/* ReadState(cache_size=0)
+ *
+ * Holds an ExtxyzReadState across read_frame calls on one file. cache_size > 0
+ * enables the comment-line cache (ExtxyzReadState.cache_max). */
+typedef struct {
+    PyObject_HEAD
+    ExtxyzReadState rs;
+    int busy;
+} ReadStateObject;
+
+static void ReadState_dealloc(ReadStateObject *self)
+{
+    extxyz_read_state_free(&self->rs);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static int ReadState_init(ReadStateObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"cache_size", NULL};
+    int cache_size = 0;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|i", kwlist, &cache_size))
+        return -1;
+    if (cache_size < 0) {
+        PyErr_SetString(PyExc_ValueError, "cache_size must be >= 0");
+        return -1;
+    }
+    extxyz_read_state_free(&self->rs);
+    self->rs.cache_max = cache_size;
+    return 0;
+}
+
+static PyObject *ReadState_clear(ReadStateObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (self->busy) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "ReadState is being used by another thread");
+        return NULL;
+    }
+    extxyz_read_state_free(&self->rs);
+    self->rs.cache_hits = self->rs.cache_misses = 0;
+    Py_RETURN_NONE;
+}
+
+static PyObject *ReadState_get_cache_size(ReadStateObject *self, void *Py_UNUSED(closure))
+{
+    return PyLong_FromLong(self->rs.cache_max);
+}
+
+static PyObject *ReadState_get_cache_len(ReadStateObject *self, void *Py_UNUSED(closure))
+{
+    return PyLong_FromLong(self->rs.cache_len);
+}
+
+static PyObject *ReadState_get_cache_hits(ReadStateObject *self, void *Py_UNUSED(closure))
+{
+    return PyLong_FromUnsignedLong(self->rs.cache_hits);
+}
+
+static PyObject *ReadState_get_cache_misses(ReadStateObject *self, void *Py_UNUSED(closure))
+{
+    return PyLong_FromUnsignedLong(self->rs.cache_misses);
+}
+
+static PyMethodDef ReadState_methods[] = {
+    {"clear", (PyCFunction)ReadState_clear, METH_NOARGS,
+     "Empty the comment-line cache and reset its counters."},
+    {NULL, NULL, 0, NULL},
+};
+
+static PyGetSetDef ReadState_getset[] = {
+    {"cache_size", (getter)ReadState_get_cache_size, NULL,
+     "Maximum number of cached comment lines.", NULL},
+    {"cache_len", (getter)ReadState_get_cache_len, NULL,
+     "Number of comment lines currently cached.", NULL},
+    {"cache_hits", (getter)ReadState_get_cache_hits, NULL,
+     "Comment lines found in the cache.", NULL},
+    {"cache_misses", (getter)ReadState_get_cache_misses, NULL,
+     "Comment lines parsed because they were not cached.", NULL},
+    {NULL, NULL, NULL, NULL, NULL},
+};
+
+static PyTypeObject ReadStateType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_extxyz.ReadState",
+    .tp_basicsize = sizeof(ReadStateObject),
+    .tp_dealloc = (destructor)ReadState_dealloc,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = "ReadState(cache_size=0): reader state kept across read_frame "
+              "calls, with an optional LRU cache of parsed comment lines.",
+    .tp_methods = ReadState_methods,
+    .tp_getset = ReadState_getset,
+    .tp_init = (initproc)ReadState_init,
+    .tp_new = PyType_GenericNew,
+};
+
 /* read_frame(grammar_addr:int, fp_addr:int, use_tokenizer:int,
- *            comment:str|None=None, use_cleri:int=1)
+ *            comment:str|None=None, use_cleri:int=1, complete_lines:int=0,
+ *            state:ReadState|None=None)
  *            -> (nat:int, info:dict, arrays:dict)
- * Raises EOFError at end of file, ExtXYZError on a parse error. */
+ * Raises EOFError at end of file, ExtXYZError on a parse error or a frame cut
+ * short by end of file ("Truncated frame..."). */
 static PyObject *py_read_frame(PyObject *self, PyObject *args)
 {
     (void)self;
@@ -176,9 +278,26 @@ static PyObject *py_read_frame(PyObject *self, PyObject *args)
     int use_tokenizer;
     const char *comment = NULL;
     int use_cleri = 1;
-    if (!PyArg_ParseTuple(args, "KKi|zi", &grammar_addr, &fp_addr,
-                          &use_tokenizer, &comment, &use_cleri))
+    int complete_lines = 0;
+    PyObject *state = Py_None;
+    int skip_atoms = 0;
+    if (!PyArg_ParseTuple(args, "KKi|ziiOi", &grammar_addr, &fp_addr,
+                          &use_tokenizer, &comment, &use_cleri,
+                          &complete_lines, &state, &skip_atoms))
         return NULL;
+    ReadStateObject *rs_obj = NULL;
+    if (state != Py_None) {
+        if (!PyObject_TypeCheck(state, &ReadStateType)) {
+            PyErr_SetString(PyExc_TypeError, "state must be a ReadState or None");
+            return NULL;
+        }
+        rs_obj = (ReadStateObject *)state;
+        if (rs_obj->busy) {
+            PyErr_SetString(PyExc_RuntimeError,
+                            "ReadState is being used by another thread");
+            return NULL;
+        }
+    }
 
     cleri_grammar_t *grammar = (cleri_grammar_t *)(uintptr_t)grammar_addr;
     FILE *fp = (FILE *)(uintptr_t)fp_addr;
@@ -189,11 +308,17 @@ static PyObject *py_read_frame(PyObject *self, PyObject *args)
     error_message[0] = '\0';
 
     int ok;
+    if (rs_obj) rs_obj->busy = 1;
     Py_BEGIN_ALLOW_THREADS
-    ok = extxyz_read_ll_opts(grammar, fp, &nat, &info, &arrays,
-                             (char *)comment, error_message, use_tokenizer,
-                             use_cleri);
+    ok = extxyz_read_ll_state(rs_obj ? &rs_obj->rs : NULL,
+                              grammar, fp, &nat, &info, &arrays,
+                              (char *)comment, error_message,
+                              (use_tokenizer ? EXTXYZ_READ_TOKENIZER : 0) |
+                              (use_cleri ? EXTXYZ_READ_CLERI : 0) |
+                              (complete_lines ? EXTXYZ_READ_COMPLETE_LINES : 0) |
+                              (skip_atoms ? EXTXYZ_READ_SKIP_ATOMS : 0));
     Py_END_ALLOW_THREADS
+    if (rs_obj) rs_obj->busy = 0;
 
     if (!ok) {
         /* Mirror the EOF heuristic in cextxyz.read_frame_dicts. */
@@ -210,11 +335,14 @@ static PyObject *py_read_frame(PyObject *self, PyObject *args)
         return NULL;
     }
 
+    unsigned long long t;
+    EXTXYZ_STATS_START(t);
     PyObject *py_info = dict_to_py(info);
     PyObject *py_arrays = py_info ? dict_to_py(arrays) : NULL;
 
     free_dict(info);
     free_dict(arrays);
+    EXTXYZ_STATS_STOP(MARSHAL_NS, t);
 
     if (!py_info || !py_arrays) {
         Py_XDECREF(py_info);
@@ -224,24 +352,812 @@ static PyObject *py_read_frame(PyObject *self, PyObject *args)
     return Py_BuildValue("(iNN)", nat, py_info, py_arrays);
 }
 
+/* ------------------------------------------------------------------------
+ * Write path: Python dicts -> DictEntry lists, converted here in C instead of
+ * cextxyz.py_to_c_dict building a ctypes node (and copying every array) per
+ * value. float64/int32 C-contiguous arrays are used in place; other numeric
+ * arrays are cast once by numpy; strings are encoded into one UTF-8 block.
+ * ---------------------------------------------------------------------- */
+
+/* storage for a scalar value; DictEntry.data points at one of these */
+typedef union {
+    int i;
+    double f;
+    char *s;
+} ScalarSlot;
+
+/* Scratch for one converted dict. Entry and scalar arrays keep their capacity
+ * between frames (a Writer reuses them); `refs` holds the arrays whose data
+ * the entries point into, `blocks` the malloc'd string tables, both released
+ * by conv_clear() once the frame has been written. */
+typedef struct {
+    DictEntry *entries;
+    ScalarSlot *scalars;
+    Py_ssize_t n, cap;
+    char **bases;                   /* write_batch: item 0 of each entry */
+    size_t *strides;                /* write_batch: bytes per item */
+    PyObject *refs;                 /* list, created lazily */
+    void **blocks;
+    Py_ssize_t nblocks, blocks_cap;
+} DictConv;
+
+static void conv_clear(DictConv *cv)
+{
+    for (Py_ssize_t i = 0; i < cv->nblocks; i++)
+        free(cv->blocks[i]);
+    cv->nblocks = 0;
+    Py_CLEAR(cv->refs);
+    cv->n = 0;
+}
+
+static void conv_free(DictConv *cv)
+{
+    conv_clear(cv);
+    free(cv->entries);
+    free(cv->scalars);
+    free(cv->bases);
+    free(cv->strides);
+    free(cv->blocks);
+    memset(cv, 0, sizeof(*cv));
+}
+
+static int conv_keep(DictConv *cv, PyObject *obj)
+{
+    if (!cv->refs && !(cv->refs = PyList_New(0)))
+        return -1;
+    return PyList_Append(cv->refs, obj);
+}
+
+static void *conv_block(DictConv *cv, size_t nbytes)
+{
+    if (cv->nblocks == cv->blocks_cap) {
+        Py_ssize_t cap = cv->blocks_cap ? 2 * cv->blocks_cap : 8;
+        void **nb = (void **)realloc(cv->blocks, (size_t)cap * sizeof(void *));
+        if (!nb) { PyErr_NoMemory(); return NULL; }
+        cv->blocks = nb;
+        cv->blocks_cap = cap;
+    }
+    void *p = malloc(nbytes ? nbytes : 1);
+    if (!p) { PyErr_NoMemory(); return NULL; }
+    cv->blocks[cv->nblocks++] = p;
+    return p;
+}
+
+/* Append one UCS4 code point to `out` as UTF-8, returning bytes written. */
+static size_t utf8_put(char *out, Py_UCS4 c)
+{
+    if (c < 0x80) { out[0] = (char)c; return 1; }
+    if (c < 0x800) {
+        out[0] = (char)(0xC0 | (c >> 6));
+        out[1] = (char)(0x80 | (c & 0x3F));
+        return 2;
+    }
+    if (c < 0x10000) {
+        out[0] = (char)(0xE0 | (c >> 12));
+        out[1] = (char)(0x80 | ((c >> 6) & 0x3F));
+        out[2] = (char)(0x80 | (c & 0x3F));
+        return 3;
+    }
+    out[0] = (char)(0xF0 | (c >> 18));
+    out[1] = (char)(0x80 | ((c >> 12) & 0x3F));
+    out[2] = (char)(0x80 | ((c >> 6) & 0x3F));
+    out[3] = (char)(0x80 | (c & 0x3F));
+    return 4;
+}
+
+/* Build a char** table for a 'U' or 'S' array: one block holding the
+ * pointers followed by the NUL-terminated UTF-8 cells. */
+static char **string_table(DictConv *cv, PyArrayObject *arr)
+{
+    const npy_intp n = PyArray_SIZE(arr);
+    const npy_intp itemsize = PyArray_ITEMSIZE(arr);
+    const int is_unicode = (PyArray_DESCR(arr)->type_num == NPY_UNICODE);
+    const size_t cell = is_unicode ? (size_t)(itemsize / 4) * 4 + 1
+                                   : (size_t)itemsize + 1;
+    char *block = (char *)conv_block(cv, (size_t)n * (sizeof(char *) + cell));
+    if (!block) return NULL;
+    char **table = (char **)block;
+    char *text = block + (size_t)n * sizeof(char *);
+    const char *src = (const char *)PyArray_DATA(arr);
+    for (npy_intp i = 0; i < n; i++) {
+        char *dst = text + (size_t)i * cell;
+        size_t len = 0;
+        if (is_unicode) {
+            const Py_UCS4 *u = (const Py_UCS4 *)(src + i * itemsize);
+            for (npy_intp c = 0; c < itemsize / 4 && u[c]; c++)
+                len += utf8_put(dst + len, u[c]);
+        } else {
+            const char *b = src + i * itemsize;
+            for (; (npy_intp)len < itemsize && b[len]; len++)
+                dst[len] = b[len];
+        }
+        dst[len] = '\0';
+        table[i] = dst;
+    }
+    return table;
+}
+
+/* Storage for the elements of `arr` (borrowed) as the writer expects them:
+ * int32 for bool/int, float64, or a char** table for strings. Numeric arrays
+ * already of the right dtype are used in place and kept alive in cv->refs.
+ * Returns the data pointer, or NULL with an exception set. */
+static void *array_entry_data(DictConv *cv, PyArrayObject *arr,
+                              enum data_type *data_t)
+{
+    int target;
+    switch (PyArray_DESCR(arr)->kind) {
+    case 'b': *data_t = data_b; target = NPY_INT32; break;
+    case 'i': *data_t = data_i; target = NPY_INT32; break;
+    case 'f': *data_t = data_f; target = NPY_FLOAT64; break;
+    case 'U':
+    case 'S': *data_t = data_s; target = NPY_NOTYPE; break;
+    default: {
+        PyObject *r = PyObject_Repr((PyObject *)PyArray_DESCR(arr));
+        PyErr_Format(PyExc_TypeError, "unsupported array dtype %S", r);
+        Py_XDECREF(r);
+        return NULL;
+    }
+    }
+
+    if (target == NPY_NOTYPE)
+        return string_table(cv, arr);
+    Py_INCREF(arr);
+    if (PyArray_TYPE(arr) != target) {
+        /* astype(int32/float64) as in py_to_c_dict (wraps like astype) */
+        PyObject *cast = PyArray_FromArray(
+            arr, PyArray_DescrFromType(target),
+            NPY_ARRAY_CARRAY_RO | NPY_ARRAY_FORCECAST);
+        Py_DECREF(arr);
+        if (!cast) return NULL;
+        arr = (PyArrayObject *)cast;
+    }
+    if (conv_keep(cv, (PyObject *)arr) < 0) { Py_DECREF(arr); return NULL; }
+    void *data = PyArray_DATA(arr);
+    Py_DECREF(arr);  /* cv->refs holds it until conv_clear() */
+    return data;
+}
+
+/* Fill `e` (and its scalar slot) from one Python value, mirroring the types
+ * accepted by cextxyz.py_to_c_dict. Returns 0, or -1 with an exception set. */
+static int value_to_entry(DictConv *cv, DictEntry *e, ScalarSlot *slot,
+                          PyObject *value)
+{
+    e->nrows = e->ncols = 0;
+    if (PyUnicode_Check(value)) {
+        /* UTF-8 cached on the str object, kept alive through cv->refs */
+        const char *s = PyUnicode_AsUTF8(value);
+        if (!s || conv_keep(cv, value) < 0) return -1;
+        slot->s = (char *)s;
+        e->data_t = data_s;
+        e->data = &slot->s;
+        return 0;
+    }
+    if (PyBool_Check(value)) {
+        slot->i = (value == Py_True);
+        e->data_t = data_b;
+        e->data = &slot->i;
+        return 0;
+    }
+    if (PyLong_Check(value)) {
+        long v = PyLong_AsLong(value);
+        if (v == -1 && PyErr_Occurred()) return -1;
+        if (v < INT_MIN || v > INT_MAX) {
+            PyErr_Format(PyExc_OverflowError, "integer %ld out of C int range", v);
+            return -1;
+        }
+        slot->i = (int)v;
+        e->data_t = data_i;
+        e->data = &slot->i;
+        return 0;
+    }
+    if (PyFloat_Check(value)) {
+        slot->f = PyFloat_AS_DOUBLE(value);
+        e->data_t = data_f;
+        e->data = &slot->f;
+        return 0;
+    }
+    if (!(PyList_Check(value) || PyTuple_Check(value) || PyArray_Check(value) ||
+          PyArray_IsScalar(value, Generic))) {
+        PyErr_Format(PyExc_TypeError, "unsupported type %s",
+                     Py_TYPE(value)->tp_name);
+        return -1;
+    }
+
+    PyArrayObject *arr = (PyArrayObject *)PyArray_FromAny(
+        value, NULL, 0, 0, NPY_ARRAY_CARRAY_RO, NULL);
+    if (!arr) return -1;
+    const int ndim = PyArray_NDIM(arr);
+    if (ndim > 2) {
+        PyErr_Format(PyExc_ValueError,
+                     "cannot write %d-dimensional array", ndim);
+        Py_DECREF(arr);
+        return -1;
+    }
+    if (ndim == 1) {
+        e->ncols = (int)PyArray_DIM(arr, 0);
+    } else if (ndim == 2) {
+        e->nrows = (int)PyArray_DIM(arr, 0);
+        e->ncols = (int)PyArray_DIM(arr, 1);
+    }
+
+    void *data = array_entry_data(cv, arr, &e->data_t);
+    Py_DECREF(arr);
+    if (!data) return -1;
+    e->data = data;
+    return 0;
+}
+
+/* Grow cv's per-entry arrays to hold n entries. */
+static int conv_reserve(DictConv *cv, Py_ssize_t n)
+{
+    if (n <= cv->cap)
+        return 0;
+    DictEntry *ne = (DictEntry *)realloc(cv->entries, (size_t)n * sizeof(DictEntry));
+    if (ne) cv->entries = ne;
+    ScalarSlot *ns = ne ? (ScalarSlot *)realloc(cv->scalars, (size_t)n * sizeof(ScalarSlot)) : NULL;
+    if (ns) cv->scalars = ns;
+    char **nb = ns ? (char **)realloc(cv->bases, (size_t)n * sizeof(char *)) : NULL;
+    if (nb) cv->bases = nb;
+    size_t *nst = nb ? (size_t *)realloc(cv->strides, (size_t)n * sizeof(size_t)) : NULL;
+    if (nst) cv->strides = nst;
+    if (!nst) { PyErr_NoMemory(); return -1; }
+    cv->cap = n;
+    return 0;
+}
+
+/* The keys of `dict` to convert, in the order of `keys` (or the dict's own
+ * order if keys is None or NULL), as a fast sequence kept in cv->refs so the
+ * key strings outlive the GIL-released write. Returns a borrowed reference. */
+static PyObject *conv_keys(DictConv *cv, PyObject *dict, PyObject *keys)
+{
+    PyObject *seq;
+    if (!PyDict_Check(dict)) {
+        PyErr_SetString(PyExc_TypeError, "expected a dict");
+        return NULL;
+    }
+    if (keys && keys != Py_None)
+        seq = PySequence_Fast(keys, "columns must be a sequence of keys");
+    else
+        seq = PyDict_Keys(dict);
+    if (!seq) return NULL;
+    int rc = conv_keep(cv, seq);
+    Py_DECREF(seq);
+    if (rc < 0 || conv_reserve(cv, PySequence_Fast_GET_SIZE(seq)) < 0)
+        return NULL;
+    return seq;
+}
+
+/* Start entry i for key seq[i]: zero it, set its key and link it to the next
+ * one. Returns the (borrowed) dict value, or NULL with an exception set. */
+static PyObject *conv_entry(DictConv *cv, PyObject *seq, PyObject *dict,
+                            Py_ssize_t i)
+{
+    const Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    PyObject *key = PySequence_Fast_GET_ITEM(seq, i);
+    DictEntry *e = &cv->entries[i];
+    memset(e, 0, sizeof(*e));
+    e->next = (i < n - 1) ? &cv->entries[i + 1] : NULL;
+    if (!PyUnicode_Check(key)) {
+        PyErr_Format(PyExc_TypeError, "keys must be str, not %s",
+                     Py_TYPE(key)->tp_name);
+        return NULL;
+    }
+    e->key = (char *)PyUnicode_AsUTF8(key);
+    if (!e->key) return NULL;
+    PyObject *value = PyDict_GetItemWithError(dict, key);
+    if (!value && !PyErr_Occurred())
+        PyErr_SetObject(PyExc_KeyError, key);
+    return value;
+}
+
+/* Convert `dict` (in the order of `keys`, or its own order if keys is None or
+ * NULL) to a DictEntry list in cv. *head is NULL for an empty dict. */
+static int dict_to_entries(DictConv *cv, PyObject *dict, PyObject *keys,
+                           DictEntry **head)
+{
+    *head = NULL;
+    PyObject *seq = conv_keys(cv, dict, keys);
+    if (!seq) return -1;
+    const Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    for (Py_ssize_t i = 0; i < n; i++) {
+        PyObject *value = conv_entry(cv, seq, dict, i);
+        if (!value ||
+            value_to_entry(cv, &cv->entries[i], &cv->scalars[i], value) < 0)
+            return -1;
+    }
+    cv->n = n;
+    if (n > 0)
+        *head = &cv->entries[0];
+    return 0;
+}
+
+/* Batch variant of dict_to_entries, for write_batch: every value is an array
+ * whose leading axis runs over `lead` items -- atoms for per-atom columns
+ * (per_atom=1), frames for info. Each entry gets the shape of one item and
+ * item k of entry i lives at cv->bases[i] + k * cv->strides[i]. */
+static int batch_to_entries(DictConv *cv, PyObject *dict, PyObject *keys,
+                            npy_intp lead, int per_atom)
+{
+    PyObject *seq = conv_keys(cv, dict, keys);
+    if (!seq) return -1;
+    const Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    const int max_ndim = per_atom ? 2 : 3;
+    for (Py_ssize_t i = 0; i < n; i++) {
+        PyObject *value = conv_entry(cv, seq, dict, i);
+        if (!value) return -1;
+        DictEntry *e = &cv->entries[i];
+        PyArrayObject *arr = (PyArrayObject *)PyArray_FromAny(
+            value, NULL, 1, max_ndim, NPY_ARRAY_CARRAY_RO, NULL);
+        if (!arr) return -1;
+        if (PyArray_DIM(arr, 0) != lead) {
+            PyErr_Format(PyExc_ValueError,
+                         "%s '%s' has %zd rows, expected %zd",
+                         per_atom ? "column" : "info array", e->key,
+                         (Py_ssize_t)PyArray_DIM(arr, 0), (Py_ssize_t)lead);
+            Py_DECREF(arr);
+            return -1;
+        }
+        const int ndim = PyArray_NDIM(arr);
+        npy_intp per_item = 1;
+        for (int d = 1; d < ndim; d++)
+            per_item *= PyArray_DIM(arr, d);
+        if (per_atom) {
+            /* any nrows > 0 marks a 2-D column; the writer takes the
+             * number of rows from natoms */
+            e->nrows = (ndim == 2) ? 1 : 0;
+            e->ncols = (ndim == 2) ? (int)PyArray_DIM(arr, 1) : 0;
+        } else if (ndim == 2) {
+            e->ncols = (int)PyArray_DIM(arr, 1);
+        } else if (ndim == 3) {
+            e->nrows = (int)PyArray_DIM(arr, 1);
+            e->ncols = (int)PyArray_DIM(arr, 2);
+        }
+        void *data = array_entry_data(cv, arr, &e->data_t);
+        Py_DECREF(arr);
+        if (!data) return -1;
+        const size_t elsize = (e->data_t == data_f) ? sizeof(double)
+                            : (e->data_t == data_s) ? sizeof(char *)
+                            : sizeof(int);
+        cv->bases[i] = (char *)data;
+        cv->strides[i] = (size_t)per_item * elsize;
+        e->data = data;
+    }
+    cv->n = n;
+    return 0;
+}
+
+/* per-atom column formats, keyed like format_dict (I/R/L/S), owned copies */
+typedef struct {
+    char *fmt_i, *fmt_f, *fmt_b, *fmt_s;
+} ColumnFormats;
+
+static void formats_free(ColumnFormats *f)
+{
+    PyMem_Free(f->fmt_i);
+    PyMem_Free(f->fmt_f);
+    PyMem_Free(f->fmt_b);
+    PyMem_Free(f->fmt_s);
+    memset(f, 0, sizeof(*f));
+}
+
+static int formats_from_dict(ColumnFormats *f, PyObject *format_dict)
+{
+    static const char codes[4] = {'I', 'R', 'L', 'S'};
+    char **slots[4] = {&f->fmt_i, &f->fmt_f, &f->fmt_b, &f->fmt_s};
+    memset(f, 0, sizeof(*f));
+    if (!format_dict || format_dict == Py_None)
+        return 0;
+    if (!PyDict_Check(format_dict)) {
+        PyErr_SetString(PyExc_TypeError, "format_dict must be a dict");
+        return -1;
+    }
+    for (int c = 0; c < 4; c++) {
+        const char key[2] = {codes[c], '\0'};
+        PyObject *v = PyDict_GetItemString(format_dict, key);
+        if (!v || v == Py_None)
+            continue;
+        Py_ssize_t len;
+        const char *s = PyUnicode_AsUTF8AndSize(v, &len);
+        if (!s) { formats_free(f); return -1; }
+        *slots[c] = (char *)PyMem_Malloc((size_t)len + 1);
+        if (!*slots[c]) { formats_free(f); PyErr_NoMemory(); return -1; }
+        memcpy(*slots[c], s, (size_t)len + 1);
+    }
+    return 0;
+}
+
+/* Writer(path, mode="w", format_dict=None, atomic=False)
+ *
+ * Keeps one FILE* and one ExtxyzWriteState open across frames, so a
+ * trajectory writer does not reopen the file, rebuild the Properties header
+ * or reallocate the output buffer per step. With atomic=True every frame is
+ * written with a single write() (ExtxyzWriteState.atomic). */
+typedef struct {
+    PyObject_HEAD
+    FILE *fp;
+    ExtxyzWriteState ws;
+    ColumnFormats formats;
+    DictConv info_cv, arrays_cv;
+    int busy;
+} WriterObject;
+
+static int writer_close_fp(WriterObject *self)
+{
+    int rc = 0;
+    if (self->fp) {
+        FILE *fp = self->fp;
+        self->fp = NULL;
+        Py_BEGIN_ALLOW_THREADS
+        rc = fclose(fp);
+        Py_END_ALLOW_THREADS
+    }
+    return rc;
+}
+
+static void Writer_dealloc(WriterObject *self)
+{
+    writer_close_fp(self);
+    extxyz_write_state_free(&self->ws);
+    formats_free(&self->formats);
+    conv_free(&self->info_cv);
+    conv_free(&self->arrays_cv);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static int Writer_init(WriterObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"path", "mode", "format_dict", "atomic", NULL};
+    PyObject *path_bytes = NULL, *format_dict = NULL;
+    const char *mode = "w";
+    int atomic = 0;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O&|sOp", kwlist,
+                                     PyUnicode_FSConverter, &path_bytes,
+                                     &mode, &format_dict, &atomic))
+        return -1;
+    if (self->fp) {
+        PyErr_SetString(PyExc_RuntimeError, "Writer is already open");
+        Py_DECREF(path_bytes);
+        return -1;
+    }
+    formats_free(&self->formats);
+    if (formats_from_dict(&self->formats, format_dict) < 0) {
+        Py_DECREF(path_bytes);
+        return -1;
+    }
+    const char *path = PyBytes_AS_STRING(path_bytes);
+    FILE *fp;
+    Py_BEGIN_ALLOW_THREADS
+    fp = fopen(path, mode);
+    Py_END_ALLOW_THREADS
+    if (!fp) {
+        PyErr_SetFromErrnoWithFilenameObject(PyExc_OSError, path_bytes);
+        Py_DECREF(path_bytes);
+        return -1;
+    }
+    Py_DECREF(path_bytes);
+    self->fp = fp;
+    self->ws.atomic = atomic;
+    return 0;
+}
+
+static int writer_check(WriterObject *self)
+{
+    if (!self->fp) {
+        PyErr_SetString(PyExc_ValueError, "I/O operation on closed Writer");
+        return -1;
+    }
+    if (self->busy) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Writer is being used by another thread");
+        return -1;
+    }
+    return 0;
+}
+
+/* Convert and write one frame; the GIL is released around the C writer. */
+static int writer_write_one(WriterObject *self, PyObject *natoms_obj,
+                            PyObject *info, PyObject *arrays, PyObject *columns)
+{
+    DictEntry *c_info, *c_arrays;
+    int nat = (int)PyLong_AsLong(natoms_obj);
+    if (nat == -1 && PyErr_Occurred()) return -1;
+    if (dict_to_entries(&self->info_cv, info, NULL, &c_info) < 0 ||
+        dict_to_entries(&self->arrays_cv, arrays, columns, &c_arrays) < 0) {
+        conv_clear(&self->info_cv);
+        conv_clear(&self->arrays_cv);
+        return -1;
+    }
+    ColumnFormats *f = &self->formats;
+    int rc;
+    self->busy = 1;
+    Py_BEGIN_ALLOW_THREADS
+    rc = extxyz_write_ll_state(&self->ws, self->fp, nat, c_info, c_arrays,
+                               f->fmt_i, f->fmt_f, f->fmt_b, f->fmt_s);
+    Py_END_ALLOW_THREADS
+    self->busy = 0;
+    conv_clear(&self->info_cv);
+    conv_clear(&self->arrays_cv);
+    if (rc != 0) {
+        PyErr_SetString(PyExc_OSError, "error writing to extended XYZ file");
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *Writer_write(WriterObject *self, PyObject *args, PyObject *kwds)
+{
+    static char *kwlist[] = {"natoms", "info", "arrays", "columns", NULL};
+    PyObject *natoms, *info, *arrays, *columns = Py_None;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO!O!|O", kwlist, &natoms,
+                                     &PyDict_Type, &info, &PyDict_Type, &arrays,
+                                     &columns))
+        return NULL;
+    if (writer_check(self) < 0) return NULL;
+    if (writer_write_one(self, natoms, info, arrays, columns) < 0) return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyObject *Writer_write_frames(WriterObject *self, PyObject *frames)
+{
+    if (writer_check(self) < 0) return NULL;
+    PyObject *it = PyObject_GetIter(frames);
+    if (!it) return NULL;
+    PyObject *item;
+    while ((item = PyIter_Next(it))) {
+        PyObject *natoms, *info, *arrays, *columns = Py_None;
+        if (!PyArg_ParseTuple(item, "OO!O!|O;write_frames() items must be "
+                              "(natoms, info, arrays[, columns]) tuples",
+                              &natoms, &PyDict_Type, &info, &PyDict_Type,
+                              &arrays, &columns) ||
+            writer_check(self) < 0 ||
+            writer_write_one(self, natoms, info, arrays, columns) < 0) {
+            Py_DECREF(item);
+            Py_DECREF(it);
+            return NULL;
+        }
+        Py_DECREF(item);
+    }
+    Py_DECREF(it);
+    if (PyErr_Occurred()) return NULL;
+    Py_RETURN_NONE;
+}
+
+/* write_batch(frame_ptr, info, arrays, columns=None)
+ *
+ * Write len(frame_ptr) - 1 frames from concatenated data: frame k holds atoms
+ * frame_ptr[k]:frame_ptr[k+1] of every per-atom column in `arrays`, and item
+ * k of every array in `info`. All frames are written in one GIL-released
+ * loop that only moves the DictEntry data pointers between frames. */
+static PyObject *Writer_write_batch(WriterObject *self, PyObject *args,
+                                    PyObject *kwds)
+{
+    static char *kwlist[] = {"frame_ptr", "info", "arrays", "columns", NULL};
+    PyObject *ptr_obj, *info, *arrays, *columns = Py_None;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OO!O!|O", kwlist, &ptr_obj,
+                                     &PyDict_Type, &info, &PyDict_Type, &arrays,
+                                     &columns))
+        return NULL;
+    if (writer_check(self) < 0) return NULL;
+
+    PyArrayObject *ptr_arr = (PyArrayObject *)PyArray_FromAny(
+        ptr_obj, PyArray_DescrFromType(NPY_INT64), 1, 1,
+        NPY_ARRAY_CARRAY_RO, NULL);
+    if (!ptr_arr) return NULL;
+    const npy_intp nframes = PyArray_DIM(ptr_arr, 0) - 1;
+    const int64_t *ptr = (const int64_t *)PyArray_DATA(ptr_arr);
+    if (nframes < 0) {
+        PyErr_SetString(PyExc_ValueError, "frame_ptr must not be empty");
+        Py_DECREF(ptr_arr);
+        return NULL;
+    }
+    for (npy_intp k = 0; k < nframes; k++) {
+        if (ptr[k] < 0 || ptr[k + 1] < ptr[k] || ptr[k + 1] - ptr[k] > INT_MAX) {
+            PyErr_Format(PyExc_ValueError,
+                         "frame_ptr must be non-negative and non-decreasing "
+                         "(frame %zd)", (Py_ssize_t)k);
+            Py_DECREF(ptr_arr);
+            return NULL;
+        }
+    }
+
+    DictConv *icv = &self->info_cv, *acv = &self->arrays_cv;
+    if (batch_to_entries(icv, info, NULL, nframes, 0) < 0 ||
+        batch_to_entries(acv, arrays, columns, (npy_intp)ptr[nframes], 1) < 0) {
+        conv_clear(icv);
+        conv_clear(acv);
+        Py_DECREF(ptr_arr);
+        return NULL;
+    }
+
+    ColumnFormats *f = &self->formats;
+    DictEntry *c_info = icv->n ? icv->entries : NULL;
+    DictEntry *c_arrays = acv->n ? acv->entries : NULL;
+    int rc = 0;
+    self->busy = 1;
+    Py_BEGIN_ALLOW_THREADS
+    for (npy_intp k = 0; k < nframes && rc == 0; k++) {
+        for (Py_ssize_t i = 0; i < icv->n; i++)
+            icv->entries[i].data = icv->bases[i] + (size_t)k * icv->strides[i];
+        for (Py_ssize_t i = 0; i < acv->n; i++)
+            acv->entries[i].data = acv->bases[i] + (size_t)ptr[k] * acv->strides[i];
+        rc = extxyz_write_ll_state(&self->ws, self->fp,
+                                   (int)(ptr[k + 1] - ptr[k]), c_info, c_arrays,
+                                   f->fmt_i, f->fmt_f, f->fmt_b, f->fmt_s);
+    }
+    Py_END_ALLOW_THREADS
+    self->busy = 0;
+    conv_clear(icv);
+    conv_clear(acv);
+    Py_DECREF(ptr_arr);
+    if (rc != 0) {
+        PyErr_SetString(PyExc_OSError, "error writing to extended XYZ file");
+        return NULL;
+    }
+    Py_RETURN_NONE;
+}
+
+static PyObject *Writer_flush(WriterObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (writer_check(self) < 0) return NULL;
+    int rc;
+    Py_BEGIN_ALLOW_THREADS
+    rc = fflush(self->fp);
+    Py_END_ALLOW_THREADS
+    if (rc != 0) return PyErr_SetFromErrno(PyExc_OSError);
+    Py_RETURN_NONE;
+}
+
+static PyObject *Writer_close(WriterObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (self->busy) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "Writer is being used by another thread");
+        return NULL;
+    }
+    if (writer_close_fp(self) != 0) return PyErr_SetFromErrno(PyExc_OSError);
+    extxyz_write_state_free(&self->ws);
+    Py_RETURN_NONE;
+}
+
+static PyObject *Writer_enter(WriterObject *self, PyObject *Py_UNUSED(ignored))
+{
+    if (writer_check(self) < 0) return NULL;
+    Py_INCREF(self);
+    return (PyObject *)self;
+}
+
+static PyObject *Writer_exit(WriterObject *self, PyObject *Py_UNUSED(args))
+{
+    return Writer_close(self, NULL);
+}
+
+static PyObject *Writer_get_closed(WriterObject *self, void *Py_UNUSED(closure))
+{
+    return PyBool_FromLong(self->fp == NULL);
+}
+
+static PyMethodDef Writer_methods[] = {
+    {"write", (PyCFunction)(void (*)(void))Writer_write,
+     METH_VARARGS | METH_KEYWORDS,
+     "write(natoms, info, arrays, columns=None). Write one frame."},
+    {"write_frames", (PyCFunction)Writer_write_frames, METH_O,
+     "write_frames(frames). Write each (natoms, info, arrays[, columns])."},
+    {"write_batch", (PyCFunction)(void (*)(void))Writer_write_batch,
+     METH_VARARGS | METH_KEYWORDS,
+     "write_batch(frame_ptr, info, arrays, columns=None). Write frames from "
+     "concatenated columns."},
+    {"flush", (PyCFunction)Writer_flush, METH_NOARGS, "Flush the C stream."},
+    {"close", (PyCFunction)Writer_close, METH_NOARGS, "Flush and close the file."},
+    {"__enter__", (PyCFunction)Writer_enter, METH_NOARGS, NULL},
+    {"__exit__", (PyCFunction)Writer_exit, METH_VARARGS, NULL},
+    {NULL, NULL, 0, NULL},
+};
+
+static PyGetSetDef Writer_getset[] = {
+    {"closed", (getter)Writer_get_closed, NULL, "True once closed.", NULL},
+    {NULL, NULL, NULL, NULL, NULL},
+};
+
+static PyTypeObject WriterType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "_extxyz.Writer",
+    .tp_basicsize = sizeof(WriterObject),
+    .tp_dealloc = (destructor)Writer_dealloc,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_doc = "Writer(path, mode='w', format_dict=None, atomic=False): "
+              "extxyz file kept open across frames.",
+    .tp_methods = Writer_methods,
+    .tp_getset = Writer_getset,
+    .tp_init = (initproc)Writer_init,
+    .tp_new = PyType_GenericNew,
+};
+
+/* write_frame(fp_addr:int, natoms:int, info:dict, arrays:dict,
+ *             columns=None, format_dict=None)
+ * Write-side counterpart of read_frame: converts the dicts straight into
+ * DictEntry lists (no per-value ctypes nodes or intermediate copies) and
+ * writes one frame to the FILE* at fp_addr. Raises OSError if the C writer
+ * fails, TypeError/ValueError for values it cannot write. */
+static PyObject *py_write_frame(PyObject *self, PyObject *args)
+{
+    (void)self;
+    unsigned long long fp_addr;
+    PyObject *natoms_obj, *info, *arrays;
+    PyObject *columns = Py_None, *format_dict = Py_None;
+    if (!PyArg_ParseTuple(args, "KOO!O!|OO", &fp_addr, &natoms_obj,
+                          &PyDict_Type, &info, &PyDict_Type, &arrays,
+                          &columns, &format_dict))
+        return NULL;
+    FILE *fp = (FILE *)(uintptr_t)fp_addr;
+    if (!fp) {
+        PyErr_SetString(PyExc_ValueError, "NULL FILE pointer");
+        return NULL;
+    }
+    int nat = (int)PyLong_AsLong(natoms_obj);
+    if (nat == -1 && PyErr_Occurred()) return NULL;
+
+    ColumnFormats formats;
+    DictConv info_cv = {0}, arrays_cv = {0};
+    DictEntry *c_info, *c_arrays;
+    int rc = -1;
+    if (formats_from_dict(&formats, format_dict) < 0)
+        return NULL;
+    if (dict_to_entries(&info_cv, info, NULL, &c_info) == 0 &&
+        dict_to_entries(&arrays_cv, arrays, columns, &c_arrays) == 0) {
+        ExtxyzWriteState ws = {0};
+        Py_BEGIN_ALLOW_THREADS
+        rc = extxyz_write_ll_state(&ws, fp, nat, c_info, c_arrays,
+                                   formats.fmt_i, formats.fmt_f,
+                                   formats.fmt_b, formats.fmt_s);
+        extxyz_write_state_free(&ws);
+        Py_END_ALLOW_THREADS
+        if (rc != 0)
+            PyErr_SetString(PyExc_OSError, "error writing to extended XYZ file");
+    }
+    conv_free(&info_cv);
+    conv_free(&arrays_cv);
+    formats_free(&formats);
+    if (rc != 0) return NULL;
+    Py_RETURN_NONE;
+}
+
 static PyMethodDef extxyz_methods[] = {
     {"read_frame", py_read_frame, METH_VARARGS,
-     "read_frame(grammar_addr, fp_addr, use_tokenizer, comment=None) -> "
-     "(nat, info, arrays). Reads and marshals one frame in C."},
+     "read_frame(grammar_addr, fp_addr, use_tokenizer, comment=None, "
+     "use_cleri=1, complete_lines=0, state=None, skip_atoms=0) -> "
+     "(nat, info, arrays). Reads and marshals one frame in C; with "
+     "skip_atoms the atom lines are skipped and arrays is empty."},
+    {"write_frame", py_write_frame, METH_VARARGS,
+     "write_frame(fp_addr, natoms, info, arrays, columns=None, "
+     "format_dict=None). Marshals and writes one frame in C."},
     {NULL, NULL, 0, NULL},
 };
 
 static struct PyModuleDef extxyz_module = {
     PyModuleDef_HEAD_INIT, "_extxyz",
-    "C-API fast read path for extxyz (additive to the ctypes interface).",
+    "C-API fast read/write paths for extxyz (additive to the ctypes interface).",
     -1, extxyz_methods, NULL, NULL, NULL, NULL,
 };
 
 PyMODINIT_FUNC PyInit__extxyz(void)
 {
     import_array();
+    if (PyType_Ready(&WriterType) < 0) return NULL;
+    if (PyType_Ready(&ReadStateType) < 0) return NULL;
     PyObject *m = PyModule_Create(&extxyz_module);
     if (!m) return NULL;
+    Py_INCREF(&ReadStateType);
+    if (PyModule_AddObject(m, "ReadState", (PyObject *)&ReadStateType) != 0) {
+        Py_DECREF(&ReadStateType);
+        Py_DECREF(m);
+        return NULL;
+    }
+    Py_INCREF(&WriterType);
+    if (PyModule_AddObject(m, "Writer", (PyObject *)&WriterType) != 0) {
+        Py_DECREF(&WriterType);
+        Py_DECREF(m);
+        return NULL;
+    }
     ExtXYZError = PyErr_NewException("_extxyz.ExtXYZError", NULL, NULL);
     if (!ExtXYZError) { Py_DECREF(m); return NULL; }
     Py_INCREF(ExtXYZError);
@@ -0,0 +1,117 @@
+// Differential validation: extxyz_parse_double(s) must be bit-identical to
+// strtod(s) for every string it accepts. Covers random doubles printed with
+// "%.17g" / "%.15e" / "%16.8f", random 1-19 digit mantissas with random
+// exponents over the whole range (including subnormals, overflow and exact
+// halfway cases), Fortran d/D exponents and hand-picked edge cases.
+//
+// Exit status 0 = all matched; 1 = at least one mismatch (printed).
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stdint.h>
+#include <math.h>
+#include <float.h>
+
+#include "fast_parse.h"
+
+static uint64_t rng_state = 0x123456789abcdef0ULL;
+static uint64_t xorshift(void) {
+    uint64_t x = rng_state;
+    x ^= x << 13; x ^= x >> 7; x ^= x << 17;
+    return rng_state = x;
+}
+
+static long mism = 0, checked = 0, fallback = 0;
+
+static int check(const char *s) {
+    char buf[64];
+    double fast, ref;
+    checked++;
+    if (! extxyz_parse_double(s, s + strlen(s), &fast)) {
+        fallback++;
+        return 0;
+    }
+    snprintf(buf, sizeof buf, "%s", s);
+    for (char *c = buf; *c; c++) if (*c == 'd' || *c == 'D') *c = 'e';
+    ref = strtod(buf, NULL);
+    if (memcmp(&fast, &ref, sizeof(double)) != 0) {
+        if (mism < 20)
+            printf("  MISMATCH: [%s] strtod %.17g fast %.17g\n", s, ref, fast);
+        mism++;
+        return 1;
+    }
+    return 0;
+}
+
+static void check_double(double v) {
+    char s[512];
+    snprintf(s, sizeof s, "%.17g", v); check(s);
+    snprintf(s, sizeof s, "%.15e", v); check(s);
+    if (fabs(v) < 1e15) { snprintf(s, sizeof s, "%.8f", v); check(s); }
+}
+
+int main(int argc, char **argv) {
+    long N = (argc > 1) ? atol(argv[1]) : 20000000L;
+
+    // 1. targeted edge cases
+    const char *edges[] = {
+        "0", "-0", "0.0", "-0.0", "+0", ".5", "-.25", "1.", "00012.5000",
+        "1e0", "1E+0", "1d-3", "2.0D-1", "-1.234D-03", "1.5d3", "1e-0",
+        "9007199254740993", "9007199254740992.5", "18446744073709551615",
+        "1e22", "1e23", "8.98846567431158e307", "1.7976931348623157e308",
+        "1.7976931348623158e308", "1.7976931348623159e308", "1e309", "-1e400",
+        "2.2250738585072011e-308", "2.2250738585072014e-308",
+        "4.9406564584124654e-324", "2.4703282292062327e-324",
+        "2.4703282292062328e-324", "1e-324", "1e-400",
+        "0.000000000000000000000000000000000001234567890123456789",
+        "3.0000000000000004", "0.1", "0.2", "0.3", "19.00927393", "-0.00623274",
+        "1.123456789012345", "1.2345678901234567", "123456789012345.6",
+        "9.876543210987653e-05", "1.5e3", "-2.25E-2", "7.2057594037927933e16",
+    };
+    for (size_t i = 0; i < sizeof(edges)/sizeof(edges[0]); i++) check(edges[i]);
+
+    // 2. halfway cases between adjacent doubles, written exactly
+    for (long i = 0; i < 200000; i++) {
+        uint64_t bits = xorshift() & 0x7FEFFFFFFFFFFFFFULL;
+        double a, b;
+        memcpy(&a, &bits, sizeof a);
+        b = nextafter(a, INFINITY);
+        char s[64];
+        // %.17g of the midpoint is not exact; bracket it with 19 digits instead
+        snprintf(s, sizeof s, "%.18e", a / 2 + b / 2);
+        check(s);
+    }
+    for (uint64_t m = 1; m < 100000; m++) {   // exact ties: odd * 2^-1 near 2^53
+        char s[64];
+        snprintf(s, sizeof s, "%llu.5", (unsigned long long) ((1ULL << 53) + 2*m));
+        check(s);
+        snprintf(s, sizeof s, "%llu", (unsigned long long) ((1ULL << 53) + 2*m + 1));
+        check(s);
+    }
+
+    // 3. random doubles over the whole range, as the writers print them
+    for (long i = 0; i < N / 4; i++) {
+        uint64_t bits = xorshift() & 0x7FEFFFFFFFFFFFFFULL;
+        double v;
+        memcpy(&v, &bits, sizeof v);
+        check_double(xorshift() & 1 ? -v : v);
+    }
+
+    // 4. random decimal strings: 1-19 digit mantissa, random point and exponent
+    for (long i = 0; i < N; i++) {
+        char s[64], *c = s;
+        int nd = 1 + (int) (xorshift() % 19), point = (int) (xorshift() % (nd + 1));
+        if (xorshift() & 1) *c++ = '-';
+        for (int k = 0; k < nd; k++) {
+            if (k == point) *c++ = '.';
+            *c++ = (char) ('0' + xorshift() % 10);
+        }
+        int e = (int) (xorshift() % 700) - 360;
+        snprintf(c, sizeof s - (size_t) (c - s), "%c%d", "eEdD"[xorshift() % 4], e);
+        check(s);
+    }
+
+    printf("checked %ld strings, %ld strtod fallbacks, %ld mismatches\n", checked, fallback, mism);
+    return mism ? 1 : 0;
+}
@@ -6,10 +6,12 @@ Translates between :class:`extxyz.Frame` (plain dict + numpy) and
 The single entry point ASE looks up via the ``ase.ioformats`` entry point
 is :data:`cextxyz_format`. The ``read_cextxyz`` and ``write_cextxyz``
 function names are also discovered automatically by ASE because the
-format name is ``cextxyz``.
+format name is ``cextxyz``. :func:`read_cextxyz_batch` reads many frames
+into a list of ``Atoms`` at once, converting them together.
 """
 from __future__ import annotations
 
+import functools
 from typing import Iterable
 
 import numpy as np
@@ -78,15 +80,33 @@ def _species_to_numbers(species: np.ndarray) -> np.ndarray:
     return unique_nums[inverse]
 
 
+@functools.lru_cache(maxsize=64)
+def _array_plan(names: tuple) -> tuple:
+    """``(extxyz name, ASE name, converter)`` for the per-atom extras of a
+    frame with columns ``names``, resolved once per column layout."""
+    plan = []
+    for name in names:
+        if name in ('pos', 'species', 'Z'):
+            continue
+        out_name, converter = _EXTXYZ_TO_ASE.get(name, (name, None))
+        plan.append((name, out_name, converter))
+    return tuple(plan)
+
+
 def _frame_to_atoms(frame: Frame, *,
                     create_calc: bool = False,
-                    calc_prefix: str = '') -> Atoms:
+                    calc_prefix: str = '',
+                    numbers=None) -> Atoms:
     """Build an :class:`ase.Atoms` from one :class:`extxyz.Frame`.
 
-    The frame's numpy buffers (positions and any per-atom extras) are
-    aliased into ``atoms.arrays`` rather than copied. This skips ASE's
-    ``new_array`` per-array ``np.array(..., order='C')`` copy, which is
-    the dominant cost for large frames.
+    The numbers and positions are copied by the ``Atoms`` constructor; the
+    frame's other per-atom numpy buffers are aliased into ``atoms.arrays``
+    rather than copied. This skips ASE's ``new_array`` per-array
+    ``np.array(..., order='C')`` copy, which is the dominant cost for large
+    frames.
+
+    ``numbers``, if given, are the atomic numbers of the frame's species
+    (as computed for many frames at once by :func:`_frames_to_atoms`).
     """
     arrays_in = frame.arrays  # don't copy unless we mutate
 
@@ -96,33 +116,26 @@ def _frame_to_atoms(frame: Frame, *,
         raise ValueError("frame has no 'pos' column")
 
     species = arrays_in.get('species')
-    numbers = arrays_in.get('Z')
-    if numbers is None:
-        if species is None:
-            raise ValueError("frame has neither 'species' nor 'Z' column")
+    if species is not None and numbers is None:
         numbers = _species_to_numbers(species)
-    elif species is not None:
-        if np.any(_species_to_numbers(species) != numbers):
-            raise ValueError(f'inconsistent symbols {species} and numbers {numbers}')
+    if 'Z' in arrays_in:
+        if species is not None and np.any(numbers != arrays_in['Z']):
+            raise ValueError(f'inconsistent symbols {species} and numbers '
+                             f'{arrays_in["Z"]}')
+        numbers = arrays_in['Z']
+    elif species is None:
+        raise ValueError("frame has neither 'species' nor 'Z' column")
 
     cell = frame.cell.T if frame.cell.any() else None
 
-    # Construct without positions: ASE allocates a throwaway zeros((N, 3))
-    # which we immediately overwrite with the parser's buffer (no memcpy).
-    atoms = Atoms(numbers=numbers, cell=cell, pbc=frame.pbc)
-    atoms.arrays['positions'] = positions
+    atoms = Atoms(numbers=numbers, positions=positions, cell=cell,
+                  pbc=frame.pbc)
 
     # Per-atom extras — direct assign to skip new_array's copy.
-    for name, value in arrays_in.items():
-        if name in ('pos', 'species', 'Z'):
-            continue
-        mapping = _EXTXYZ_TO_ASE.get(name)
-        if mapping is None:
-            out_name = name
-        else:
-            out_name, converter = mapping
-            if converter is not None:
-                value = converter(atoms, value)
+    for name, out_name, converter in _array_plan(tuple(arrays_in)):
+        value = arrays_in[name]
+        if converter is not None:
+            value = converter(atoms, value)
         atoms.arrays[out_name] = value
 
     if create_calc:
@@ -138,6 +151,28 @@ def _frame_to_atoms(frame: Frame, *,
     return atoms
 
 
+def _frames_to_atoms(frames: list[Frame], *,
+                     create_calc: bool = False,
+                     calc_prefix: str = '') -> list[Atoms]:
+    """:func:`_frame_to_atoms` for many frames.
+
+    The species of all frames are mapped to atomic numbers with one
+    :func:`_species_to_numbers` call over their concatenation, rather than
+    one ``np.unique`` per frame.
+    """
+    species = [frame.arrays.get('species') for frame in frames]
+    present = [s for s in species if s is not None]
+    numbers = iter(())
+    if present:
+        all_numbers = _species_to_numbers(np.concatenate(present))
+        numbers = iter(np.split(all_numbers,
+                                np.cumsum([len(s) for s in present[:-1]])))
+    return [_frame_to_atoms(frame, create_calc=create_calc,
+                            calc_prefix=calc_prefix,
+                            numbers=None if s is None else next(numbers))
+            for frame, s in zip(frames, species)]
+
+
 def _atoms_to_frame(atoms: Atoms, *,
                     columns=None,
                     write_calc: bool = False,
@@ -262,28 +297,17 @@ def _update_atoms_from_calc(atoms, calc=None, calc_prefix=''):
 def _normalize_index(index):
     """Translate ASE's index argument into something iread_dicts can take.
 
-    Returns ``(forward_slice_or_none, post_slice)`` where:
-    - ``forward_slice_or_none`` is what to pass to ``iread_dicts(index=...)``
-      (so we read lazily when possible). ``None`` means read everything.
-    - ``post_slice`` is applied to the resulting list of frames in memory,
-      e.g. for negative indices.
+    iread_dicts resolves negative indices and steps itself, from a scan of
+    the file's frame boundaries, so only ASE's string forms and ``None``
+    need translating.
     """
     if isinstance(index, str):
         from ase.io.formats import string2index
         index = string2index(index)
     if index is None:
-        return slice(None), None
-    if isinstance(index, int):
-        if index >= 0:
-            return slice(index, index + 1), None
-        # Negative single index: read all, slice in memory.
-        return None, index
-    if isinstance(index, slice):
-        has_neg = ((index.start is not None and index.start < 0) or
-                   (index.stop is not None and index.stop < 0))
-        if has_neg:
-            return None, index
-        return index, None
+        return slice(None)
+    if isinstance(index, (int, slice)):
+        return index
     raise TypeError(f'unsupported index {index!r}')
 
 
@@ -293,6 +317,7 @@ def read_cextxyz(filename, index=-1, *,
                  use_cleri: bool = True,
                  create_calc: bool = False,
                  calc_prefix: str = '',
+                 on_truncated: str = 'raise',
                  verbose: int = 0):
     """Yield :class:`ase.Atoms` from an extxyz file.
 
@@ -302,32 +327,50 @@ def read_cextxyz(filename, index=-1, *,
 
     ``use_cleri`` (C backend only): True (default) parses the comment line with
     the libcleri grammar; False uses the faster first-char dispatch parser.
+
+    ``on_truncated='drop'`` skips an incomplete last frame (a file still being
+    written, or a job killed mid-write) instead of raising; see
+    :func:`extxyz.iread_dicts`.
+
+    Only the selected frames are parsed, also for negative indices and
+    steps: :func:`extxyz.iread_dicts` finds them with a scan of the file's
+    frame boundaries and seeks to each, so reading the last frame of a long
+    trajectory doesn't hold all the others in memory.
     """
-    forward, post = _normalize_index(index)
-
-    if forward is not None:
-        for frame in extxyz.iread_dicts(filename, index=forward,
-                                        use_cextxyz=use_cextxyz,
-                                        use_regex=use_regex,
-                                        use_cleri=use_cleri,
-                                        verbose=verbose):
-            yield _frame_to_atoms(frame, create_calc=create_calc,
-                                  calc_prefix=calc_prefix)
-        return
+    for frame in extxyz.iread_dicts(filename, index=_normalize_index(index),
+                                    use_cextxyz=use_cextxyz,
+                                    use_regex=use_regex,
+                                    use_cleri=use_cleri,
+                                    on_truncated=on_truncated,
+                                    verbose=verbose):
+        yield _frame_to_atoms(frame, create_calc=create_calc,
+                              calc_prefix=calc_prefix)
+
 
-    # Negative indexing: buffer all frames, then apply the slice.
-    frames = list(extxyz.iread_dicts(filename,
+def read_cextxyz_batch(filename, index=':', *,
+                       use_cextxyz: bool = True,
+                       use_regex: bool = False,
+                       use_cleri: bool = True,
+                       create_calc: bool = False,
+                       calc_prefix: str = '',
+                       on_truncated: str = 'raise',
+                       verbose: int = 0) -> list[Atoms]:
+    """Read the frames selected by ``index`` into a list of :class:`ase.Atoms`.
+
+    Takes the same arguments as :func:`read_cextxyz`, but reads all the
+    selected frames first and converts them together: species are mapped to
+    atomic numbers in one vectorised call over all frames, and the
+    array-name mapping is resolved once per column layout. For files of
+    many small frames this is much cheaper than converting frame by frame.
+    """
+    frames = list(extxyz.iread_dicts(filename, index=_normalize_index(index),
                                      use_cextxyz=use_cextxyz,
                                      use_regex=use_regex,
                                      use_cleri=use_cleri,
+                                     on_truncated=on_truncated,
                                      verbose=verbose))
-    if isinstance(post, int):
-        yield _frame_to_atoms(frames[post], create_calc=create_calc,
-                              calc_prefix=calc_prefix)
-    else:
-        for frame in frames[post]:
-            yield _frame_to_atoms(frame, create_calc=create_calc,
-                                  calc_prefix=calc_prefix)
+    return _frames_to_atoms(frames, create_calc=create_calc,
+                            calc_prefix=calc_prefix)
 
 
 def write_cextxyz(filename, images, *,
@@ -364,14 +407,14 @@ def write_cextxyz(filename, images, *,
 
 
 # ----------------------------------------------------------------------------
-# Streaming writer — keeps one libc FILE* open across many .write() calls
+# Streaming writer — keeps one file open across many .write() calls
 # ----------------------------------------------------------------------------
 
 class ExtXYZTrajectoryWriter:
-    """Stateful writer that opens the file once and keeps the libc FILE*
-    alive across calls. Use this when attaching to an ASE optimizer or
-    dynamics, where ``ase.io.write(..., format='cextxyz', append=True)`` per
-    step would re-open the file every iteration.
+    """Stateful writer that opens the file once and keeps it open across
+    calls. Use this when attaching to an ASE optimizer or dynamics, where
+    ``ase.io.write(..., format='cextxyz', append=True)`` per step would
+    re-open the file every iteration.
 
         >>> from ase.optimize import LBFGS
         >>> with ExtXYZTrajectoryWriter('opt.xyz', atoms=atoms) as traj:
@@ -379,16 +422,24 @@ class ExtXYZTrajectoryWriter:
         ...     opt.attach(traj, interval=1)
         ...     opt.run(fmax=1e-3)
 
-    The writer goes through the C writer (``cextxyz.write_frame_dicts``)
-    directly, never re-opening the file.
+    The writer goes through :class:`extxyz.Writer`, which keeps the C
+    writer's buffers and ``Properties`` header across steps and converts each
+    frame in C rather than through ctypes.
+
+    With ``async_=True`` each step only snapshots the frame; formatting and
+    I/O happen on a background thread, with at most ``queue_depth`` frames
+    pending before the step blocks. ``flush()``/``close()`` drain the queue.
+    ``atomic=True`` writes each frame with a single ``write()``, so a job
+    killed mid-step leaves at most one incomplete frame at the end, which
+    ``read(..., on_truncated='drop')`` skips (see :class:`extxyz.Writer`).
     """
 
     def __init__(self, filename, mode='w', atoms=None,
                  columns=None, write_calc: bool = False,
-                 calc_prefix: str = ''):
-        from extxyz import cextxyz
-        self._cextxyz = cextxyz
-        self._fp = cextxyz.cfopen(str(filename), mode)
+                 calc_prefix: str = '', async_: bool = False,
+                 queue_depth: int = 4, atomic: bool = False):
+        self._writer = extxyz.Writer(filename, mode, async_=async_,
+                                     queue_depth=queue_depth, atomic=atomic)
         self.atoms = atoms
         self.columns = columns
         self.write_calc = write_calc
@@ -414,25 +465,11 @@ class ExtXYZTrajectoryWriter:
                                 write_calc=self.write_calc,
                                 calc_prefix=self.calc_prefix,
                                 verbose=verbose)
-        # Order: ensure species + pos come first in the column list.
-        cols = list(frame.arrays.keys())
-        for special in ('pos', 'species'):
-            if special in cols:
-                cols.remove(special)
-        if 'species' in frame.arrays:
-            cols.insert(0, 'species')
-        if 'pos' in frame.arrays:
-            cols.insert(1 if 'species' in frame.arrays else 0, 'pos')
-
-        info = dict(frame.info)
-        info['Lattice'] = frame.cell.T
-        info['pbc'] = frame.pbc
+        # extxyz.Writer puts species + pos first in the column list.
+        self._writer.write(frame)
 
-        self._cextxyz.write_frame_dicts(self._fp, frame.natoms, info,
-                                        {k: frame.arrays[k] for k in cols},
-                                        cols, verbose)
+    def flush(self):
+        self._writer.flush()
 
     def close(self):
-        if self._fp is not None:
-            self._cextxyz.cfclose(self._fp)
-            self._fp = None
+        self._writer.close()
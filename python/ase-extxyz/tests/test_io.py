@@ -76,6 +76,26 @@ def test_trajectory_writer_streaming(tmp_path):
         np.testing.assert_allclose(orig.positions, got.positions, atol=1e-7)
 
 
+def test_trajectory_writer_async(tmp_path):
+    """async_=True hands formatting and I/O to a background thread; each step
+    is snapshotted, so moving the atoms afterwards doesn't change the frame."""
+    from ase_extxyz.io import ExtXYZTrajectoryWriter
+
+    out = tmp_path / 'async.xyz'
+    atoms = bulk('Cu') * 2
+    positions = []
+    with ExtXYZTrajectoryWriter(str(out), atoms=atoms, async_=True,
+                                queue_depth=2) as traj:
+        for _ in range(10):
+            atoms.positions += 0.01
+            positions.append(atoms.positions.copy())
+            traj()
+    back = ase.io.read(str(out), format='cextxyz', index=':')
+    assert len(back) == 10
+    for want, got in zip(positions, back):
+        np.testing.assert_allclose(got.positions, want, atol=1e-7)
+
+
 def test_trajectory_writer_callable_for_optimizers(tmp_path):
     """Optimizer.attach calls the trajectory directly; __call__ delegates to write()."""
     from ase_extxyz.io import ExtXYZTrajectoryWriter
@@ -89,3 +109,82 @@ def test_trajectory_writer_callable_for_optimizers(tmp_path):
         traj()
     back = ase.io.read(str(out), format='cextxyz', index=':')
     assert len(back) == 2
+
+
+@pytest.mark.parametrize('create_calc', [False, True])
+def test_read_batch_matches_per_frame(tmp_path, create_calc):
+    """read_cextxyz_batch converts all frames together but must give the
+    same Atoms as the per-frame reader, across changing column layouts."""
+    from ase.calculators.singlepoint import SinglePointCalculator
+    from ase_extxyz.io import read_cextxyz, read_cextxyz_batch
+
+    out = tmp_path / 'mixed.xyz'
+    rng = np.random.default_rng(3)
+    frames = []
+    for k in range(6):
+        atoms = bulk('NaCl', 'rocksalt', a=5.6) * (1, 1, 1 + k % 2)
+        if k % 3 == 1:
+            atoms.set_velocities(rng.standard_normal((len(atoms), 3)))
+        if k % 3 == 2:
+            atoms.pbc = False
+            atoms.cell = None
+            atoms.calc = SinglePointCalculator(
+                atoms, energy=-k, forces=rng.standard_normal((len(atoms), 3)))
+        atoms.info['step'] = k
+        frames.append(atoms)
+    ase.io.write(str(out), frames, format='cextxyz')
+    with open(out, 'a') as fh:
+        fh.write('2\nProperties=Z:I:1:pos:R:3 step=6\n'
+                 '8 0 0 0\n1 0 0 1\n')
+
+    for index in [':', '1::2', -2, '-3:']:
+        want = list(read_cextxyz(out, index, create_calc=create_calc))
+        got = read_cextxyz_batch(out, index, create_calc=create_calc)
+        assert len(got) == len(want) > 0
+        for g, w in zip(got, want):
+            assert g == w
+            assert g.info == w.info
+            assert g.arrays.keys() == w.arrays.keys()
+            for key in w.arrays:
+                np.testing.assert_array_equal(g.arrays[key], w.arrays[key])
+            if create_calc and w.calc is not None:
+                assert g.calc.results.keys() == w.calc.results.keys()
+            else:
+                assert (g.calc is None) == (w.calc is None)
+
+
+def test_read_batch_constructed_atoms_behave(tmp_path):
+    """Atoms built by the batch reader must support the usual operations."""
+    from ase_extxyz.io import read_cextxyz_batch
+
+    out = tmp_path / 'cu.xyz'
+    ase.io.write(str(out), [bulk('Cu') * 2, bulk('Cu')], format='cextxyz')
+    first, second = read_cextxyz_batch(out)
+    assert first.get_chemical_formula() == 'Cu8'
+    np.testing.assert_allclose(first.get_volume(), 8 * bulk('Cu').get_volume())
+    copy = first.copy()
+    copy.numbers[0] = 29 + 1
+    assert first.numbers[0] == 29 and second.numbers[0] == 29
+    first.wrap()
+    assert len(first + second) == 9
+
+
+def test_read_batch_atoms_own_their_arrays(tmp_path):
+    """The numbers of all frames are computed in one buffer; every Atoms
+    must still get its own copy, as must positions."""
+    from ase_extxyz.io import read_cextxyz, read_cextxyz_batch
+
+    out = tmp_path / 'cu.xyz'
+    ase.io.write(str(out), [bulk('Cu') * 2, bulk('Cu'), bulk('Cu')],
+                 format='cextxyz')
+    for frames in (read_cextxyz_batch(out), list(read_cextxyz(out, ':'))):
+        first, second, third = frames
+        first.numbers[-1] = 8
+        second.numbers[0] = 1
+        second.positions[0] += 1.0
+        assert list(third.numbers) == [29]
+        assert list(first.numbers) == [29] * 7 + [8]
+        np.testing.assert_array_equal(third.positions, [[0, 0, 0]])
+        for atoms in frames:
+            assert atoms.numbers.flags.owndata
+            assert atoms.positions.flags.owndata
@@ -3,20 +3,49 @@
 The dict-based public API:
 
 * :class:`Frame`            — one parsed frame
+* :class:`LazyFrame`        — a Frame whose columns are parsed on access
 * :func:`iread_dicts`       — yield Frame instances
 * :func:`read_dicts`        — eager, returns Frame or list[Frame]
+* :func:`read_last`         — the last frames, read backwards from the end
 * :func:`write_dicts`       — write one or many Frame
+* :class:`Writer`           — keep one file open for writing many Frames
+* :func:`write_batch`       — write frames from concatenated columns
+* :class:`CommentCache`     — reuse parsed comment lines when reading
+* :func:`aiter_dicts`       — ``async for`` over Frame instances
+* :class:`AsyncWriter`      — :class:`Writer` for asyncio code
+
+Per-phase timers and counters of the C reader are in :mod:`extxyz.stats`.
 
 To use extxyz with ASE, install the ``ase-extxyz`` plugin package which
 registers a ``cextxyz`` format with :mod:`ase.io`.
 """
 from ._version import __version__
-from .core import Frame, iread_dicts, read_dicts, write_dicts
+from .core import (CommentCache, Frame, LazyFrame, Writer, iread_dicts,
+                   read_dicts, read_last, write_batch, write_dicts)
 
 __all__ = [
     '__version__',
+    'AsyncWriter',
+    'CommentCache',
     'Frame',
+    'LazyFrame',
+    'Writer',
+    'aiter_dicts',
     'iread_dicts',
     'read_dicts',
+    'read_last',
+    'write_batch',
     'write_dicts',
 ]
+
+
+def __getattr__(name):
+    # extxyz.aio pulls in asyncio, which costs more to import than the rest of
+    # the package; only load it when the async API is asked for
+    if name in ('AsyncWriter', 'aiter_dicts'):
+        from . import aio
+        return getattr(aio, name)
+    if name == 'stats':
+        import importlib
+        return importlib.import_module('.stats', __name__)
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
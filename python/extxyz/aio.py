@@ -0,0 +1,110 @@
+"""asyncio front end to the dict/array API.
+
+* :func:`aiter_dicts` — ``async for frame in aiter_dicts(path)``.
+* :class:`AsyncWriter` — ``await writer.write(frame)``.
+
+Reading, parsing and writing run on a worker thread, so they do not block the
+event loop; the C read/write calls release the GIL while they work on the
+file. Each reader or writer owns one single-thread executor, which keeps the
+calls on its file handle strictly in order.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import AsyncIterator
+
+from .core import Frame, Writer, iread_dicts
+
+_DONE = object()
+
+
+def _next_frame(frames):
+    return next(frames, _DONE)
+
+
+async def aiter_dicts(file, index=None, *, prefetch=2, **kwargs
+                      ) -> AsyncIterator[Frame]:
+    """Asynchronously yield :class:`Frame` instances from ``file``.
+
+    Accepts the same arguments as :func:`extxyz.iread_dicts`. Up to
+    ``prefetch`` frames are read and parsed ahead on a worker thread, so
+    parsing frame k+1 overlaps with the consumer's work on frame k.
+    """
+    if prefetch < 1:
+        raise ValueError(f'prefetch must be >= 1, not {prefetch!r}')
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=1,
+                                  thread_name_prefix='extxyz-aio')
+    frames = iread_dicts(file, index, **kwargs)
+    pending = deque(loop.run_in_executor(executor, _next_frame, frames)
+                    for _ in range(prefetch))
+    try:
+        while True:
+            frame = await pending.popleft()
+            if frame is _DONE:
+                return
+            pending.append(loop.run_in_executor(executor, _next_frame, frames))
+            yield frame
+    finally:
+        for fut in pending:
+            fut.cancel()
+        # runs after any read still in progress; closes the file
+        executor.submit(frames.close)
+        executor.shutdown(wait=False)
+
+
+class AsyncWriter:
+    """:class:`extxyz.Writer` for asyncio code.
+
+    Takes the same arguments as :class:`extxyz.Writer`; each ``write`` call
+    converts and writes the frame on a worker thread and returns once it is
+    written::
+
+        async with AsyncWriter('traj.xyz') as w:
+            await w.write(frame)
+    """
+
+    def __init__(self, file, mode='w', **kwargs):
+        self._writer = Writer(file, mode, **kwargs)
+        self._executor = ThreadPoolExecutor(max_workers=1,
+                                            thread_name_prefix='extxyz-aio')
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor,
+                                          partial(func, *args, **kwargs))
+
+    @property
+    def closed(self):
+        return self._writer.closed
+
+    async def write(self, frames):
+        """Write a :class:`Frame` or an iterable of them."""
+        await self._run(self._writer.write, frames)
+
+    async def write_batch(self, arrays, frame_ptr, info_arrays=None,
+                          cell=None, pbc=None):
+        """Write frames held as concatenated columns, see
+        :meth:`extxyz.Writer.write_batch`."""
+        await self._run(self._writer.write_batch, arrays, frame_ptr,
+                        info_arrays, cell, pbc)
+
+    async def flush(self):
+        await self._run(self._writer.flush)
+
+    async def aclose(self):
+        if self._writer.closed:
+            return
+        try:
+            await self._run(self._writer.close)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
@@ -1,9 +1,9 @@
 import os
 import sys
 import ctypes
-from ctypes.util import find_library
 import sysconfig
 import atexit
+import threading
 
 import copy
 
@@ -23,6 +23,12 @@ DATA_F = 2
 DATA_B = 3
 DATA_S = 4
 
+# extxyz_read_ll_flags() flags, as in extxyz.h
+READ_TOKENIZER = 1
+READ_CLERI = 2
+READ_COMPLETE_LINES = 4
+READ_SKIP_ATOMS = 8
+
 type_map = {
     DATA_I: ctypes.POINTER(ctypes.c_int),
     DATA_F: ctypes.POINTER(ctypes.c_double),
@@ -74,17 +80,27 @@ extxyz.free_dict.args = [Dict_entry_ptr]
 # The same _extxyz .so is also importable as a CPython C-API module when built
 # with numpy (libextxyz/pyext.c). When present it provides `read_frame`, which
 # does the read + dict marshalling entirely in C — far faster than the per-node
-# ctypes loop in c_to_py_dict. A numpy-less C/Fortran/Julia build has no
+# ctypes loop in c_to_py_dict — plus the write-side `write_frame` and `Writer`,
+# a file handle, which convert dicts to DictEntry lists in C instead of
+# py_to_c_dict, and `ReadState`, reader state (the comment-line cache) kept
+# across read_frame calls. A numpy-less C/Fortran/Julia build has no
 # PyInit__extxyz, so this import fails and we fall back to the ctypes path.
 try:
     from . import _extxyz as _ext_mod
     _HAVE_C_READ = hasattr(_ext_mod, 'read_frame')
+    _HAVE_C_WRITE = hasattr(_ext_mod, 'write_frame')
+    _HAVE_C_WRITER = hasattr(_ext_mod, 'Writer')
+    _HAVE_C_READ_STATE = hasattr(_ext_mod, 'ReadState')
 except ImportError:
     _ext_mod = None
     _HAVE_C_READ = False
+    _HAVE_C_WRITE = False
+    _HAVE_C_WRITER = False
+    _HAVE_C_READ_STATE = False
 
-# Escape hatch: force the legacy ctypes marshalling (for A/B benchmarking and as
-# a safety valve). Any value other than ''/0/false enables it.
+# Escape hatch: force the legacy ctypes marshalling in read_frame_dicts and
+# write_frame_dicts (for A/B benchmarking and as a safety valve). Any value
+# other than ''/0/false enables it.
 _USE_LEGACY_MARSHAL = os.environ.get('EXTXYZ_LEGACY_MARSHAL', '').lower() \
     not in ('', '0', 'false', 'no')
 
@@ -166,13 +182,17 @@ def py_to_c_dict(py_dict, keys=None):
     Returns:
         c_dict (Dict_entry_ptr): Output linked list
     """
+    if keys is None:
+        keys = py_dict.keys()
+    keys = list(keys)
+    if not keys:
+        # an empty dict is a NULL list, not a single node with a NULL key
+        return Dict_entry_ptr()
+
     c_dict = ctypes.cast(ctypes.create_string_buffer(ctypes.sizeof(Dict_entry_struct)), 
                          Dict_entry_ptr)
     node_ptr = c_dict
-    
-    if keys is None:
-        keys = py_dict.keys()
-    
+
     for idx, key in enumerate(keys):
         value = py_dict[key]
         node = node_ptr.contents
@@ -232,7 +252,7 @@ def py_to_c_dict(py_dict, keys=None):
         else:
             raise TypeError(f"unsupported type {type(value)}")
 
-        if idx != len(py_dict) - 1:
+        if idx != len(keys) - 1:
             # allocate another DictEntry struct unless we're on the last one already
             node.next = ctypes.cast(ctypes.create_string_buffer(ctypes.sizeof(Dict_entry_struct)), 
                                     Dict_entry_ptr)
@@ -241,16 +261,25 @@ def py_to_c_dict(py_dict, keys=None):
     return c_dict
 
 
-# construct grammar only once on module initialisation
-_kv_grammar = extxyz.compile_extxyz_kv_grammar()
+# The grammar is compiled once, on the first read rather than at import, so
+# processes that only import extxyz (or only write) never pay for it.
+_kv_grammar = None
+_kv_grammar_lock = threading.Lock()
+
+
+def _get_kv_grammar():
+    global _kv_grammar
+    if _kv_grammar is None:
+        with _kv_grammar_lock:
+            if _kv_grammar is None:
+                _kv_grammar = extxyz.compile_extxyz_kv_grammar()
+    return _kv_grammar
+
 
-# Pre-compile the first-char dispatcher's token regexes once, here at import
-# (single-threaded), so the lazy in-C init never races between concurrent
-# reads. Guarded by hasattr: a build whose _extxyz didn't export it (the symbol
-# is in _extxyz.def) still works via the C function's own lazy init.
+# The first-char dispatcher compiles (and JITs) its token regexes lazily in C,
+# under a lock, on its first parse. Guarded by hasattr: a build whose _extxyz
+# didn't export the init/free pair (they are in _extxyz.def) has nothing to free.
 _have_dispatch = hasattr(extxyz, 'extxyz_dispatch_init')
-if _have_dispatch:
-    extxyz.extxyz_dispatch_init()
 
 
 @atexit.register
@@ -269,20 +298,15 @@ def _free_kv_grammar():
     if _have_dispatch:
         extxyz.extxyz_dispatch_free()
 
-# On Windows, route stdio through wrappers in _extxyz so we use the same
-# C runtime as extxyz_read_ll/extxyz_write_ll. find_library('c') returns
-# None there, and msvcrt.dll's CRT can differ from the .pyd's.
-if sys.platform == 'win32':
-    _stdio = extxyz
-    _fopen, _fclose, _ftell, _fseek = (
-        _stdio.extxyz_fopen, _stdio.extxyz_fclose,
-        _stdio.extxyz_ftell, _stdio.extxyz_fseek,
-    )
-else:
-    _stdio = ctypes.CDLL(find_library('c'))
-    _fopen, _fclose, _ftell, _fseek = (
-        _stdio.fopen, _stdio.fclose, _stdio.ftell, _stdio.fseek,
-    )
+# Route stdio through the thunks in _extxyz so the FILE* always lives in the
+# C runtime extxyz_read_ll/extxyz_write_ll use (on Windows msvcrt.dll's CRT can
+# differ from the .pyd's). This also saves looking up libc with
+# ctypes.util.find_library, which imports subprocess and runs ldconfig.
+_stdio = extxyz
+_fopen, _fclose, _ftell, _fseek, _fflush = (
+    _stdio.extxyz_fopen, _stdio.extxyz_fclose,
+    _stdio.extxyz_ftell, _stdio.extxyz_fseek, _stdio.extxyz_fflush,
+)
 
 _fopen.argtypes = [ctypes.c_char_p, ctypes.c_char_p]
 _fopen.restype = FILE_ptr
@@ -292,6 +316,8 @@ _ftell.argtypes = [FILE_ptr]
 _ftell.restype = ctypes.c_long
 _fseek.argtypes = [FILE_ptr, ctypes.c_long, ctypes.c_int]
 _fseek.restype = ctypes.c_int
+_fflush.argtypes = [FILE_ptr]
+_fflush.restype = ctypes.c_int
 
 
 def cfopen(filename, mode):
@@ -310,8 +336,50 @@ def cfseek(fp, offset, whence):
     return _fseek(fp, offset, whence)
 
 
+def cfflush(fp):
+    return _fflush(fp)
+
+
+extxyz.extxyz_scan_frames.argtypes = [FILE_ptr, ctypes.POINTER(ctypes.c_long),
+                                      ctypes.c_long, ctypes.c_int,
+                                      ctypes.POINTER(ctypes.c_long)]
+extxyz.extxyz_scan_frames.restype = ctypes.c_long
+
+_c_long_dtype = np.dtype(f'i{ctypes.sizeof(ctypes.c_long)}')
+
+
+def scan_frames(fp, max_frames=None, complete_lines=False, chunk=65536):
+    """Find where the frames of ``fp`` start, from its current position,
+    with extxyz_scan_frames() (which counts lines without parsing them).
+
+    Returns ``(offsets, end)``: an int64 array of the byte offsets of up to
+    ``max_frames`` (default: all) complete frames, and the offset just past
+    the last of them, where ``fp`` is left. ``end`` is short of the end of the
+    file if ``max_frames`` was reached, or the rest of the file is not a
+    complete frame (with ``complete_lines``, as for :func:`read_frame_dicts`).
+    """
+    flags = READ_COMPLETE_LINES if complete_lines else 0
+    end = ctypes.c_long(cftell(fp))
+    parts = [np.zeros(0, dtype=np.int64)]
+    while max_frames is None or max_frames > 0:
+        size = chunk if max_frames is None else min(chunk, max_frames)
+        buf = np.empty(size, dtype=_c_long_dtype)
+        n = extxyz.extxyz_scan_frames(
+            fp, buf.ctypes.data_as(ctypes.POINTER(ctypes.c_long)), size,
+            flags, ctypes.byref(end))
+        if n < 0:
+            raise ExtXYZError('Cannot scan a stream without a file position')
+        parts.append(buf[:n])
+        if max_frames is not None:
+            max_frames -= n
+        if n < size:
+            break
+    return np.concatenate(parts).astype(np.int64, copy=False), end.value
+
+
 def read_frame_dicts(fp, verbose=False, comment=None, use_regex=False,
-                     use_cleri=True):
+                     use_cleri=True, complete_lines=False, state=None,
+                     skip_atoms=False):
     """Read a single frame, returning ``(nat, info, arrays)``.
 
     Uses the C-API ``_extxyz.read_frame`` fast path (read + dict marshalling in
@@ -332,15 +400,24 @@ def read_frame_dicts(fp, verbose=False, comment=None, use_regex=False,
             with the libcleri grammar. If False, use the faster first-char
             dispatch parser, which accepts the same language (validated by a
             differential conformance test) and builds the same dicts.
+        complete_lines (bool, optional): if True, a last line without a
+            trailing newline means the frame was cut short (e.g. the file is
+            still being written), failing like any truncated frame with an
+            ``ExtXYZError`` whose message starts with "Truncated frame".
+        state (_extxyz.ReadState, optional): reader state kept across the
+            frames of one file, e.g. with a comment-line cache. Only used by
+            the C-API path; the ctypes path ignores it.
 
     Returns:
         nat, info, arrays: int, dict, dict
     """
     if _HAVE_C_READ and not _USE_LEGACY_MARSHAL and not verbose:
         try:
-            return _ext_mod.read_frame(_kv_grammar.value, fp.value,
+            return _ext_mod.read_frame(_get_kv_grammar().value, fp.value,
                                        0 if use_regex else 1, comment,
-                                       1 if use_cleri else 0)
+                                       1 if use_cleri else 0,
+                                       1 if complete_lines else 0, state,
+                                       1 if skip_atoms else 0)
         except _ext_mod.ExtXYZError as exc:
             # Re-raise as the canonical cextxyz.ExtXYZError so callers (and
             # tests) catch one exception type regardless of backend. Normalise
@@ -348,12 +425,15 @@ def read_frame_dicts(fp, verbose=False, comment=None, use_regex=False,
             # core.py's "Failed to parse string" fallback still matches.
             raise ExtXYZError(str(exc).strip().replace('\n', '')) from None
     return read_frame_dicts_ctypes(fp, verbose=verbose, comment=comment,
-                                   use_regex=use_regex, use_cleri=use_cleri)
+                                   use_regex=use_regex, use_cleri=use_cleri,
+                                   complete_lines=complete_lines,
+                                   skip_atoms=skip_atoms)
 
 
 def read_frame_dicts_ctypes(fp, verbose=False, comment=None, use_regex=False,
-                            use_cleri=True):
-    """Read a single frame using extxyz_read_ll_opts() and marshal the C
+                            use_cleri=True, complete_lines=False,
+                            skip_atoms=False):
+    """Read a single frame using extxyz_read_ll_flags() and marshal the C
     dictionaries to Python via ctypes (the original, slower path).
 
     Returns:
@@ -371,15 +451,18 @@ def read_frame_dicts_ctypes(fp, verbose=False, comment=None, use_regex=False,
             comment = ctypes.POINTER(ctypes.c_char)()
 
         error_message = ctypes.create_string_buffer(1024)
-        if not extxyz.extxyz_read_ll_opts(_kv_grammar,
-                                     fp,
-                                     ctypes.byref(nat),
-                                     ctypes.byref(info),
-                                     ctypes.byref(arrays),
-                                     comment,
-                                     error_message,
-                                     ctypes.c_int(0 if use_regex else 1),
-                                     ctypes.c_int(1 if use_cleri else 0)):
+        flags = ((0 if use_regex else READ_TOKENIZER) |
+                 (READ_CLERI if use_cleri else 0) |
+                 (READ_COMPLETE_LINES if complete_lines else 0) |
+                 (READ_SKIP_ATOMS if skip_atoms else 0))
+        if not extxyz.extxyz_read_ll_flags(_get_kv_grammar(),
+                                      fp,
+                                      ctypes.byref(nat),
+                                      ctypes.byref(info),
+                                      ctypes.byref(arrays),
+                                      comment,
+                                      error_message,
+                                      ctypes.c_int(flags)):
             failure = True
             if (error_message.value == b'' or 
                 error_message.value.decode().startswith("Failed to parse int natoms from ' ")):
@@ -406,12 +489,23 @@ def read_frame_dicts_ctypes(fp, verbose=False, comment=None, use_regex=False,
 def write_frame_dicts(fp, nat, info, arrays, columns=None, verbose=False, format_dict=None):
     """Write a single frame using extxyz_write_ll C function
 
+    Uses the C-API ``_extxyz.write_frame`` (dict -> DictEntry conversion in
+    C) when available; otherwise, or with ``verbose`` (which dumps the C dicts
+    to stdout) or ``EXTXYZ_LEGACY_MARSHAL=1``, the ctypes conversion in
+    :func:`py_to_c_dict`. Both write the same bytes.
+
     Args:
         fp (FILE_ptr): open file to which to write
         nat (int): Number of atoms
         info (dict): Python dictionary of per-config data
         arrays (dict): Python dictionary of per-atom data
     """
+    if _HAVE_C_WRITE and not _USE_LEGACY_MARSHAL and not verbose:
+        _ext_mod.write_frame(fp.value or 0, nat, info, arrays,
+                             None if columns is None else list(columns),
+                             format_dict)
+        return
+
     nat = ctypes.c_int(nat)
     c_info = py_to_c_dict(info)
     
@@ -4,6 +4,10 @@ Parses one or more frames from an extxyz file and dumps them as JSON
 (via :class:`extxyz.grammar.ExtXYZEncoder`). Optionally round-trips through
 the writer to verify ``read → write → read`` is idempotent.
 
+``extxyz profile FILE`` instead reports, per float column, how often the C
+reader's exact fast path parses the tokens and what the others look like (see
+:func:`extxyz.stats.float_profile`).
+
 This entry point intentionally has no ASE dependency so it works from a
 plain ``pip install extxyz``.
 """
@@ -11,9 +15,10 @@ import argparse
 import cProfile
 import json
 import os
+import sys
 import time
 
-from .core import Frame, read_dicts, write_dicts
+from .core import Frame, iread_dicts, read_dicts, write_dicts
 from .grammar import ExtXYZEncoder
 
 
@@ -27,7 +32,44 @@ def _frame_to_jsonable(frame: Frame) -> dict:
     }
 
 
-def main():
+def _profile_main(argv):
+    parser = argparse.ArgumentParser(
+        prog='extxyz profile',
+        description='Float fast-path hit rates per column of an extxyz file.')
+    parser.add_argument('file')
+    parser.add_argument('-n', '--frames', type=int, default=None,
+                        help='only look at the first N frames')
+    parser.add_argument('-t', '--top', type=int, default=3,
+                        help='slow-path token shapes to show per column')
+    args = parser.parse_args(argv)
+
+    from . import stats
+    index = slice(None, args.frames)
+    profiles = stats.float_profile(args.file, index)
+    with stats.measure() as totals:
+        nframes = sum(1 for _ in iread_dicts(args.file, index))
+
+    print(f'{args.file}: {nframes} frame(s)')
+    print(f'{"column":<16} {"floats":>10} {"fast path":>10} {"digits":>7}  '
+          'slow-path shapes')
+    for p in profiles.values():
+        digits = max(p.digits, key=p.digits.__getitem__, default=None)
+        shapes = ', '.join(f'{shape} ({100 * n / p.floats:.3g}%)'
+                           for shape, n in p.slow_shapes.most_common(args.top))
+        print(f'{p.name:<16} {p.floats:>10} {100 * p.fast_fraction:>9.4g}% '
+              f'{"-" if digits is None else digits:>7}  {shapes}')
+    print(f'C reader, all floats incl. comment lines: '
+          f'{totals["floats_fast"]} fast path, {totals["floats_strtod"]} strtod')
+
+    advice = [a for a in (p.recommendation() for p in profiles.values()) if a]
+    for a in advice or ['every float column takes the fast path']:
+        print(f'* {a}')
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['profile']:
+        return _profile_main(argv[1:])
     parser = argparse.ArgumentParser(description='extxyz parser CLI (no ASE).')
     parser.add_argument('file')
     parser.add_argument('-v', '--verbose', action='count', default=0)
@@ -41,7 +83,7 @@ def main():
     parser.add_argument('-C', '--cextxyz', action='store_true',
                         help='use the C parser (default: pure-Python)')
     parser.add_argument('--comment', action='store', default=None)
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     if args.round_trip:
         args.write = True
 
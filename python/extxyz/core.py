@@ -3,18 +3,32 @@
 Public surface:
 
 * :class:`Frame` — a dataclass holding one parsed frame.
+* :class:`LazyFrame` — a :class:`Frame` whose columns are parsed on access.
 * :func:`iread_dicts` — yields :class:`Frame` instances.
 * :func:`read_dicts` — eager wrapper around :func:`iread_dicts`.
+* :func:`read_last` — reads the last frames of a file, scanning backwards.
 * :func:`write_dicts` — writes a list/iterator of :class:`Frame` instances.
+* :class:`Writer` — keeps one file open for writing many frames.
+* :func:`write_batch` — writes frames held as concatenated columns.
+* :class:`CommentCache` — LRU cache of parsed comment lines for reading.
 
 The :mod:`ase_extxyz.io` plugin module wraps these to translate
 :class:`Frame` ↔ :class:`ase.Atoms`.
 """
 from __future__ import annotations
 
+import copy
+import ctypes
+import os
+import queue
 import re
+import select
 import sys
+import threading
+import time
+from collections.abc import MutableMapping
 from dataclasses import dataclass, field
+from functools import lru_cache, partial
 from io import StringIO
 from itertools import count, islice
 from pathlib import Path
@@ -24,7 +38,7 @@ from typing import Any, Iterable, Iterator
 import numpy as np
 
 from . import cextxyz
-from .grammar import (Properties, escape, extxyz_value_to_string, grammar,
+from .grammar import (Properties, escape, extxyz_value_to_string, get_grammar,
                       result_to_dict)
 
 
@@ -73,7 +87,7 @@ def extract_lattice(result_dict):
 
 def read_comment_line(line, verbose=0):
     """Parse an extxyz comment line into a dict using pyleri."""
-    result = grammar.parse(line)
+    result = get_grammar().parse(line)
     parsed_part = result.tree.children[0].string
     if not result.is_valid:
         raise SyntaxError(f"Failed to parse entire input line, only '{parsed_part}'. "
@@ -81,11 +95,219 @@ def read_comment_line(line, verbose=0):
     return result_to_dict(result, verbose=verbose)
 
 
-def _read_frame_pure_python(file, verbose=0, use_regex=False):
+# spellings of the per-atom logical columns (BOOL_RE), as the C reader maps them
+_TRUE_STRINGS = np.array(['T', 'true', 'True', 'TRUE'])
+_FALSE_STRINGS = np.array(['F', 'false', 'False', 'FALSE'])
+
+
+def _fortran_float(token):
+    return float(token.replace('d', 'e').replace('D', 'e'))
+
+
+# what the C reader takes as a per-atom float: no inf, nan or infinity, which
+# np.loadtxt would accept
+_C_FLOAT_FIELD = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eEdD][+-]?\d+)?')
+
+
+def _read_atom_block(lines, natoms, properties):
+    """Parse the atom lines of one frame into a ``properties.dtype_vector`` array.
+
+    The block goes through ``np.loadtxt``'s C tokenizer in one call, using the
+    column layout from ``Properties``. Logical columns are read as short strings
+    and mapped to bool afterwards. If loadtxt rejects the block it is retried
+    with per-column converters for Fortran ``1.0d0`` floats, and anything else
+    (e.g. a wrong number of fields) is left to ``np.genfromtxt`` as before.
+    """
+    dtype = properties.dtype_vector
+    logical = [name for name in dtype.names if dtype[name].base == bool]
+    raw_dtype = np.dtype([(name, 'U6' if name in logical else dtype[name].base,
+                           dtype[name].shape) for name in dtype.names])
+    if natoms == 0:
+        return np.empty(0, dtype)
+    kw = dict(comments=None, max_rows=natoms, ndmin=1)
+    try:
+        raw = np.loadtxt(lines, raw_dtype, **kw)
+    except ValueError:
+        float_cols = []
+        col = 0
+        for _, ptype, ncols in properties.properties:
+            if ptype == 'R':
+                float_cols.extend(range(col, col + ncols))
+            col += ncols
+        try:
+            raw = np.loadtxt(lines, raw_dtype, converters=dict.fromkeys(
+                float_cols, _fortran_float), **kw)
+        except ValueError:
+            raw = np.atleast_1d(np.genfromtxt(lines, raw_dtype, max_rows=natoms))
+    if not logical:
+        return raw
+    data = np.empty(natoms, dtype)
+    for name in dtype.names:
+        if name in logical:
+            is_true = np.isin(raw[name], _TRUE_STRINGS)
+            if not (is_true | np.isin(raw[name], _FALSE_STRINGS)).all():
+                raise ValueError(f'invalid value for logical property {name!r}')
+            data[name] = is_true
+        else:
+            data[name] = raw[name]
+    return data
+
+
+def _read_atom_column(lines, natoms, properties, name, c_types=False):
+    """Parse the property ``name`` from the atom lines of one frame.
+
+    Only that property's fields are converted (``np.loadtxt`` with
+    ``usecols``). The result has the dtype and shape the frame reader would
+    give it: with ``c_types`` those of the C reader (C ``int``, strings as
+    wide as its NUL-padded 8-byte cells), otherwise those of the pure-Python
+    reader. With ``c_types`` float fields are also held to the C reader's
+    rules, so ``inf`` or ``nan`` is rejected as it is there.
+    """
+    col = 0
+    for pname, ptype, ncols in properties.properties:
+        if pname == name:
+            break
+        col += ncols
+    else:
+        raise KeyError(name)
+    dtype = {'R': float, 'I': np.int32 if c_types else int,
+             'S': str, 'L': 'U6'}[ptype]
+    if natoms == 0:
+        raw = np.empty((0, ncols), dtype)
+    else:
+        kw = dict(usecols=range(col, col + ncols), comments=None,
+                  max_rows=natoms, ndmin=2)
+        try:
+            raw = np.loadtxt(lines, dtype, **kw)
+        except ValueError:
+            if ptype != 'R':
+                raise
+            raw = np.loadtxt(lines, dtype, converters=dict.fromkeys(
+                kw['usecols'], _fortran_float), **kw)
+        if c_types and ptype == 'R' and not np.isfinite(raw).all():
+            # non-finite values are also what large exponents overflow to,
+            # so only the tokens themselves tell if the C reader takes them
+            tokens = np.loadtxt(lines, str, **kw)
+            for token in tokens[~np.isfinite(raw)]:
+                if not _C_FLOAT_FIELD.fullmatch(token):
+                    raise ValueError(f'invalid field {token!r} for property '
+                                     f'{name!r}')
+    if ptype == 'L':
+        is_true = np.isin(raw, _TRUE_STRINGS)
+        if not (is_true | np.isin(raw, _FALSE_STRINGS)).all():
+            raise ValueError(f'invalid value for logical property {name!r}')
+        raw = is_true
+    elif ptype == 'S':
+        if c_types:
+            nbytes = max((len(s.encode()) for s in raw.flat), default=0)
+            raw = raw.astype(f'U{max(8, (nbytes + 1 + 7) & ~7)}')
+        else:
+            raw = raw.astype(Properties.per_atom_dtype['S'])
+    return raw[:, 0] if ncols == 1 else raw
+
+
+class LazyArrays(MutableMapping):
+    """The ``arrays`` of a :class:`LazyFrame`: per-atom columns parsed from
+    the frame's atom lines on first access, then cached one by one.
+
+    Keys (in ``Properties`` order) are known without parsing anything. The
+    atom lines are held as a list of lines, or as a ``(path, start, end)``
+    byte range of the file that is only read when a column is first needed.
+    """
+
+    def __init__(self, block, natoms, properties, c_types=False):
+        self._block = block
+        self._natoms = natoms
+        self._properties = properties
+        self._c_types = c_types
+        self._names = [name for name, _, _ in properties.properties]
+        self._cache = {}
+
+    @property
+    def properties(self):
+        """The frame's :class:`Properties` (the column layout of the atom
+        lines)."""
+        return self._properties
+
+    def lines(self):
+        """The frame's atom lines, unparsed (read from the file if needed)."""
+        if isinstance(self._block, tuple):
+            path, start, end = self._block
+            with open(path, 'rb') as fh:
+                fh.seek(start)
+                text = fh.read(end - start).decode('utf-8')
+            # skip the natoms and comment lines
+            parts = text.split('\n', 2)
+            self._block = (parts[2].split('\n')[:self._natoms]
+                           if len(parts) == 3 else [])
+        return self._block
+
+    def __getitem__(self, name):
+        try:
+            return self._cache[name]
+        except KeyError:
+            if name not in self._names:
+                raise
+        value = _read_atom_column(self.lines(), self._natoms,
+                                  self._properties, name, self._c_types)
+        self._cache[name] = value
+        return value
+
+    def __setitem__(self, name, value):
+        if name not in self._names:
+            self._names.append(name)
+        self._cache[name] = value
+
+    def __delitem__(self, name):
+        self._names.remove(name)
+        self._cache.pop(name, None)
+
+    def __iter__(self):
+        return iter(list(self._names))
+
+    def __len__(self):
+        return len(self._names)
+
+    @property
+    def loaded(self):
+        """Names of the columns parsed (or set) so far."""
+        return [name for name in self._names if name in self._cache]
+
+    def __repr__(self):
+        return (f'{type(self).__name__}({self._names!r}, '
+                f'loaded={self.loaded!r})')
+
+    def __deepcopy__(self, memo):
+        return {name: copy.deepcopy(self[name], memo) for name in self}
+
+
+@dataclass
+class LazyFrame(Frame):
+    """A :class:`Frame` read with ``iread_dicts(lazy=True)``.
+
+    ``natoms``, ``cell``, ``pbc`` and ``info`` are filled in as usual, but
+    ``arrays`` is a :class:`LazyArrays` mapping: a column is only parsed from
+    the frame's atom lines when it is first looked up, e.g.
+    ``frame.arrays['forces']``. Frames rejected on ``info`` or ``natoms``
+    alone never have their atom lines parsed. A malformed atom line is only
+    reported when a column that reads it is accessed.
+    """
+
+    def materialize(self) -> Frame:
+        """A plain :class:`Frame` with every column parsed."""
+        return Frame(natoms=self.natoms, cell=self.cell, pbc=self.pbc,
+                     info=self.info, arrays=dict(self.arrays))
+
+
+def _read_frame_pure_python(file, verbose=0, use_regex=False,
+                            complete_lines=False, parse_atoms=True):
     """Read one extxyz frame from ``file`` using the pure-Python path.
 
-    Returns ``(natoms, info_dict, structured_data, properties)``.
-    Raises ``EOFError`` past the last frame.
+    Returns ``(natoms, info_dict, structured_data, properties)``, or with
+    ``parse_atoms=False`` the list of atom lines in place of the data.
+    Raises ``EOFError`` past the last frame, and ``ExtXYZError`` ("Truncated
+    frame: ...") for a frame cut short by the end of the file -- including,
+    with ``complete_lines``, a last line without its newline.
     """
     file = iter(file)
     try:
@@ -96,7 +318,11 @@ def _read_frame_pure_python(file, verbose=0, use_regex=False):
         raise EOFError()
 
     natoms = int(line)
-    comment = next(file)
+    if complete_lines and not line.endswith('\n'):
+        raise cextxyz.ExtXYZError('Truncated frame: incomplete natoms line')
+    comment = next(file, None)
+    if comment is None or (complete_lines and not comment.endswith('\n')):
+        raise cextxyz.ExtXYZError('Truncated frame: end of file in comment line')
     info = read_comment_line(comment, verbose)
     if len(info) == 0:
         info['comment'] = comment.strip()
@@ -107,51 +333,98 @@ def _read_frame_pure_python(file, verbose=0, use_regex=False):
     properties = info.pop('properties', 'species:S:1:pos:R:3')
     properties = Properties(property_string=properties)
 
+    lines = list(islice(file, natoms))
+    if len(lines) < natoms or \
+       (complete_lines and lines and not lines[-1].endswith('\n')):
+        raise cextxyz.ExtXYZError('Truncated frame: end of file after '
+                                  f'{len(lines)} of {natoms} atom lines')
+    if not parse_atoms:
+        return natoms, info, lines, properties
     if use_regex:
-        lines = [next(file) for _ in range(natoms)]
         buffer = StringIO(''.join(lines))
         data = np.fromregex(buffer, properties.regex, properties.dtype_scalar)
     else:
-        data = np.genfromtxt(file, properties.dtype_vector, max_rows=natoms)
+        try:
+            data = _read_atom_block(lines, natoms, properties)
+        except ValueError:
+            if natoms and not lines[-1].endswith('\n'):
+                raise cextxyz.ExtXYZError(
+                    'Truncated frame: end of file in atom line '
+                    f'{natoms - 1} of {natoms}') from None
+            raise
 
     return natoms, info, data, properties
 
 
 def _read_frame_dict(file, *, use_cextxyz=True, use_regex=False, use_cleri=True,
-                    verbose=0, comment=None) -> Frame | None:
-    """Read one frame and return a :class:`Frame`, or ``None`` past EOF."""
+                    verbose=0, comment=None, on_truncated='raise', state=None,
+                    lazy=False, path=None) -> Frame | None:
+    """Read one frame and return a :class:`Frame`, or ``None`` past EOF.
+
+    With ``on_truncated='drop'`` a frame cut short by the end of the file also
+    returns ``None``; for the C backend the file is left positioned at the
+    start of that frame.
+
+    With ``lazy`` the atom lines are skipped and a :class:`LazyFrame` is
+    returned; the C backend then needs the ``path`` of the open file, to read
+    the frame's bytes back when a column is accessed.
+    """
+    complete_lines = on_truncated == 'drop'
     try:
         if use_cextxyz:
+            fpos = cextxyz.cftell(file)
             try:
-                fpos = cextxyz.cftell(file)
-                natoms, info, arrays = cextxyz.read_frame_dicts(
-                    file, verbose=verbose, comment=comment, use_regex=use_regex,
-                    use_cleri=use_cleri)
+                try:
+                    natoms, info, arrays = cextxyz.read_frame_dicts(
+                        file, verbose=verbose, comment=comment,
+                        use_regex=use_regex, use_cleri=use_cleri,
+                        complete_lines=complete_lines, state=state,
+                        skip_atoms=lazy)
+                except cextxyz.ExtXYZError as msg:
+                    error_message, = msg.args
+                    if error_message.startswith('Failed to parse string'):
+                        cextxyz.cfseek(file, fpos, 0)
+                        natoms, info, arrays = cextxyz.read_frame_dicts(
+                            file, verbose=verbose,
+                            comment="Properties=species:S:1:pos:R:3",
+                            use_regex=use_regex, use_cleri=use_cleri,
+                            complete_lines=complete_lines, state=state,
+                            skip_atoms=lazy)
+                    else:
+                        raise
             except cextxyz.ExtXYZError as msg:
-                error_message, = msg.args
-                if error_message.startswith('Failed to parse string'):
+                if complete_lines and str(msg).startswith('Truncated frame'):
                     cextxyz.cfseek(file, fpos, 0)
-                    natoms, info, arrays = cextxyz.read_frame_dicts(
-                        file, verbose=verbose,
-                        comment="Properties=species:S:1:pos:R:3",
-                        use_regex=use_regex, use_cleri=use_cleri)
-                else:
-                    raise
-            info.pop('Properties', None)
+                    return None
+                raise
+            properties = info.pop('Properties', 'species:S:1:pos:R:3')
             # ``read_frame_dicts`` already freed the C buffers, so ``arrays``
             # are independently-owned numpy arrays in the correct per-column
             # shapes — use them directly. (Previously these were copied into a
             # structured array and copied back out again: two redundant copies
             # per column. The pure-Python path below still needs the structured
-            # ``data`` array produced by np.fromregex/genfromtxt.)
+            # ``data`` array produced by np.fromregex/_read_atom_block.)
             arrays_out = arrays
+            if lazy:
+                arrays_out = LazyArrays((path, fpos, cextxyz.cftell(file)),
+                                        natoms, Properties(properties),
+                                        c_types=True)
         else:
-            natoms, info, data, properties = _read_frame_pure_python(
-                file, verbose=verbose, use_regex=use_regex)
-            # the setter re-views the scalar columns as dtype_vector
-            properties.data = data
-            arrays_out = {name: properties.data[name].copy()
-                          for name in properties.dtype_vector.names}
+            try:
+                natoms, info, data, properties = _read_frame_pure_python(
+                    file, verbose=verbose, use_regex=use_regex,
+                    complete_lines=complete_lines, parse_atoms=not lazy)
+            except cextxyz.ExtXYZError as msg:
+                if complete_lines and str(msg).startswith('Truncated frame'):
+                    return None
+                raise
+            if lazy:
+                arrays_out = LazyArrays(data, natoms, properties)
+            else:
+                # the setter re-views the scalar columns as dtype_vector
+                properties.data = data
+                arrays_out = {name: properties.data[name].copy()
+                              for name in properties.dtype_vector.names}
     except EOFError:
         return None
 
@@ -159,51 +432,373 @@ def _read_frame_dict(file, *, use_cextxyz=True, use_regex=False, use_cleri=True,
     pbc = np.asarray(info.pop('pbc', [True, True, True]), dtype=bool)
     cell = lattice if lattice is not None else np.zeros((3, 3))
 
-    return Frame(natoms=natoms, cell=cell, pbc=pbc, info=info, arrays=arrays_out)
+    frame_type = LazyFrame if lazy else Frame
+    return frame_type(natoms=natoms, cell=cell, pbc=pbc, info=info,
+                      arrays=arrays_out)
+
+
+class CommentCache:
+    """LRU cache of parsed comment lines, for ``iread_dicts(comment_cache=...)``.
+
+    In many trajectories (fixed-cell MD, relaxations) consecutive comment
+    lines are byte-identical. With a cache the C reader keys each comment
+    line by its exact text and, on a hit, copies the previously parsed info
+    dict instead of parsing the line again. Up to ``maxsize`` distinct lines
+    are kept. ``hits`` and ``misses`` count lookups.
+
+    The cache lives in the C-API reader; without it (a numpy-less build, or
+    ``EXTXYZ_LEGACY_MARSHAL``) reading works as usual and the counters stay
+    at zero. A cache can be reused across files but only by one reader at a
+    time.
+    """
+
+    def __init__(self, maxsize=64):
+        if maxsize < 1:
+            raise ValueError(f'maxsize must be >= 1, not {maxsize!r}')
+        self.maxsize = maxsize
+        self._state = None
+        if cextxyz._HAVE_C_READ_STATE:
+            self._state = cextxyz._ext_mod.ReadState(maxsize)
+
+    @property
+    def hits(self):
+        return self._state.cache_hits if self._state is not None else 0
+
+    @property
+    def misses(self):
+        return self._state.cache_misses if self._state is not None else 0
+
+    @property
+    def currsize(self):
+        return self._state.cache_len if self._state is not None else 0
+
+    def clear(self):
+        """Empty the cache and reset the counters."""
+        if self._state is not None:
+            self._state.clear()
+
+    def __repr__(self):
+        return (f'CommentCache(maxsize={self.maxsize}, hits={self.hits}, '
+                f'misses={self.misses}, currsize={self.currsize})')
+
+
+# inotify(7) event mask bits
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+
+
+class _GrowthWatcher:
+    """Wait for the file at ``path`` to change size.
+
+    Uses inotify (via libc) on Linux so a waiting reader wakes as soon as the
+    writer appends; elsewhere, or if inotify is unavailable, it re-checks the
+    size every ``poll`` seconds. ``path=None`` (an already-open handle) just
+    sleeps ``poll`` seconds per call.
+    """
+
+    def __init__(self, path, poll):
+        self.path = path
+        self.poll = poll
+        self._fd = -1
+        if path is None or not sys.platform.startswith('linux'):
+            return
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+        if libc.inotify_add_watch(fd, os.fsencode(path),
+                                  _IN_MODIFY | _IN_CLOSE_WRITE) < 0:
+            os.close(fd)
+            return
+        self._fd = fd
+
+    def size(self):
+        if self.path is None:
+            return None
+        try:
+            return os.stat(self.path).st_size
+        except OSError:
+            return None
+
+    def wait(self, size):
+        """Return once the file size differs from ``size``."""
+        while True:
+            if self._fd < 0:
+                time.sleep(self.poll)
+            elif select.select([self._fd], [], [], self.poll)[0]:
+                try:
+                    while os.read(self._fd, 4096):
+                        pass
+                except BlockingIOError:
+                    pass
+            if size is None or self.size() != size:
+                return
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def _prefetch(frames, depth):
+    """Run the ``frames`` iterator on a background thread, ``depth`` ahead.
+
+    Items (or the exception that ended the iteration) are passed back through
+    a bounded queue. Closing the returned generator early stops the thread,
+    which closes ``frames`` after its current read.
+    """
+    results = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def worker():
+        try:
+            for frame in frames:
+                results.put((True, frame))
+                if stop.is_set():
+                    break
+            else:
+                results.put((False, None))
+        except BaseException as exc:
+            results.put((False, exc))
+        finally:
+            frames.close()
+
+    thread = threading.Thread(target=worker, name='extxyz-prefetch',
+                              daemon=True)
+    thread.start()
+    try:
+        while True:
+            ok, item = results.get()
+            if ok:
+                yield item
+            elif item is None:
+                return
+            else:
+                raise item
+    finally:
+        stop.set()
+        # make room for a worker blocked on a full queue; it then sees
+        # ``stop`` and exits (a follow=True reader once the file next grows)
+        try:
+            while True:
+                results.get_nowait()
+        except queue.Empty:
+            pass
+
+
+def _cfopen_read(path):
+    fp = cextxyz.cfopen(path, 'r')
+    if not fp:
+        raise FileNotFoundError(f'cannot open {path!r} for reading')
+    return fp
+
+
+@lru_cache(maxsize=16)
+def _scan_file(path, complete_lines, stat_key):
+    fp = _cfopen_read(path)
+    try:
+        offsets, end = cextxyz.scan_frames(fp, complete_lines=complete_lines)
+    finally:
+        cextxyz.cfclose(fp)
+    offsets = np.append(offsets, end)
+    offsets.flags.writeable = False
+    return offsets
+
+
+def _frame_offsets(path, complete_lines, max_frames=None):
+    """Byte offsets of the first ``max_frames`` (default: all) complete frames
+    of the file at ``path``, then the offset just past the last of them.
+
+    Whole-file scans are cached, keyed by the file's inode, size and
+    modification time.
+    """
+    if max_frames is None:
+        st = os.stat(path)
+        return _scan_file(path, complete_lines,
+                          (st.st_ino, st.st_size, st.st_mtime_ns))
+    fp = _cfopen_read(path)
+    try:
+        offsets, end = cextxyz.scan_frames(fp, max_frames=max_frames,
+                                           complete_lines=complete_lines)
+    finally:
+        cextxyz.cfclose(fp)
+    return np.append(offsets, end)
 
 
 def iread_dicts(file, index=None, *,
                 use_cextxyz=True, use_regex=False, use_cleri=True, verbose=0,
-                comment=None
-                ) -> Iterator[Frame]:
+                comment=None, on_truncated='raise', follow=False, poll=0.5,
+                prefetch=0, comment_cache=None, lazy=False) -> Iterator[Frame]:
     """Yield :class:`Frame` instances from ``file`` lazily.
 
     ``file`` may be a path (``str`` / ``Path``) or, for the pure-Python
     backend, an open text-mode file object.
 
     ``index`` accepts an int, a ``slice``, ``None`` (== all), or ``':'``.
-    Negative indices are not supported.
+    Negative indices and steps need ``file`` to be a path. For a path, the
+    frame boundaries are found by a line-counting scan of the file
+    (:func:`cextxyz.scan_frames`) and only the selected frames are parsed,
+    each after a seek to its start -- also for forward slices with a start or
+    a step. The offsets of a whole-file scan are reused while the file's
+    size and modification time are unchanged.
+
+    A last frame cut short by the end of the file -- a writer killed mid-frame,
+    or a file still being written -- raises ``ExtXYZError`` ("Truncated
+    frame: ...") by default. With ``on_truncated='drop'`` iteration stops
+    cleanly before it instead, after the last complete frame; a last line
+    without its newline then also counts as incomplete.
+
+    With ``follow=True`` (C backend only) the iterator does not stop at the
+    end of the file: like ``tail -f`` it keeps the file open at the last
+    complete frame boundary and yields each new frame once it has been fully
+    appended, waiting on inotify where available and otherwise re-checking
+    every ``poll`` seconds. Partially written frames are never consumed
+    (``on_truncated='drop'`` is implied), so each wake-up only parses the data
+    appended since. Iteration ends when ``index`` is exhausted or the caller
+    stops, e.g. by breaking out of the loop.
+
+    ``prefetch=N`` reads and parses up to ``N`` frames ahead on a background
+    thread. The C parser releases the GIL, so parsing overlaps with whatever
+    the consumer does with each frame. Do not touch an open ``file`` passed
+    in while iterating with ``prefetch``.
+
+    ``comment_cache`` (C backend) reuses the parsed info of comment lines
+    that repeat exactly, as in fixed-cell trajectories whose comment lines
+    differ only now and then: pass the cache size, or a :class:`CommentCache`
+    to also read its hit/miss counters afterwards.
+
+    ``lazy=True`` yields :class:`LazyFrame` instances: the atom lines are
+    skipped when the frame is read and each column is only parsed when it is
+    first accessed, which pays off when most frames are rejected on their
+    ``info`` or ``natoms``. With the C backend the columns are read back from
+    the file by byte range, so ``file`` must be a path, and the file must not
+    change while frames are in use.
     """
+    if isinstance(comment_cache, int) and not isinstance(comment_cache, bool):
+        comment_cache = CommentCache(comment_cache)
+    elif comment_cache is not None and not isinstance(comment_cache,
+                                                      CommentCache):
+        raise TypeError('comment_cache must be an int, a CommentCache or '
+                        f'None, not {type(comment_cache).__name__}')
+    if prefetch:
+        if prefetch < 0:
+            raise ValueError(f'prefetch must be >= 0, not {prefetch!r}')
+        yield from _prefetch(
+            iread_dicts(file, index, use_cextxyz=use_cextxyz,
+                        use_regex=use_regex, use_cleri=use_cleri,
+                        verbose=verbose, comment=comment,
+                        on_truncated=on_truncated, follow=follow, poll=poll,
+                        comment_cache=comment_cache, lazy=lazy),
+            prefetch)
+        return
+    if on_truncated not in ('raise', 'drop'):
+        raise ValueError("on_truncated must be 'raise' or 'drop', "
+                         f"not {on_truncated!r}")
+    if follow:
+        if not use_cextxyz:
+            raise ValueError('follow=True requires use_cextxyz=True')
+        if poll <= 0:
+            raise ValueError(f'poll must be positive, not {poll!r}')
+        on_truncated = 'drop'
+    # reader state for this file: the comment-line cache, if any, and the
+    # column plan reused while the Properties string is unchanged
+    state = None
+    if comment_cache is not None:
+        state = comment_cache._state
+    elif use_cextxyz and cextxyz._HAVE_C_READ_STATE:
+        state = cextxyz._ext_mod.ReadState()
+    watcher = None
+    if follow:
+        watcher = _GrowthWatcher(
+            str(file) if isinstance(file, (str, Path)) else None, poll)
     own_fh = False
+    path = None
+    filename = None
     if isinstance(file, (str, Path)):
         if use_cextxyz:
-            file = cextxyz.cfopen(str(file), 'r')
+            path = filename = str(file)
+            file = cextxyz.cfopen(path, 'r')
             own_fh = True
         else:
             if file == '-':
                 file = sys.stdin
             else:
+                filename = str(file)
                 file = open(file, 'r')
                 own_fh = True
     elif index is not None:
         raise ValueError('`index` argument cannot be used with open files')
+    if lazy and use_cextxyz and path is None:
+        # the columns are read back by byte range, which needs the path
+        raise ValueError('lazy=True with the C backend needs a file path, '
+                         'not an open file')
 
     if index is None or index == ':':
         index = slice(None, None, None)
     if not isinstance(index, (slice, str)):
         index = slice(index, (index + 1) or None)
-    if (index.start is not None and index.start < 0) or \
-       (index.stop is not None and index.stop < 0):
-        raise ValueError("Negative indices not (yet) supported in iread_dicts()")
+    start, stop, step = index.start or 0, index.stop, index.step or 1
+    from_end = start < 0 or (stop is not None and stop < 0) or step < 0
+    if from_end and (filename is None or follow):
+        raise ValueError("Negative indices and steps need a file path, "
+                         "and can't be used with follow=True")
+    # Frame offsets (see _frame_offsets) to seek to the selected frames with,
+    # rather than parsing every frame before them
+    offsets = None
+    if filename is not None and not follow and (from_end or start > 0 or
+                                                step > 1):
+        if from_end or (step > 1 and stop is None):
+            max_frames = None
+        elif step == 1:
+            max_frames = start      # then read on from there
+        else:
+            max_frames = stop
+        offsets = _frame_offsets(filename, on_truncated == 'drop', max_frames)
+
+    def seek(offset):
+        if use_cextxyz:
+            cextxyz.cfseek(file, int(offset), 0)
+        else:
+            file.seek(int(offset))
+
+    def read_frame():
+        return _read_frame_dict(file, use_cextxyz=use_cextxyz,
+                                use_regex=use_regex, use_cleri=use_cleri,
+                                verbose=verbose, comment=comment,
+                                on_truncated=on_truncated, state=state,
+                                lazy=lazy, path=path)
 
     current_frame = 0
-    frame_indices = islice(count(0), index.start, index.stop, index.step)
+    frame_indices = islice(count(0), index.start, index.stop, index.step) \
+        if not from_end else None
     try:
+        if from_end:
+            # The frames are counted from the end of the file, so whatever
+            # follows the last complete one is read first: a truncated frame
+            # raises here as it would at the end of a forward read.
+            nframes = len(offsets) - 1
+            seek(offsets[nframes])
+            read_frame()
+            current_frame = None
+            frame_indices = iter(range(nframes)[index])
         for frame_idx in frame_indices:
+            if offsets is not None and frame_idx != current_frame:
+                current_frame = min(frame_idx, len(offsets) - 1)
+                seek(offsets[current_frame])
             while current_frame <= frame_idx:
-                f = _read_frame_dict(file, use_cextxyz=use_cextxyz,
-                                     use_regex=use_regex, use_cleri=use_cleri,
-                                     verbose=verbose, comment=comment)
+                if watcher is not None:
+                    fpos = cextxyz.cftell(file)
+                    size = watcher.size()
+                f = read_frame()
+                if f is None and watcher is not None:
+                    # back to the frame boundary (this also clears the
+                    # stream's EOF flag) and wait for the writer
+                    cextxyz.cfseek(file, fpos, 0)
+                    watcher.wait(size)
+                    continue
                 current_frame += 1
                 if f is None:
                     break
@@ -211,6 +806,8 @@ def iread_dicts(file, index=None, *,
                 break
             yield f
     finally:
+        if watcher is not None:
+            watcher.close()
         if own_fh:
             if use_cextxyz:
                 cextxyz.cfclose(file)
@@ -228,6 +825,145 @@ def read_dicts(file, **kwargs):
     return frames
 
 
+# A line that is nothing but a non-negative int: what a natoms line looks like
+_NATOMS_LINE = re.compile(rb'[ \t]*\+?[0-9]+[ \t\r]*')
+
+
+def _natoms_line_before(buf, end, at_file_start, tail):
+    """Search ``buf[:end]`` backwards for the natoms line of the frame that
+    ends at ``end`` (just after a newline).
+
+    That is the nearest natoms-like line whose value is the number of lines
+    after it, less the comment line. With ``tail`` a natoms-like line with
+    too few lines after it may start a truncated frame, and is returned with
+    ``complete`` false. Returns
+    ``(start, natoms, nlines, complete)``, or ``None`` if ``buf`` doesn't
+    reach back far enough.
+    """
+    nlines = 0                  # lines between this one and end
+    line_end = end - 1          # the newline ending the line
+    while line_end >= 0:
+        start = buf.rfind(b'\n', 0, line_end) + 1
+        if start == 0 and not at_file_start:
+            return None         # may be the end of a longer line
+        if _NATOMS_LINE.fullmatch(buf, start, line_end):
+            natoms = int(buf[start:line_end])
+            if nlines == natoms + 1 or (tail and nlines < natoms + 1):
+                return start, natoms, nlines, nlines == natoms + 1
+        nlines += 1
+        line_end = start - 1
+    return None
+
+
+def _find_last_frames(fh, n, complete_lines, block=1 << 16):
+    """Byte offsets of the starts of the last ``n`` complete frames of the
+    binary file ``fh`` (fewer if it has fewer), found by reading blocks
+    backwards from the end of the file and matching natoms lines to the
+    number of lines that follow them, and the offset where the last of these
+    frames ends.
+
+    Returns ``(offsets, stop)``, or ``None`` if the lines don't fit together
+    as frames, for the caller to fall back to a forward scan. That includes a
+    last frame that looks truncated: its natoms line may just be an integer
+    comment or atom line, so only the forward scan can tell a real
+    truncation.
+    """
+    size = fh.seek(0, os.SEEK_END)
+    base, buf = size, b''
+    while base > 0 and not buf.strip():
+        step = min(base, block)
+        fh.seek(base - step)
+        buf = fh.read(step) + buf
+        base -= step
+    # trailing blank lines end the file, as for the pure-Python reader
+    stripped = len(buf.rstrip())
+    newline = buf.find(b'\n', stripped)
+    partial_last = stripped > 0 and newline < 0
+    if partial_last:
+        buf += b'\n'           # (a last line without its newline)
+        newline = len(buf) - 1
+    end = newline + 1 if stripped else 0
+
+    offsets, stop = [], None
+    tail = True                 # looking for the last frame
+    while len(offsets) < n:
+        found = _natoms_line_before(buf, end, base == 0, tail)
+        if found is None:
+            if base == 0:
+                # the start of the file: fewer than n frames, unless what is
+                # left isn't a frame at all
+                if buf[:end].strip():
+                    return None
+                return offsets, stop
+            step = min(base, max(block, size - base))
+            fh.seek(base - step)
+            buf = fh.read(step) + buf
+            end += step
+            base -= step
+            continue
+        start, _, _, complete = found
+        if tail and not complete:
+            return None
+        if not (tail and partial_last and complete_lines):
+            offsets.insert(0, base + start)
+            if stop is None:
+                # (a partial last line has no newline of its own)
+                stop = min(base + end, size)
+        end = start
+        tail = False
+    return offsets, stop
+
+
+def read_last(path, n=1, *, use_regex=False, use_cleri=True, verbose=0,
+              on_truncated='raise') -> list[Frame]:
+    """Read the last ``n`` frames of the file at ``path``, in file order.
+
+    Returns a list of (at most ``n``) :class:`Frame` instances. The frames
+    are found by reading the file backwards from the end (see
+    :func:`_find_last_frames`), and only they are parsed, with the C reader,
+    so the cost does not depend on the length of the trajectory -- e.g. to
+    restart from the final frame of a long run. If the end of the file looks
+    truncated, the file is read forwards instead, as by :func:`iread_dicts`:
+    a truncated last frame then raises ``ExtXYZError``, or is skipped with
+    ``on_truncated='drop'``.
+    """
+    if n < 1:
+        raise ValueError(f'n must be at least 1, not {n!r}')
+    if on_truncated not in ('raise', 'drop'):
+        raise ValueError("on_truncated must be 'raise' or 'drop', "
+                         f"not {on_truncated!r}")
+    path = str(path)
+    with open(path, 'rb') as fh:
+        # one frame more than needed: its natoms line must fit as well, which
+        # catches a natoms-like comment line in the first frame wanted
+        found = _find_last_frames(fh, n + 1, on_truncated == 'drop')
+    kwargs = dict(use_regex=use_regex, use_cleri=use_cleri, verbose=verbose,
+                  on_truncated=on_truncated)
+    if found is not None:
+        offsets, stop = found
+        offsets = offsets[-n:]
+        frames = []
+        fp = _cfopen_read(path)
+        try:
+            for offset, next_offset in zip(offsets, offsets[1:] + [stop]):
+                cextxyz.cfseek(fp, offset, 0)
+                try:
+                    frame = _read_frame_dict(fp, **kwargs)
+                except cextxyz.ExtXYZError:
+                    frame = None
+                # the frame read must end where the next one starts, and the
+                # last one where the scan found the end of the data
+                if frame is None or cextxyz.cftell(fp) != next_offset:
+                    break
+                frames.append(frame)
+            else:
+                return frames
+        finally:
+            cextxyz.cfclose(fp)
+    # the backward scan was confused, e.g. by natoms-like comment lines
+    return list(iread_dicts(path, slice(-n, None), **kwargs))
+
+
 # ----------------------------------------------------------------------------
 # Write path
 # ----------------------------------------------------------------------------
@@ -280,29 +1016,284 @@ def _write_frame_python(file, frame: Frame, *, columns=None,
     np.savetxt(file, props.data_columns, fmt=props.format_strings)
 
 
-def _write_frame_cextxyz(c_file, frame: Frame, *, columns=None,
-                         format_dict=None, verbose=0):
-    """Write one Frame using the C writer."""
+def _cextxyz_frame_args(frame: Frame, columns=None):
+    """``(natoms, info, arrays, columns)`` for the C writer.
+
+    Adds ``Lattice``/``pbc`` to the info and, unless ``columns`` is given,
+    orders the columns species, pos, then the rest. Raises ``ValueError`` if
+    a column does not have ``natoms`` rows.
+    """
     info = dict(frame.info)
     info['Lattice'] = frame.cell.T  # match the column-major layout of comment-line Lattice="..."
     info['pbc'] = frame.pbc
 
+    arrays = frame.arrays
+    if not isinstance(arrays, dict):
+        # the C writer takes a dict: parse any columns of a LazyFrame not
+        # accessed yet
+        arrays = dict(arrays)
     if columns is None:
-        columns = list(frame.arrays.keys())
-        for special in ('pos', 'species'):
-            if special in columns:
-                columns.remove(special)
-        if 'species' in frame.arrays:
-            columns.insert(0, 'species')
-        if 'pos' in frame.arrays:
-            insert_at = 1 if 'species' in frame.arrays else 0
-            columns.insert(insert_at, 'pos')
+        columns = _default_columns(arrays)
+    # the C writer takes natoms rows of every column on trust
+    for c in columns:
+        nrows = len(arrays[c])
+        if nrows != frame.natoms:
+            raise ValueError(f"column {c!r} has {nrows} rows, "
+                             f"expected {frame.natoms}")
+    return frame.natoms, info, arrays, columns
+
+
+def _default_columns(arrays):
+    """Column order of the C writer: species, pos, then the rest."""
+    columns = list(arrays.keys())
+    for special in ('pos', 'species'):
+        if special in columns:
+            columns.remove(special)
+    if 'species' in arrays:
+        columns.insert(0, 'species')
+    if 'pos' in arrays:
+        insert_at = 1 if 'species' in arrays else 0
+        columns.insert(insert_at, 'pos')
+    return columns
+
+
+def _batch_info(nframes, info_arrays, cell, pbc):
+    """Per-frame info arrays for write_batch, with ``Lattice``/``pbc`` added
+    as in :func:`_cextxyz_frame_args` (``cell`` may be shared by all frames)."""
+    info = dict(info_arrays or {})
+    if cell is not None:
+        cell = np.broadcast_to(np.asarray(cell, dtype=float), (nframes, 3, 3))
+        info['Lattice'] = np.ascontiguousarray(cell.transpose(0, 2, 1))
+    if pbc is not None:
+        info['pbc'] = np.broadcast_to(np.asarray(pbc, dtype=bool), (nframes, 3))
+    return info
+
 
-    cextxyz.write_frame_dicts(c_file, frame.natoms, info,
-                              {k: frame.arrays[k] for k in columns},
+def _write_frame_cextxyz(c_file, frame: Frame, *, columns=None,
+                         format_dict=None, verbose=0):
+    """Write one Frame using the C writer."""
+    natoms, info, arrays, columns = _cextxyz_frame_args(frame, columns)
+    cextxyz.write_frame_dicts(c_file, natoms, info,
+                              {k: arrays[k] for k in columns},
                               columns, verbose, format_dict=format_dict)
 
 
+class Writer:
+    """Write frames to one extxyz file that stays open between calls.
+
+    :func:`write_dicts` opens and closes the file on every call; a ``Writer``
+    keeps it open, together with the C writer's output buffer and
+    ``Properties`` header, which is what a simulation appending one frame per
+    step wants::
+
+        with Writer('traj.xyz') as w:
+            for frame in frames:
+                w.write(frame)
+
+    ``mode`` is ``'w'`` or ``'a'``; ``columns`` and ``format_dict`` are as for
+    :func:`write_dicts`. Frames are converted and written by the C-API writer
+    (``_extxyz.Writer``) when the extension was built with numpy, otherwise by
+    the ctypes writer on a C ``FILE*``; the output is the same. A frame whose
+    info or columns are rejected raises before any of it is written; only
+    with ``atomic=True`` does that also hold for a failure part-way through
+    formatting (e.g. out of memory), as large frames are otherwise handed to
+    the file in blocks of about 32 KB.
+
+    With ``async_=True``, :meth:`write` and :meth:`write_batch` only copy the
+    data and queue it; a background thread formats and writes it (the C
+    writer releases the GIL, so this overlaps with the caller). At most
+    ``queue_depth`` writes are pending before ``write`` blocks. :meth:`flush`
+    and :meth:`close` wait for the queue to drain, and an error in the
+    background thread is raised from the next ``write``, ``flush`` or
+    ``close``. Always close an async writer (or use it as a context manager),
+    otherwise queued frames are lost at exit.
+
+    With ``atomic=True`` each frame is formatted completely and handed to the
+    OS in a single ``write()``. Appending (``mode='a'``) to a file shared with
+    other writers then never interleaves frames, and a job killed mid-write
+    leaves at most one incomplete frame at the end of the file, which
+    ``iread_dicts(..., on_truncated='drop')`` skips. Without the C-API writer
+    this falls back to flushing after every frame.
+    """
+
+    def __init__(self, file, mode='w', *, columns=None, format_dict=None,
+                 verbose=0, async_=False, queue_depth=4, atomic=False):
+        if mode not in ('w', 'a'):
+            raise ValueError(f"mode must be 'w' or 'a', not {mode!r}")
+        if async_ and queue_depth < 1:
+            raise ValueError(f"queue_depth must be at least 1, not {queue_depth}")
+        self.columns = columns
+        self.format_dict = format_dict
+        self.verbose = verbose
+        self.atomic = atomic
+        self._writer = None
+        self._fp = None
+        if cextxyz._HAVE_C_WRITER and not verbose:
+            self._writer = cextxyz._ext_mod.Writer(str(file), mode, format_dict,
+                                                   atomic)
+        else:
+            self._fp = cextxyz.cfopen(str(file), mode)
+            if not self._fp:
+                raise OSError(f"could not open {file!s} for writing")
+        self._queue = None
+        self._error = None
+        if async_:
+            self._queue = queue.Queue(maxsize=queue_depth)
+            self._thread = threading.Thread(target=self._worker,
+                                            name='extxyz-writer', daemon=True)
+            self._thread.start()
+
+    @property
+    def closed(self):
+        if self._writer is not None:
+            return self._writer.closed
+        return self._fp is None
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                if self._error is None:
+                    job()
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                self._queue.task_done()
+
+    def _check(self):
+        if self.closed:
+            raise ValueError("I/O operation on closed Writer")
+        if self._error is not None:
+            raise self._error
+
+    def write(self, frames: Frame | Iterable[Frame]):
+        """Write one :class:`Frame` or an iterable of them."""
+        self._check()
+        if isinstance(frames, Frame):
+            frames = [frames]
+        if self._queue is not None:
+            for frame in frames:
+                # snapshot now: the caller may update its arrays in place
+                # (as an MD step does) before the frame is written
+                frame = copy.deepcopy(frame)
+                self._queue.put(partial(self._write_frames, [frame]))
+                self._check()
+            return
+        self._write_frames(frames)
+
+    def _write_frames(self, frames):
+        if self._writer is not None:
+            self._writer.write_frames(_cextxyz_frame_args(frame, self.columns)
+                                      for frame in frames)
+            return
+        for frame in frames:
+            _write_frame_cextxyz(self._fp, frame, columns=self.columns,
+                                 format_dict=self.format_dict,
+                                 verbose=self.verbose)
+            if self.atomic:
+                cextxyz.cfflush(self._fp)
+
+    def write_batch(self, arrays, frame_ptr, info_arrays=None, cell=None,
+                    pbc=None):
+        """Write many frames from concatenated per-atom columns.
+
+        Frame ``k`` is made of rows ``frame_ptr[k]:frame_ptr[k+1]`` of every
+        column in ``arrays`` and of item ``k`` of every array in
+        ``info_arrays`` (leading axis of length ``len(frame_ptr) - 1``).
+        ``cell`` is a ``(nframes, 3, 3)`` or a single ``(3, 3)`` array and
+        ``pbc`` a ``(nframes, 3)`` or ``(3,)`` array; either is left off the
+        comment line when ``None``. The output is the same as writing the
+        equivalent :class:`Frame` objects, without building them: the C-API
+        writer emits all frames in one call with the GIL released.
+        """
+        self._check()
+        if self._queue is not None:
+            arrays, frame_ptr, info_arrays, cell, pbc = copy.deepcopy(
+                (dict(arrays), frame_ptr, info_arrays, cell, pbc))
+            self._queue.put(partial(self._write_batch, arrays, frame_ptr,
+                                    info_arrays, cell, pbc))
+            return
+        self._write_batch(arrays, frame_ptr, info_arrays, cell, pbc)
+
+    def _write_batch(self, arrays, frame_ptr, info_arrays, cell, pbc):
+        frame_ptr = np.array(frame_ptr, dtype=np.int64)
+        nframes = len(frame_ptr) - 1
+        if nframes < 0 or (np.diff(frame_ptr) < 0).any() or (frame_ptr < 0).any():
+            raise ValueError("frame_ptr must be non-negative and non-decreasing")
+        info = _batch_info(nframes, info_arrays, cell, pbc)
+        columns = self.columns
+        if columns is None:
+            columns = _default_columns(arrays)
+        # checked here for both writers: the ctypes one would read past the end
+        for c in columns:
+            nrows = len(arrays[c])
+            if nrows != frame_ptr[-1]:
+                raise ValueError(f"column {c!r} has {nrows} rows, "
+                                 f"expected {frame_ptr[-1]}")
+        if self._writer is not None:
+            self._writer.write_batch(frame_ptr, info, arrays, columns)
+            return
+        for k in range(nframes):
+            start, stop = frame_ptr[k], frame_ptr[k + 1]
+            frame_info = {}
+            for key, value in info.items():
+                value = np.asarray(value)[k]
+                frame_info[key] = value.item() if value.ndim == 0 else value
+            cextxyz.write_frame_dicts(self._fp, int(stop - start), frame_info,
+                                      {c: np.asarray(arrays[c])[start:stop]
+                                       for c in columns},
+                                      columns, self.verbose,
+                                      format_dict=self.format_dict)
+            if self.atomic:
+                cextxyz.cfflush(self._fp)
+
+    def flush(self):
+        """Write out everything queued or buffered so far."""
+        if self._queue is not None:
+            self._queue.join()
+        self._check()
+        if self._writer is not None:
+            self._writer.flush()
+        else:
+            cextxyz.cfflush(self._fp)
+
+    def close(self):
+        if self.closed:
+            return
+        if self._queue is not None:
+            self._queue.put(None)
+            self._thread.join()
+        if self._writer is not None:
+            self._writer.close()
+        else:
+            cextxyz.cfclose(self._fp)
+            self._fp = None
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+
+def write_batch(file, arrays, frame_ptr, info_arrays=None, cell=None,
+                pbc=None, *, columns=None, append=False, format_dict=None):
+    """Write frames held as concatenated columns to ``file`` (a path).
+
+    ``arrays`` maps column names to per-atom arrays concatenated over all
+    frames, and ``frame_ptr`` (length ``nframes + 1``) gives each frame's
+    first row, so frame ``k`` is ``arrays[c][frame_ptr[k]:frame_ptr[k+1]]``.
+    See :meth:`Writer.write_batch` for ``info_arrays``, ``cell`` and ``pbc``.
+    """
+    with Writer(file, 'a' if append else 'w', columns=columns,
+                format_dict=format_dict) as writer:
+        writer.write_batch(arrays, frame_ptr, info_arrays, cell, pbc)
+
+
 def write_dicts(file, frames: Frame | Iterable[Frame], *,
                 use_cextxyz=True, append=False, columns=None,
                 format_dict=None, verbose=0):
@@ -8,16 +8,24 @@ import json
 import re
 
 import numpy as np
-from pyleri.node import Node
 
-from .extxyz_kv_grammar import (ExtxyzKVGrammar,
-                                float_re, integer_re, bool_re, simplestring_re,
+from .extxyz_kv_grammar import (float_re, integer_re, bool_re, simplestring_re,
                                 whitespace_re,
                                 integer_fmt, float_fmt, string_fmt, bool_fmt)
 
 
-# Singleton grammar — building it is non-trivial.
-grammar = ExtxyzKVGrammar()
+@functools.cache
+def get_grammar():
+    """The singleton pyleri grammar, built (and pyleri imported) on first use."""
+    from .extxyz_kv_grammar import ExtxyzKVGrammar
+    return ExtxyzKVGrammar()
+
+
+def __getattr__(name):
+    # ``grammar`` used to be built at import; keep it importable, but lazily
+    if name == 'grammar':
+        return get_grammar()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 class NodeVisitor:
@@ -30,6 +38,7 @@ class NodeVisitor:
     """
 
     def visit(self, node):
+        from pyleri.node import Node
         if isinstance(node, Node):
             if hasattr(node.element, 'name'):
                 method = 'visit_' + node.element.name
@@ -77,6 +86,7 @@ class TreeDumper(NodeVisitor):
         self.prefix = prefix
 
     def generic_visit(self, node):
+        from pyleri.node import Node
         if isinstance(node, Node):
             name = getattr(node.element, 'name', None)
             str_repr = (f'{node.element.__class__.__name__}'
@@ -213,8 +223,12 @@ class TwoDimArrays(NodeTransformer):
         return Value(node.children[0].value)
 
 
-def result_to_dict(result, verbose=0):
-    """Convert from pyleri parse result to key/value info dictionary."""
+def _result_to_dict_visitors(result, verbose=0):
+    """Reference conversion through the tree-rewriting visitors above.
+
+    Walks the tree five times; kept for the ``verbose`` dumps of the
+    intermediate trees. ``result_to_dict`` gives the same dict in one pass.
+    """
     tree = result.tree.children[0]
     if verbose >= 1:
         print('input tree:')
@@ -244,6 +258,101 @@ def result_to_dict(result, verbose=0):
     return result_dict
 
 
+# Single-pass conversion: one handler per named grammar element, looked up by
+# element name. Unnamed wrappers (the Choice around each bool, the Sequence
+# and Choice inside ``old_one_d_array``, the List inside ``one_d_arrays``) are
+# stepped over structurally by the handler of their named parent, so the
+# names TreeCleaner assigns to them have no effect here.
+
+def _convert(node):
+    return _HANDLERS.get(getattr(node.element, 'name', None), _first_child)(node)
+
+
+def _first_child(node):
+    return _convert(node.children[0])
+
+
+def _to_float(node):
+    return float(node.string.replace('d', 'e').replace('D', 'e'))
+
+
+def _items(node):
+    # List children alternate item, ',' delimiter, item, ...
+    return [_convert(c) for c in node.children[::2]]
+
+
+def _sp_items(node):
+    # Repeat children are all items
+    return [_convert(c) for c in node.children]
+
+
+def _one_d_array(node):
+    # Sequence('[', <list>, ']')
+    return np.array(_items(node.children[1]))
+
+
+def _old_one_d_array(node):
+    # Choice(Sequence(<quote>, Choice(<list>, ...), <quote>), ...)
+    value = np.array(_convert(node.children[0].children[1].children[0]))
+    if value.shape == (9,):
+        return value.reshape((3, 3), order='F')
+    if value.shape == (1,):
+        # old array with one column is just a scalar
+        return value.item()
+    return value
+
+
+def _two_d_array(node):
+    # Sequence('[', Choice(List(one_d_array_*)), ']')
+    return np.array(_items(node.children[1].children[0]))
+
+
+_HANDLERS = {
+    'key_item': _first_child,
+    'val_item': _first_child,
+    'r_string': _first_child,
+    'r_barestring': lambda node: node.string,
+    'r_dq_quotedstring': lambda node: ExtractValues.clean_qs(node.string),
+    'r_cb_quotedstring': lambda node: ExtractValues.clean_qs(node.string),
+    'r_sb_quotedstring': lambda node: ExtractValues.clean_qs(node.string),
+    'r_integer': lambda node: int(node.string),
+    'r_float': _to_float,
+    'r_true': lambda node: True,
+    'r_false': lambda node: False,
+    'properties': lambda node: 'properties',
+    'properties_val_str': lambda node: node.string,
+    'one_d_array_i': _one_d_array,
+    'one_d_array_f': _one_d_array,
+    'one_d_array_b': _one_d_array,
+    'one_d_array_s': _one_d_array,
+    'old_one_d_array': _old_one_d_array,
+    'two_d_array': _two_d_array,
+}
+_HANDLERS.update(dict.fromkeys(['ints', 'floats', 'bools', 'strings'], _items))
+_HANDLERS.update(dict.fromkeys(['ints_sp', 'floats_sp', 'bools_sp', 'strings_sp'],
+                               _sp_items))
+
+
+def result_to_dict(result, verbose=0):
+    """Convert from pyleri parse result to key/value info dictionary.
+
+    With ``verbose`` set, goes through ``_result_to_dict_visitors`` so the
+    intermediate trees are dumped.
+    """
+    if verbose:
+        return _result_to_dict_visitors(result, verbose)
+
+    result_dict = {}
+    for pair in result.tree.children[0].children:
+        # all_kv_pair -> kv_pair | properties_kv_pair: (key, '=', value, ws)
+        children = pair.children[0].children
+        key = _convert(children[0])
+        if key in result_dict:
+            raise KeyError(f'duplicate key {key}')
+        result_dict[key] = _convert(children[2])
+    return result_dict
+
+
 class Properties:
     """Per-atom column descriptor parsed from the ``Properties=…`` comment-line key.
 
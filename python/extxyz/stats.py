@@ -0,0 +1,214 @@
+"""Per-phase timers and counters of the C reader.
+
+The C core can keep cumulative timers (in nanoseconds) and counters for the
+phases of reading a file: line I/O, comment-line parsing, the Properties
+column plan, tokenizing atom lines, converting fields (mostly float parsing)
+and marshalling the result into Python objects. They are compiled in but off
+until :func:`enable` is called; while off they cost a flag test per
+instrumented site. Timing while on reads the clock a few times per atom line,
+which adds some overhead of its own.
+
+The numbers are process-wide and cumulative across threads; :func:`measure`
+gives the deltas over a block of code::
+
+    import extxyz
+    with extxyz.stats.measure() as stats:
+        frames = extxyz.read_dicts('traj.xyz')
+    print(stats['comment_ns'] / 1e9, stats['floats_strtod'])
+
+Only the C backend is instrumented, and ``marshal_ns`` only covers the C-API
+read path (not the legacy ctypes marshalling).
+
+How many floats take the exact fast path rather than ``strtod`` depends on
+how the file was written. :func:`float_profile` breaks this down per ``R``
+column of a file, with the shapes of the tokens that miss the fast path;
+``extxyz profile FILE`` prints it with recommendations for the writer.
+"""
+from __future__ import annotations
+
+import ctypes
+import re
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator
+
+from . import cextxyz
+from .core import iread_dicts
+
+_lib = cextxyz.extxyz
+_lib.extxyz_stats_enable.argtypes = [ctypes.c_int]
+_lib.extxyz_stats_enable.restype = None
+_lib.extxyz_stats_enabled.argtypes = []
+_lib.extxyz_stats_enabled.restype = ctypes.c_int
+_lib.extxyz_stats_reset.argtypes = []
+_lib.extxyz_stats_reset.restype = None
+_lib.extxyz_stats_count.argtypes = []
+_lib.extxyz_stats_count.restype = ctypes.c_int
+_lib.extxyz_stats_name.argtypes = [ctypes.c_int]
+_lib.extxyz_stats_name.restype = ctypes.c_char_p
+_lib.extxyz_stats_value.argtypes = [ctypes.c_int]
+_lib.extxyz_stats_value.restype = ctypes.c_ulonglong
+_lib.extxyz_parse_double.argtypes = [ctypes.c_void_p, ctypes.c_void_p,
+                                     ctypes.POINTER(ctypes.c_double)]
+_lib.extxyz_parse_double.restype = ctypes.c_int
+
+#: Names of the timers (``*_ns``) and counters, in the order of :func:`snapshot`
+NAMES = tuple(_lib.extxyz_stats_name(i).decode()
+              for i in range(_lib.extxyz_stats_count()))
+
+
+def enable():
+    """Start collecting timings and counts."""
+    _lib.extxyz_stats_enable(1)
+
+
+def disable():
+    """Stop collecting; the totals so far are kept."""
+    _lib.extxyz_stats_enable(0)
+
+
+def enabled() -> bool:
+    return bool(_lib.extxyz_stats_enabled())
+
+
+def reset():
+    """Zero all timers and counters."""
+    _lib.extxyz_stats_reset()
+
+
+def snapshot() -> dict[str, int]:
+    """The current totals, as a dict keyed by :data:`NAMES`."""
+    return {name: _lib.extxyz_stats_value(i) for i, name in enumerate(NAMES)}
+
+
+@contextmanager
+def measure() -> Iterator[dict[str, int]]:
+    """Collect stats over a ``with`` block.
+
+    Yields a dict that is filled in on leaving the block with the increase in
+    each total over it. Stats are enabled for the block and then restored to
+    their previous state.
+    """
+    result = {}
+    was_enabled = enabled()
+    before = snapshot()
+    enable()
+    try:
+        yield result
+    finally:
+        if not was_enabled:
+            disable()
+        after = snapshot()
+        result.update((name, after[name] - before[name]) for name in NAMES)
+
+
+# Whether the fast path takes a token only depends on which of its digits are
+# zero (leading zeros are not significant), so tokens are counted with the
+# non-zero digits folded together and each distinct form is tried once.
+_FOLD_DIGITS = str.maketrans('12345678', '99999999')
+_LONG_RUN = re.compile(r'9{4,}')
+
+
+def _takes_fast_path(token: str) -> bool:
+    data = token.encode()
+    buf = ctypes.create_string_buffer(data, len(data))
+    start = ctypes.addressof(buf)
+    return bool(_lib.extxyz_parse_double(start, start + len(data),
+                                         ctypes.byref(ctypes.c_double())))
+
+
+def _significant_digits(token: str) -> int | None:
+    """Significant mantissa digits of a plain decimal token, else ``None``."""
+    mantissa = re.match(r'[+-]?(\d*)(?:\.(\d*))?(?:[eEdD][+-]?\d+)?$', token)
+    if mantissa is None or not any(mantissa.groups()):
+        return None
+    digits = (mantissa.group(1) + (mantissa.group(2) or '')).lstrip('0')
+    return len(digits)
+
+
+def _shape(token: str) -> str:
+    """``token`` with digits shown as ``9``, long runs as ``9{n}``."""
+    token = token.translate(_FOLD_DIGITS).replace('0', '9')
+    return _LONG_RUN.sub(lambda m: f'9{{{len(m.group())}}}', token)
+
+
+@dataclass
+class FloatColumnProfile:
+    """How the float tokens of one ``R`` column were parsed."""
+    name: str
+    floats: int = 0
+    fast: int = 0
+    #: significant digits of all tokens, and of those that missed the fast
+    #: path (``None`` for tokens that are not plain decimals, e.g. ``nan``)
+    digits: Counter = field(default_factory=Counter)
+    slow_digits: Counter = field(default_factory=Counter)
+    #: shapes (see :func:`float_profile`) of the tokens that missed it
+    slow_shapes: Counter = field(default_factory=Counter)
+
+    @property
+    def fast_fraction(self) -> float:
+        return self.fast / self.floats if self.floats else 1.0
+
+    def recommendation(self) -> str | None:
+        """What to change in the writer, or ``None`` if nothing misses."""
+        if self.fast == self.floats:
+            return None
+        long = sum(n for d, n in self.slow_digits.items()
+                   if d is not None and d > 19)
+        other = self.floats - self.fast - long
+        advice = f'column {self.name}: {100 * self.fast_fraction:.4g}% fast path'
+        if long >= other:
+            digits = max((d for d in self.slow_digits if d is not None),
+                         key=self.slow_digits.__getitem__)
+            advice += (f', {digits} significant digits; write at most 17 '
+                       "(e.g. '%.17g'), which still round-trips every double")
+        else:
+            shape = self.slow_shapes.most_common(1)[0][0]
+            advice += (f', tokens like {shape!r} are not plain decimals, '
+                       'which the reader rejects in atom lines')
+        return advice
+
+
+def float_profile(path, index=None) -> dict[str, FloatColumnProfile]:
+    """Fast-path hit rates of the float columns of the file at ``path``.
+
+    The frames selected by ``index`` (as for :func:`~extxyz.iread_dicts`;
+    default all) are read with their atom lines left unparsed, and every token
+    of an ``R`` column is checked with the C reader's own fast-path test.
+    Tokens that miss it are counted by shape: the token with its digits shown
+    as ``9`` and runs of four or more as ``9{n}``, e.g. ``-9.9{19}`` for
+    ``-0.1234567890123456789``.
+
+    Returns a :class:`FloatColumnProfile` per column name, in the order the
+    columns were first seen.
+    """
+    profiles = {}
+    forms = {}
+    for frame in iread_dicts(path, index, lazy=True):
+        columns = []
+        col = 0
+        for name, ptype, ncols in frame.arrays.properties.properties:
+            if ptype == 'R':
+                columns.append((name, col, col + ncols))
+            col += ncols
+        if not columns:
+            continue
+        rows = [line.split() for line in frame.arrays.lines()]
+        for name, start, stop in columns:
+            tokens = ' '.join(t for row in rows for t in row[start:stop])
+            profile = profiles.setdefault(name, FloatColumnProfile(name))
+            for form, n in Counter(tokens.translate(_FOLD_DIGITS).split()).items():
+                try:
+                    fast, digits = forms[form]
+                except KeyError:
+                    fast, digits = forms[form] = (_takes_fast_path(form),
+                                                  _significant_digits(form))
+                profile.floats += n
+                profile.digits[digits] += n
+                if fast:
+                    profile.fast += n
+                else:
+                    profile.slow_digits[digits] += n
+                    profile.slow_shapes[_shape(form)] += n
+    return profiles
@@ -0,0 +1,32 @@
+"""Fixtures shared by the reader and writer tests."""
+import numpy as np
+import pytest
+
+from extxyz import Frame, cextxyz
+
+
+@pytest.fixture(params=["capi", "ctypes"])
+def backend(request, monkeypatch):
+    """Write through the C-API writer, or through the ctypes fallback."""
+    if request.param == "capi":
+        if not cextxyz._HAVE_C_WRITER:
+            pytest.skip("_extxyz built without the C-API writer")
+    else:
+        monkeypatch.setattr(cextxyz, "_HAVE_C_WRITER", False)
+    return request.param
+
+
+@pytest.fixture
+def make_frames():
+    """``make_frames(n, species)``: ``n`` periodic frames of the given atoms,
+    frame ``k`` with ``step=k``, ``energy=0.5 * k`` and positions offset by
+    ``k``."""
+    def make(n=3, species=("H", "O")):
+        natoms = len(species)
+        return [Frame(natoms=natoms, cell=np.eye(3) * 5,
+                      pbc=np.array([True] * 3),
+                      info={"step": k, "energy": 0.5 * k},
+                      arrays={"species": np.array(species),
+                              "pos": np.arange(3. * natoms).reshape(natoms, 3) + k})
+                for k in range(n)]
+    return make
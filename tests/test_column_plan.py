@@ -0,0 +1,54 @@
+"""The C reader reuses the column plan (and per-line regex) of the previous
+frame while the Properties string is unchanged. Frames whose Properties
+change mid-file, or come back, must read exactly as they do through the
+stateless ctypes reader."""
+import numpy as np
+import pytest
+
+from extxyz import Frame, cextxyz, iread_dicts, write_dicts
+
+pytestmark = pytest.mark.skipif(not cextxyz._HAVE_C_READ_STATE,
+                                reason="_extxyz built without ReadState")
+
+
+def _frames():
+    rng = np.random.default_rng(11)
+    frames = []
+    for k, layout in enumerate("aabbbaca"):
+        n = 3 + k % 2
+        arrays = {"species": rng.choice(["H", "Cl"], size=n),
+                  "pos": rng.random((n, 3))}
+        if layout == "b":
+            arrays["forces"] = rng.standard_normal((n, 3))
+            arrays["tag"] = np.arange(n)
+        elif layout == "c":
+            arrays = {"pos": arrays["pos"], "fixed": rng.random(n) > 0.5,
+                      "species": np.array(["Xxxxxxxxxxxxx"] * n)}
+        frames.append(Frame(natoms=n, cell=np.eye(3), pbc=np.array([True] * 3),
+                            info={"step": k}, arrays=arrays))
+    return frames
+
+
+@pytest.mark.parametrize("use_regex", [False, True])
+def test_properties_change_matches_ctypes(tmp_path, monkeypatch, use_regex):
+    path = tmp_path / "traj.xyz"
+    write_dicts(path, _frames(), use_cextxyz=True)
+    got = list(iread_dicts(path, use_regex=use_regex))
+    monkeypatch.setattr(cextxyz, "_USE_LEGACY_MARSHAL", True)
+    want = list(iread_dicts(path, use_regex=use_regex))
+    assert len(got) == len(want) == 8
+    for g, w in zip(got, want):
+        assert list(g.arrays) == list(w.arrays)
+        for key in w.arrays:
+            np.testing.assert_array_equal(g.arrays[key], w.arrays[key])
+
+
+def test_bad_line_after_properties_change(tmp_path):
+    path = tmp_path / "traj.xyz"
+    write_dicts(path, _frames()[:2], use_cextxyz=True)
+    with open(path, "a") as fh:
+        fh.write("1\nProperties=species:S:1:pos:R:3:tag:I:1\nH 0 0 0\n")
+    frames = iread_dicts(path)
+    assert [next(frames).info["step"] for _ in range(2)] == [0, 1]
+    with pytest.raises(cextxyz.ExtXYZError, match="expected 5 fields"):
+        next(frames)
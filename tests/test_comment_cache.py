@@ -0,0 +1,74 @@
+"""``iread_dicts(comment_cache=...)``: frames read through the comment-line
+cache must equal frames read without it, and repeated comment lines must be
+served from the cache (LRU, bounded)."""
+import numpy as np
+import pytest
+
+from extxyz import CommentCache, Frame, cextxyz, iread_dicts, write_dicts
+
+pytestmark = pytest.mark.skipif(not cextxyz._HAVE_C_READ_STATE,
+                                reason="_extxyz built without ReadState")
+
+
+def _write(path, labels):
+    frames = []
+    for k, label in enumerate(labels):
+        info = {"label": label, "temperature": 300.0, "flags": [True, False],
+                "stress": np.arange(9.).reshape(3, 3), "names": ["a", "b c"],
+                "n": 7}
+        frames.append(Frame(natoms=2, cell=np.eye(3) * 3,
+                            pbc=np.array([True] * 3), info=info,
+                            arrays={"species": np.array(["H", "He"]),
+                                    "pos": np.full((2, 3), float(k))}))
+    write_dicts(path, frames, use_cextxyz=True)
+
+
+def _same(a, b):
+    assert a.info.keys() == b.info.keys()
+    for key in a.info:
+        np.testing.assert_array_equal(a.info[key], b.info[key])
+    for key in a.arrays:
+        np.testing.assert_array_equal(a.arrays[key], b.arrays[key])
+
+
+@pytest.mark.parametrize("use_cleri", [True, False])
+def test_cache_matches_uncached(tmp_path, use_cleri):
+    path = tmp_path / "traj.xyz"
+    _write(path, ["x"] * 6 + ["y"] + ["x"] * 3)
+    cache = CommentCache(4)
+    got = list(iread_dicts(path, use_cleri=use_cleri, comment_cache=cache))
+    want = list(iread_dicts(path, use_cleri=use_cleri))
+    assert len(got) == len(want) == 10
+    for g, w in zip(got, want):
+        _same(g, w)
+    assert (cache.hits, cache.misses, cache.currsize) == (8, 2, 2)
+
+
+def test_lru_eviction(tmp_path):
+    path = tmp_path / "traj.xyz"
+    _write(path, ["a", "b", "c"] * 3)
+    small = CommentCache(2)
+    list(iread_dicts(path, comment_cache=small))
+    assert (small.hits, small.misses, small.currsize) == (0, 9, 2)
+    big = CommentCache(3)
+    list(iread_dicts(path, comment_cache=big))
+    assert (big.hits, big.misses) == (6, 3)
+    big.clear()
+    assert (big.hits, big.misses, big.currsize) == (0, 0, 0)
+
+
+def test_cache_size_int_and_reuse(tmp_path):
+    path = tmp_path / "traj.xyz"
+    _write(path, ["x"] * 3)
+    assert len(list(iread_dicts(path, comment_cache=8))) == 3
+    cache = CommentCache()
+    list(iread_dicts(path, comment_cache=cache))
+    list(iread_dicts(path, comment_cache=cache, prefetch=2))
+    assert (cache.hits, cache.misses) == (5, 1)
+
+
+def test_bad_comment_cache(tmp_path):
+    with pytest.raises(TypeError):
+        next(iread_dicts(tmp_path / "x.xyz", comment_cache="big"))
+    with pytest.raises(ValueError):
+        CommentCache(0)
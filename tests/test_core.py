@@ -111,3 +111,28 @@ def test_legacy_names_raise_helpful_importerror():
 
     with pytest.raises(ImportError, match=r'ase-extxyz'):
         ExtXYZTrajectoryWriter('out.xyz')
+
+
+def test_pure_python_atom_block_matches_c(tmp_path):
+    """The pure-Python reader parses every column type (including all the
+    logical spellings and, via the ``np.loadtxt`` retry with float
+    converters, Fortran exponents) as the C reader does."""
+    p = tmp_path / 'cols.xyz'
+    p.write_text('4\nProperties=species:S:1:pos:R:3:z:I:1:fixed:L:1\n'
+                 'Si 0.5 -1.25 3e2 14 T\n'
+                 'O .25 2.0 -0.0 -8 false\n'
+                 'H 1 2 3 +1 TRUE\n'
+                 'C 0 0 0 6 F\n'
+                 '1\nProperties=species:S:1:pos:R:3\n'
+                 'H 1.5d0 2.0D-1 3\n')
+    py = read_dicts(p, use_cextxyz=False)
+    c = read_dicts(p, use_cextxyz=True)
+    for a, b in zip(py, c):
+        assert a.arrays.keys() == b.arrays.keys()
+        for key in a.arrays:
+            np.testing.assert_array_equal(a.arrays[key], b.arrays[key])
+    assert py[0].arrays['fixed'].tolist() == [True, False, True, False]
+
+    p.write_text('1\nProperties=species:S:1:pos:R:3:fixed:L:1\nH 0 0 0 maybe\n')
+    with pytest.raises(ValueError, match='fixed'):
+        read_dicts(p, use_cextxyz=False)
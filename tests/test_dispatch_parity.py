@@ -3,6 +3,7 @@
 results to the libcleri grammar (use_cleri=True). This test IS the provability
 mechanism — cleri stays the canonical grammar/oracle.
 """
+import ctypes
 import random
 
 import numpy as np
@@ -163,3 +164,34 @@ def test_dispatch_reject_matches_cleri(tmp_path, line):
             cextxyz.cfclose(fp)
 
     assert parse(True) == parse(False), f"accept/reject disagree on {line!r}"
+
+
+# --- token scanners vs the grammar's PCRE2 patterns ---
+
+# bytes that steer the int/float/bool/bare-string patterns: digits, signs,
+# '.', exponent letters, bool spellings, word chars, separators, escapes
+_TOKEN_ALPHABET = list("0123456789+-.eEdDtTfFrRuUaAlLsSx_ \t,=\"{}[]\\\v\f") + [
+    "true", "false", "TRUE", "FALSE", "True", "False", "\\ ", "\\=", "\xe9"]
+
+
+@pytest.mark.skipif(not hasattr(cextxyz.extxyz, "extxyz_dispatch_token"),
+                    reason="built without extxyz_dispatch_token")
+def test_token_scanners_match_pcre2():
+    """The dispatcher's hand-written int/float/bool/bare-string scanners must
+    return exactly the anchored PCRE2 match length of the grammar regexes, at
+    every offset of random strings biased towards number/bool edge cases."""
+    token = cextxyz.extxyz.extxyz_dispatch_token
+    token.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_size_t, ctypes.c_int]
+    token.restype = ctypes.c_int
+    rng = random.Random(39)
+    checked = 0
+    for _ in range(4000):
+        s = "".join(rng.choice(_TOKEN_ALPHABET)
+                    for _ in range(rng.randint(1, 12))).encode("latin-1")
+        for pos in range(len(s) + 1):
+            for kind in range(4):
+                want = token(kind, s, pos, 1)
+                got = token(kind, s, pos, 0)
+                assert got == want, (kind, s, pos, got, want)
+                checked += 1
+    assert checked > 100000
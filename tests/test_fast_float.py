@@ -1,10 +1,12 @@
 """The fast per-atom float parser must be bit-exact with the strtod path.
 
-`atof_eEdD` has a fast path for plain decimals with <= 15 significant digits
-(where `mant / 10**frac` is a single correctly-rounded division) and falls back
-to strtod for exponents, 16+ digits, or anything else. Either way the parsed
-double must be bit-identical to what strtod/Python's float() produces, so write
-precision (issue #22) and round-tripping are unaffected.
+`atof_eEdD` and the tokenizer parse decimals with up to 19 significant digits,
+with or without an exponent (including Fortran d/D), on a fast path
+(fast_parse.c: Clinger's exact case, else Eisel-Lemire) and fall back to strtod
+for anything longer. Either way the parsed double must be bit-identical to what
+strtod/Python's float() produces, so write precision (issue #22) and
+round-tripping are unaffected. libextxyz/test_parse_float.c runs a much larger
+differential sweep against strtod under `meson test`.
 """
 import os
 import tempfile
@@ -15,17 +17,21 @@ import pytest
 from extxyz import cextxyz
 
 
-# strings spanning: typical %.8f, >15 sig digits (fallback), scientific
-# (fallback), Fortran d/D exponent (fallback), signs, zeros, leading dot.
+# strings spanning: typical %.8f, 16-19 sig digits, scientific, Fortran d/D
+# exponent, subnormal/overflow, >19 sig digits (strtod fallback), signs, zeros,
+# leading dot.
 FLOAT_STRINGS = [
     "0.0", "-0.0", "1.0", "-1.0", "19.00927393", "-0.00623274",
-    "1.123456789012345",      # 16 chars, 16 sig -> fallback
-    "1.2345678901234567",     # 17 sig -> fallback
-    "123456789012345.6",      # 16 sig -> fallback
+    "1.123456789012345",      # 16 sig
+    "1.2345678901234567",     # 17 sig (%.17g)
+    "123456789012345.6",      # 16 sig
     "0.000000001", ".5", "-.25", "+3.5", "42",
-    "9.876543210987653e-05",  # scientific -> fallback
-    "1.5e3", "-2.25E-2",      # scientific -> fallback
-    "1.5d3", "2.0D-1",        # Fortran d/D exponent -> fallback
+    "9.876543210987653e-05",  # scientific
+    "1.5e3", "-2.25E-2",      # scientific
+    "1.5d3", "2.0D-1", "-1.234D-03",   # Fortran d/D exponent
+    "4.9406564584124654e-324", "2.2250738585072011e-308",   # subnormal
+    "1.7976931348623157e308", "1e400", "1e-400",              # edges of range
+    "1.00000000000000000000001",   # 24 sig -> strtod fallback
 ]
 
 
@@ -63,3 +69,34 @@ def test_fast_float_is_bit_exact():
 def test_fast_float_values(s, expected):
     got = _read_floats([s])[0]
     assert got == expected and np.signbit(got) == np.signbit(expected)
+
+
+@pytest.mark.parametrize("use_regex", [False, True])
+def test_random_floats_match_strtod(use_regex):
+    """Differential test on random doubles over the whole range, as written by
+    %.17g / %.15e / the default %16.8f, plus random 1-19 digit mantissas."""
+    rng = np.random.default_rng(37)
+    bits = rng.integers(0, 0x7FEFFFFFFFFFFFFF, size=3000, dtype=np.uint64)
+    values = bits.view("f8") * rng.choice([-1.0, 1.0], size=bits.size)
+    strings = [f"{v:.17g}" for v in values] + [f"{v:.15e}" for v in values]
+    strings += [f"{v:16.8f}".strip() for v in values[np.abs(values) < 1e15]]
+    for _ in range(3000):
+        # no leading zero: the regex mode's bare_int rejects "0123."
+        digits = str(rng.integers(1, 10)) + "".join(
+            rng.choice(list("0123456789"), size=rng.integers(0, 19)))
+        point = rng.integers(0, len(digits) + 1)
+        strings.append(f"{digits[:point]}.{digits[point:]}{rng.choice(list('eEdD'))}"
+                       f"{rng.integers(-340, 320)}")
+    body = f"{len(strings)}\nProperties=x:R:1\n" + "".join(s + "\n" for s in strings)
+    with tempfile.NamedTemporaryFile("w", suffix=".xyz", delete=False) as f:
+        f.write(body)
+        path = f.name
+    fp = cextxyz.cfopen(path, "r")
+    try:
+        _, _, arrays = cextxyz.read_frame_dicts(fp, use_regex=use_regex)
+    finally:
+        cextxyz.cfclose(fp)
+        os.unlink(path)
+    ref = np.array([float(s.replace("d", "e").replace("D", "E")) for s in strings])
+    bad = np.flatnonzero(arrays["x"].view("u8") != ref.view("u8"))
+    assert bad.size == 0, [(strings[i], arrays["x"][i], ref[i]) for i in bad[:5]]
@@ -24,6 +24,10 @@ VALID_BODIES = [
     'a bb 0 1 2 7 T\nccc d 3 4 5 -2 false\ne ffff 6 7 8 0 True\n',
     # high-precision floats (fallback path) + leading whitespace on rows
     '1\nProperties=species:S:1:pos:R:3\n   Ne 1.123456789012345 1.2345678901234567 9.876543e-5\n',
+    # long rows: fields and whitespace runs straddling 16-byte blocks, CRLF
+    '2\nProperties=species:S:1:pos:R:3:forces:R:3\r\n'
+    'Cu       0.12345678      -1.00000000 \t\t   123.50000000  0.1 0.2 0.3\r\n'
+    'Cu 12345678.12345678 0.00000001 -0.99999999' + ' ' * 20 + '1 2 3   \r\n',
 ]
 
 
@@ -90,3 +94,23 @@ def test_tokenizer_is_default(tmp_path):
     bad.write_text("1\nProperties=species:S:1:pos:R:3\nH NOTANUM 0 0\n")
     with pytest.raises(cextxyz.ExtXYZError):
         read_dicts(bad, use_cextxyz=True)   # default tokenizer
+
+
+@pytest.mark.parametrize("use_regex", [False, True])
+def test_int_and_bool_fields(tmp_path, use_regex):
+    """Integer fields are range-checked rather than wrapped, and every
+    BOOL_RE spelling reads with its own truth value, in both read modes."""
+    good = tmp_path / "good.xyz"
+    good.write_text("8\nProperties=z:I:1:ok:L:1\n"
+                    "2147483647 T\n-2147483648 F\n+7 true\n-0 True\n"
+                    "0 TRUE\n12 false\n3 False\n4 FALSE\n")
+    frame = read_dicts(good, use_cextxyz=True, use_regex=use_regex)
+    assert frame.arrays["z"].tolist() == [2147483647, -2147483648, 7, 0, 0, 12, 3, 4]
+    assert frame.arrays["ok"].tolist() == [True, False, True, True,
+                                           True, False, False, False]
+
+    for value in ["2147483648", "-2147483649", "99999999999999999999"]:
+        bad = tmp_path / "bad.xyz"
+        bad.write_text(f"1\nProperties=z:I:1:pos:R:3\n{value} 0 0 0\n")
+        with pytest.raises(cextxyz.ExtXYZError, match="invalid field"):
+            read_dicts(bad, use_cextxyz=True, use_regex=use_regex)
@@ -0,0 +1,77 @@
+"""``iread_dicts(follow=True)`` tails a trajectory that is still being
+written: it yields each frame once it is complete and never a partial one,
+whether it is woken by inotify or by polling."""
+import sys
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from extxyz import Frame, iread_dicts, write_dicts
+
+
+def _frame_bytes(tmp_path, k):
+    path = tmp_path / f"frame{k}.xyz"
+    write_dicts(path, Frame(natoms=2, cell=np.eye(3) * 4,
+                            pbc=np.array([True] * 3), info={"step": k},
+                            arrays={"species": np.array(["H", "O"]),
+                                    "pos": np.zeros((2, 3)) + k}),
+                use_cextxyz=True)
+    return path.read_bytes()
+
+
+@pytest.fixture(params=["inotify", "poll"])
+def wake(request, monkeypatch):
+    if request.param == "poll":
+        monkeypatch.setattr(sys, "platform", "unknown")
+    return request.param
+
+
+def test_follow_growing_file(tmp_path, wake):
+    path = tmp_path / "traj.xyz"
+    path.write_bytes(_frame_bytes(tmp_path, 0))
+    chunks = [_frame_bytes(tmp_path, k) for k in range(1, 6)]
+
+    def writer():
+        with open(path, "ab", buffering=0) as fh:
+            for data in chunks:
+                # each frame arrives in pieces, split mid-line
+                for part in (data[:7], data[7:-9], data[-9:]):
+                    time.sleep(0.01)
+                    fh.write(part)
+
+    t = threading.Thread(target=writer)
+    t.start()
+    try:
+        steps = [f.info["step"] for f in iread_dicts(path, slice(0, 6),
+                                                     follow=True, poll=0.02)]
+    finally:
+        t.join()
+    assert steps == list(range(6))
+
+
+def test_follow_waits_for_complete_frame(tmp_path):
+    path = tmp_path / "traj.xyz"
+    data = _frame_bytes(tmp_path, 0)
+    path.write_bytes(data + data[:-1])   # second frame lacks its last newline
+    frames = iread_dicts(path, follow=True, poll=0.01)
+    assert next(frames).info["step"] == 0
+
+    def finish():
+        time.sleep(0.1)
+        with open(path, "ab") as fh:
+            fh.write(b"\n")
+
+    t = threading.Thread(target=finish)
+    t.start()
+    assert next(frames).info["step"] == 0
+    t.join()
+    frames.close()
+
+
+def test_follow_needs_c_backend(tmp_path):
+    with pytest.raises(ValueError):
+        next(iread_dicts(tmp_path / "x.xyz", use_cextxyz=False, follow=True))
+    with pytest.raises(ValueError):
+        next(iread_dicts(tmp_path / "x.xyz", follow=True, poll=0))
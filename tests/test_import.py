@@ -0,0 +1,60 @@
+"""``import extxyz`` must stay cheap: short-lived worker processes pay for it
+every time. The pyleri grammar, asyncio, and the C grammar compile are all
+deferred until first use."""
+import subprocess
+import sys
+import textwrap
+
+# Generous bound on the self time of the extxyz modules themselves (numpy and
+# the stdlib are not counted); about 10 ms when nothing heavy runs at import.
+OWN_IMPORT_BUDGET_US = 100_000
+
+
+def _run(code):
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                           textwrap.dedent(code)],
+                          capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    return proc
+
+
+def _self_times(stderr):
+    times = {}
+    for line in stderr.splitlines():
+        if line.startswith('import time:') and 'self [us]' not in line:
+            self_us, _, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(self_us)
+    return times
+
+
+def test_import_defers_heavy_setup():
+    proc = _run("""
+        import sys
+        import extxyz
+        from extxyz import cextxyz
+        print(sorted(m for m in ('pyleri', 'asyncio', 'extxyz.aio',
+                                 'ctypes.util', 'subprocess')
+                     if m in sys.modules))
+        print(cextxyz._kv_grammar is None)
+        """)
+    assert proc.stdout.split('\n')[:2] == ['[]', 'True']
+    times = _self_times(proc.stderr)
+    own = sum(us for name, us in times.items() if name.startswith('extxyz'))
+    assert own < OWN_IMPORT_BUDGET_US, times
+
+
+def test_lazy_parts_load_on_use(tmp_path):
+    path = tmp_path / 'one.xyz'
+    path.write_text('1\nProperties=species:S:1:pos:R:3 a=1\nH 0 0 0\n')
+    proc = _run(f"""
+        import sys
+        import extxyz
+        from extxyz import cextxyz, grammar
+        extxyz.read_dicts({str(path)!r})
+        print(cextxyz._kv_grammar is not None, 'pyleri' in sys.modules)
+        extxyz.read_dicts({str(path)!r}, use_cextxyz=False)
+        print(grammar.grammar is grammar.get_grammar())
+        print(extxyz.aiter_dicts.__module__, extxyz.AsyncWriter.__module__)
+        """)
+    assert proc.stdout.split('\n')[:3] == ['True False', 'True',
+                                           'extxyz.aio extxyz.aio']
@@ -0,0 +1,83 @@
+"""``grammar.result_to_dict`` converts the pyleri tree in one pass; it must
+give exactly what the tree-rewriting visitors give (same keys, value types,
+dtypes and values) for the cases listed in ``kv_tests.md``."""
+import itertools
+
+import numpy as np
+import pytest
+
+from extxyz.grammar import _result_to_dict_visitors, grammar, result_to_dict
+
+BARE = ''.join(chr(c) for c in range(33, 127) if chr(c) not in '=",\\[]{}')
+SCALARS = (
+    [s + n for s in ['', '+', '-'] for n in ['1', '12', '012']]
+    + ['"3"', '" 3"', '{3 }', '{ 3 }']
+    + [s + n for s in ['', '+', '-']
+       for n in ['1.0', '1.', '12.0', '012.0', '0.12', '00.12', '.012']]
+    + ['-12.0' + e + s + n for e in 'eEdD' for s in ['', '+', '-']
+       for n in ['0', '2', '02', '12']]
+    + ['t', 'T', 'true', 'True', 'TRUE', 'f', 'F', 'false', 'False', 'FALSE']
+    + [BARE, 'TRuE', '1.3k7', '-2.75e', '+2.75e-', f'"{BARE}"',
+       r'"a\"b\\c"', r'"line one\nline two"']
+)
+ONE_D = ['1 2 3', '1.0 2.0 3.0', '1 2.0 3', '1.0 2 3', 'T F True FALSE',
+         '1 2 3 4 5 6 7 8 9', '1.5d0', '7']
+NEW_ONE_D = ['[1, 2, 3]', '[1.0,2,3]', '[T, F, True, FALSE]', '[ "a", "b" ]',
+             '[a,b]', '[ a, "b", c ]', '[ "a, b", "c]" ]', '[ T, F, bob ]',
+             '[ T, F, "bob", TRUE ]']
+TWO_D = ['[[1, 2]]', '[[1, 2], [3, 4]]', '[[1.0, 2], [3, 4]]', '[[1, 2], [3.5, 4]]',
+         '[[T, F], [F, T]]', '[[a, "b c"], ["d", e]]', '[[T, F], [a, b]]',
+         '[[1, 2], [a, b]]', '[[T, F], [1, 2], [a, b], ["c", d]]']
+VALUES = (SCALARS + [f'"{v}"' for v in ONE_D] + [f"'{v}'" for v in ONE_D[:5]]
+          + ['{%s}' % v for v in ONE_D] + ['{a b c}', '{a "b c" d}']
+          + NEW_ONE_D + TWO_D)
+
+
+def _line(values, keys=None):
+    keys = keys or [f'k{i}' for i in range(len(values))]
+    return ' '.join(f'{k}={v}' for k, v in zip(keys, values))
+
+
+def _assert_same(got, want):
+    assert list(got) == list(want)
+    for key in want:
+        g, w = got[key], want[key]
+        assert type(g) is type(w), key
+        if isinstance(w, np.ndarray):
+            assert g.dtype == w.dtype and g.shape == w.shape, key
+            np.testing.assert_array_equal(g, w)
+        else:
+            assert g == w, key
+
+
+def _both(line):
+    # parse twice: the visitors rewrite the tree they are given
+    assert grammar.parse(line).is_valid, line
+    return (result_to_dict(grammar.parse(line)),
+            _result_to_dict_visitors(grammar.parse(line)))
+
+
+@pytest.mark.parametrize('value', VALUES)
+def test_value_matches_visitors(value):
+    _assert_same(*_both(_line([value])))
+
+
+def test_line_matches_visitors():
+    line = _line(VALUES, keys=[f'k{i}' if i % 3 else f'"key {i}"'
+                               for i in range(len(VALUES))])
+    line += ' Properties=species:S:1:pos:R:3 last = 1'
+    got, want = _both(line)
+    _assert_same(got, want)
+    assert got['properties'] == 'species:S:1:pos:R:3'
+    assert got['key 0'] == 1
+
+
+def test_pairs_in_any_order():
+    for values in itertools.islice(itertools.permutations(TWO_D[:3] + ONE_D[:2]), 20):
+        _assert_same(*_both(_line([f'"{v}"' if ' ' in v and '[' not in v else v
+                                   for v in values])))
+
+
+def test_duplicate_key():
+    with pytest.raises(KeyError, match='duplicate key a'):
+        result_to_dict(grammar.parse('a=1 b=2 a=3'))
@@ -0,0 +1,147 @@
+"""``iread_dicts(lazy=True)`` yields :class:`LazyFrame` instances whose
+columns are only parsed on first access. Every column must equal (value,
+dtype and shape) what the eager reader of the same backend gives."""
+import copy
+
+import numpy as np
+import pytest
+
+from extxyz import (Frame, LazyFrame, cextxyz, iread_dicts, read_dicts,
+                    write_dicts)
+from extxyz.core import LazyArrays
+
+
+def _frames():
+    rng = np.random.default_rng(5)
+    frames = []
+    for k in range(6):
+        n = 1 + k % 4
+        arrays = {"species": np.array(["H", "Oxxxxxxxxx", "C", "N"][:n]),
+                  "pos": rng.random((n, 3)),
+                  "forces": rng.standard_normal((n, 3)),
+                  "Z": rng.integers(1, 100, n),
+                  "move_mask": rng.random((n, 3)) > 0.5,
+                  "fixed": rng.random(n) > 0.5}
+        frames.append(Frame(natoms=n, cell=np.eye(3) * (k + 1),
+                            pbc=np.array([True, False, True]),
+                            info={"energy": -float(k), "step": k},
+                            arrays=arrays))
+    return frames
+
+
+@pytest.fixture
+def traj(tmp_path):
+    path = tmp_path / "traj.xyz"
+    write_dicts(path, _frames(), use_cextxyz=True)
+    return path
+
+
+@pytest.mark.parametrize("use_cextxyz", [True, False])
+def test_lazy_matches_eager(traj, use_cextxyz):
+    want = list(iread_dicts(traj, use_cextxyz=use_cextxyz))
+    got = list(iread_dicts(traj, use_cextxyz=use_cextxyz, lazy=True))
+    assert len(got) == len(want) == 6
+    for g, w in zip(got, want):
+        assert isinstance(g, LazyFrame) and isinstance(g.arrays, LazyArrays)
+        assert g.natoms == w.natoms and g.info == w.info
+        np.testing.assert_array_equal(g.cell, w.cell)
+        np.testing.assert_array_equal(g.pbc, w.pbc)
+        assert list(g.arrays) == list(w.arrays)
+        assert g.arrays.loaded == []
+        for key in reversed(list(w.arrays)):
+            assert g.arrays[key].dtype == w.arrays[key].dtype, key
+            assert g.arrays[key].shape == w.arrays[key].shape, key
+            np.testing.assert_array_equal(g.arrays[key], w.arrays[key])
+        assert g.arrays.loaded == list(w.arrays)
+
+
+def test_columns_parsed_on_demand(traj):
+    frame = list(iread_dicts(traj, lazy=True))[3]
+    assert frame.info["energy"] == -3.0
+    forces = frame.arrays["forces"]
+    assert frame.arrays.loaded == ["forces"]
+    assert frame.arrays["forces"] is forces
+    frame.arrays["charge"] = np.zeros(3)
+    del frame.arrays["Z"]
+    assert list(frame.arrays) == ["species", "pos", "forces", "move_mask",
+                                  "fixed", "charge"]
+    with pytest.raises(KeyError):
+        frame.arrays["Z"]
+    plain = frame.materialize()
+    assert type(plain) is Frame and type(plain.arrays) is dict
+    assert list(plain.arrays) == list(frame.arrays)
+    assert type(copy.deepcopy(frame).arrays) is dict
+
+
+@pytest.mark.parametrize("use_cextxyz", [True, False])
+def test_properties_and_lines(traj, use_cextxyz):
+    frame = list(iread_dicts(traj, lazy=True, use_cextxyz=use_cextxyz))[3]
+    assert [name for name, _, _ in frame.arrays.properties.properties] == [
+        "species", "pos", "forces", "Z", "move_mask", "fixed"]
+    lines = frame.arrays.lines()
+    assert len(lines) == frame.natoms == 4
+    assert lines[0].split()[0] == "H"
+    assert frame.arrays.loaded == []
+
+
+def test_lazy_frames_write_back(traj, tmp_path):
+    frames = list(iread_dicts(traj, lazy=True))
+    for use_cextxyz in (True, False):
+        out = tmp_path / f"out{use_cextxyz}.xyz"
+        write_dicts(out, frames, use_cextxyz=use_cextxyz)
+        for g, w in zip(read_dicts(out), read_dicts(traj)):
+            np.testing.assert_allclose(g.arrays["forces"], w.arrays["forces"])
+
+
+def test_fortran_floats_and_bad_fields(tmp_path):
+    path = tmp_path / "f.xyz"
+    path.write_text("2\nProperties=species:S:1:pos:R:3:tag:I:1 a=1\n"
+                    "H 1.5d0 0 0 1\nH 0 0 2.0D1 x\n")
+    for use_cextxyz in (True, False):
+        frame = read_dicts(path, use_cextxyz=use_cextxyz, lazy=True)
+        np.testing.assert_array_equal(frame.arrays["pos"][:, 0], [1.5, 0])
+        assert frame.arrays["pos"][1, 2] == 20.0
+        with pytest.raises(ValueError):
+            frame.arrays["tag"]
+
+
+@pytest.mark.parametrize("token", ["inf", "-nan", "Infinity", "1.5e"])
+def test_invalid_floats_match_eager(tmp_path, token):
+    path = tmp_path / "f.xyz"
+    path.write_text("2\nProperties=species:S:1:pos:R:3\n"
+                    f"H 1e400 0 0\nH 0 {token} 1\n")
+    with pytest.raises(cextxyz.ExtXYZError, match="invalid field"):
+        read_dicts(path)
+    frame = read_dicts(path, lazy=True)
+    with pytest.raises(ValueError):
+        frame.arrays["pos"]
+    # an exponent out of range is valid for both, and overflows to inf
+    path.write_text("1\nProperties=species:S:1:pos:R:3\nH 1e400 -1d999 0\n")
+    want = read_dicts(path).arrays["pos"]
+    np.testing.assert_array_equal(read_dicts(path, lazy=True).arrays["pos"],
+                                  want)
+    assert np.isinf(want[0, :2]).all()
+
+
+@pytest.mark.parametrize("use_cextxyz", [True, False])
+def test_truncated_still_detected(traj, use_cextxyz):
+    # drop the last atom line: a last line merely cut short is only found to
+    # be bad when a column is parsed
+    traj.write_bytes(traj.read_bytes().rsplit(b"\n", 2)[0] + b"\n")
+    frames = iread_dicts(traj, use_cextxyz=use_cextxyz, lazy=True)
+    assert len([next(frames) for _ in range(5)]) == 5
+    with pytest.raises(Exception, match="Truncated frame"):
+        next(frames)
+    assert len(list(iread_dicts(traj, use_cextxyz=use_cextxyz, lazy=True,
+                                on_truncated="drop"))) == 5
+
+
+def test_open_c_file_needs_path(traj):
+    fp = cextxyz.cfopen(str(traj), "r")
+    try:
+        with pytest.raises(ValueError, match="needs a file path"):
+            next(iread_dicts(fp, lazy=True))
+        # the eager reader still takes the open file
+        assert next(iread_dicts(fp)).info["step"] == 0
+    finally:
+        cextxyz.cfclose(fp)
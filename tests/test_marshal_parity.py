@@ -105,9 +105,9 @@ def test_c_path_raises_eof_at_end():
     try:
         fp = cextxyz.cfopen(name, 'r')
         try:
-            cextxyz._ext_mod.read_frame(cextxyz._kv_grammar.value, fp.value, 1, None)
+            cextxyz._ext_mod.read_frame(cextxyz._get_kv_grammar().value, fp.value, 1, None)
             with pytest.raises(EOFError):
-                cextxyz._ext_mod.read_frame(cextxyz._kv_grammar.value, fp.value, 1, None)
+                cextxyz._ext_mod.read_frame(cextxyz._get_kv_grammar().value, fp.value, 1, None)
         finally:
             cextxyz.cfclose(fp)
     finally:
@@ -0,0 +1,56 @@
+"""``iread_dicts(prefetch=N)`` parses on a background thread but must yield
+exactly what the demand-driven iterator yields, in order, and surface errors
+at the same point."""
+import threading
+
+import numpy as np
+import pytest
+
+from extxyz import Frame, iread_dicts, write_dicts
+
+
+@pytest.fixture
+def traj(tmp_path):
+    path = tmp_path / "traj.xyz"
+    write_dicts(path, [Frame(natoms=4, cell=np.eye(3) * 6,
+                             pbc=np.array([True] * 3),
+                             info={"step": k},
+                             arrays={"species": np.array(["C"] * 4),
+                                     "pos": np.full((4, 3), float(k))})
+                       for k in range(25)], use_cextxyz=True)
+    return path
+
+
+@pytest.mark.parametrize("use_cextxyz", [True, False])
+@pytest.mark.parametrize("prefetch", [1, 4, 100])
+def test_prefetch_matches(traj, use_cextxyz, prefetch):
+    kw = dict(use_cextxyz=use_cextxyz)
+    want = list(iread_dicts(traj, **kw))
+    got = list(iread_dicts(traj, prefetch=prefetch, **kw))
+    assert [f.info for f in got] == [f.info for f in want]
+    for g, w in zip(got, want):
+        np.testing.assert_array_equal(g.arrays["pos"], w.arrays["pos"])
+    sliced = iread_dicts(traj, slice(3, 20, 4), prefetch=prefetch, **kw)
+    assert [f.info["step"] for f in sliced] == [3, 7, 11, 15, 19]
+
+
+def test_prefetch_early_exit(traj):
+    before = threading.active_count()
+    frames = iread_dicts(traj, prefetch=2)
+    assert [next(frames).info["step"] for _ in range(3)] == [0, 1, 2]
+    frames.close()
+    for t in threading.enumerate():
+        if t.name == "extxyz-prefetch":
+            t.join(5)
+    assert threading.active_count() == before
+
+
+def test_prefetch_error(traj):
+    data = traj.read_bytes()
+    traj.write_bytes(data[:-20])
+    frames = iread_dicts(traj, prefetch=3)
+    assert len([next(frames) for _ in range(24)]) == 24
+    with pytest.raises(Exception, match="Truncated frame"):
+        next(frames)
+    with pytest.raises(ValueError):
+        next(iread_dicts(traj, prefetch=-1))
@@ -0,0 +1,110 @@
+"""Negative indices, negative steps and strided slices in ``iread_dicts``:
+frames are located by the frame-boundary scan and read after a seek, and must
+be exactly those a forward read of the whole file selects."""
+import numpy as np
+import pytest
+
+from extxyz import Frame, cextxyz, core, iread_dicts, write_dicts
+
+INDICES = [-1, -4, 0, 3, 9, 12, -12, slice(-3, None), slice(None, None, -1),
+           slice(-2, 1, -3), slice(2, None, 3), slice(3, None), slice(1, 8, 2),
+           slice(2, -2), slice(20, None), slice(None, 5, 2)]
+
+
+@pytest.fixture
+def traj(tmp_path):
+    path = tmp_path / "traj.xyz"
+    write_dicts(path, [Frame(natoms=1 + k % 3, cell=np.eye(3) * 5,
+                             pbc=np.array([True] * 3), info={"step": k},
+                             arrays={"species": np.array(["Si"] * (1 + k % 3)),
+                                     "pos": np.full((1 + k % 3, 3), float(k))})
+                       for k in range(10)], use_cextxyz=True)
+    return path
+
+
+@pytest.mark.parametrize("use_cextxyz", [True, False])
+@pytest.mark.parametrize("index", INDICES)
+def test_matches_forward_read(traj, use_cextxyz, index):
+    steps = list(range(10))
+    if isinstance(index, int):
+        want = steps[index:index + 1 or None]
+    else:
+        want = steps[index]
+    got = list(iread_dicts(traj, index, use_cextxyz=use_cextxyz))
+    assert [f.info["step"] for f in got] == want
+    for f in got:
+        assert f.arrays["pos"][0, 0] == f.info["step"]
+
+
+def test_only_selected_frames_parsed(traj, monkeypatch):
+    calls = []
+    read = core._read_frame_dict
+
+    def counting(*args, **kwargs):
+        frame = read(*args, **kwargs)
+        calls.append(None if frame is None else frame.info["step"])
+        return frame
+
+    monkeypatch.setattr(core, "_read_frame_dict", counting)
+    assert [f.info["step"] for f in iread_dicts(traj, -1)] == [9]
+    # the read past the last frame, then the last frame
+    assert calls == [None, 9]
+    calls.clear()
+    list(iread_dicts(traj, slice(1, 8, 3)))
+    assert calls == [1, 4, 7]
+
+
+def test_scan_frames(traj):
+    fp = cextxyz.cfopen(str(traj), "r")
+    try:
+        offsets, end = cextxyz.scan_frames(fp, chunk=3)
+        assert cextxyz.cftell(fp) == end == traj.stat().st_size
+        cextxyz.cfseek(fp, 0, 0)
+        head, mid = cextxyz.scan_frames(fp, max_frames=4)
+        assert cextxyz.cftell(fp) == mid
+    finally:
+        cextxyz.cfclose(fp)
+    lines = traj.read_bytes().splitlines(keepends=True)
+    want, pos, i = [], 0, 0
+    while i < len(lines):
+        want.append(pos)
+        n = int(lines[i]) + 2
+        pos += sum(len(line) for line in lines[i:i + n])
+        i += n
+    np.testing.assert_array_equal(offsets, want)
+    np.testing.assert_array_equal(head, want[:4])
+    assert mid == want[4]
+
+
+@pytest.mark.parametrize("use_cextxyz", [True, False])
+def test_truncated_tail(traj, use_cextxyz):
+    data = traj.read_bytes()
+    traj.write_bytes(data[:data.rindex(b"\n", 0, -1) + 1])   # last atom line
+    with pytest.raises(cextxyz.ExtXYZError, match="Truncated frame"):
+        list(iread_dicts(traj, -1, use_cextxyz=use_cextxyz))
+    got = iread_dicts(traj, slice(None, None, 4), use_cextxyz=use_cextxyz)
+    assert [next(got).info["step"] for _ in range(3)] == [0, 4, 8]
+    got = iread_dicts(traj, slice(1, None, 4), use_cextxyz=use_cextxyz)
+    assert [next(got).info["step"] for _ in range(2)] == [1, 5]
+    with pytest.raises(cextxyz.ExtXYZError, match="Truncated frame"):
+        next(got)
+    frames = iread_dicts(traj, slice(-2, None), use_cextxyz=use_cextxyz,
+                         on_truncated="drop")
+    assert [f.info["step"] for f in frames] == [7, 8]
+
+
+def test_offsets_follow_file_changes(traj):
+    assert next(iread_dicts(traj, -1)).info["step"] == 9
+    with open(traj, "a") as fh:
+        fh.write("1\nProperties=species:S:1:pos:R:3 step=10\nSi 0 0 0\n")
+    assert next(iread_dicts(traj, -1)).info["step"] == 10
+    assert [f.info["step"] for f in iread_dicts(traj, slice(-3, None, 2))] \
+        == [8, 10]
+
+
+def test_negative_index_needs_path(traj):
+    with open(traj) as fh:
+        with pytest.raises(ValueError):
+            next(iread_dicts(fh, -1, use_cextxyz=False))
+    with pytest.raises(ValueError):
+        next(iread_dicts(traj, -1, follow=True))
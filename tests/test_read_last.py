@@ -0,0 +1,123 @@
+"""``read_last`` finds the last frames by reading the file backwards; it must
+return what a forward read of the whole file ends with."""
+import numpy as np
+import pytest
+
+from extxyz import (Frame, cextxyz, core, iread_dicts, read_dicts, read_last,
+                    write_dicts)
+
+
+def _write(path, natoms, comment=None):
+    frames = [Frame(natoms=nat, cell=np.eye(3) * 4, pbc=np.array([True] * 3),
+                    info={"step": k},
+                    arrays={"species": np.array(["Ar"] * nat),
+                            "pos": np.full((nat, 3), float(k))})
+              for k, nat in enumerate(natoms)]
+    write_dicts(path, frames, use_cextxyz=True)
+    if comment is not None:
+        # a natoms-like comment line can mislead the backward scan
+        lines = path.read_text().splitlines(keepends=True)
+        lines[-natoms[-1] - 1] = comment
+        path.write_text("".join(lines))
+
+
+def _steps(frames):
+    return [f.info.get("step") for f in frames]
+
+
+@pytest.mark.parametrize("n", [1, 2, 5, 20])
+def test_matches_forward_read(tmp_path, n):
+    path = tmp_path / "traj.xyz"
+    _write(path, [3, 1, 40, 2, 7, 1, 3])
+    got = read_last(path, n)
+    want = list(iread_dicts(path, slice(-n, None)))
+    assert _steps(got) == _steps(want) == list(range(7))[-n:]
+    for g, w in zip(got, want):
+        np.testing.assert_array_equal(g.arrays["pos"], w.arrays["pos"])
+
+
+@pytest.mark.parametrize("block", [1, 16, 1 << 16])
+def test_block_sizes(tmp_path, block):
+    path = tmp_path / "traj.xyz"
+    _write(path, [5, 100, 1, 2])
+    with open(path, "rb") as fh:
+        got, stop = core._find_last_frames(fh, 3, False, block=block)
+    np.testing.assert_array_equal(got, core._frame_offsets(str(path), False)[1:4])
+    assert stop == path.stat().st_size
+
+
+def test_endings(tmp_path):
+    path = tmp_path / "traj.xyz"
+    _write(path, [2, 3])
+    data = path.read_bytes()
+    path.write_bytes(data + b"\n  \n")
+    assert _steps(read_last(path, 5)) == [0, 1]
+    path.write_bytes(data[:-1])
+    assert _steps(read_last(path)) == [1]
+    assert _steps(read_last(path, on_truncated="drop")) == [0]
+    path.write_bytes(data.replace(b"\n", b"\r\n"))
+    assert _steps(read_last(path, 2)) == [0, 1]
+
+
+def test_last_frame_must_end_at_stop(tmp_path, monkeypatch):
+    """A last frame whose parse stops short of where the scan put the end of
+    the data is not trusted: the file is read forwards instead."""
+    path = tmp_path / "traj.xyz"
+    _write(path, [2, 3])
+    find = core._find_last_frames
+    monkeypatch.setattr(core, "_find_last_frames",
+                        lambda *args: (find(*args)[0], 1 << 20))
+    forward = []
+    iread = core.iread_dicts
+    monkeypatch.setattr(core, "iread_dicts",
+                        lambda *args, **kw: forward.append(args) or
+                        iread(*args, **kw))
+    assert _steps(read_last(path)) == [1]
+    assert len(forward) == 1
+
+
+def test_truncated(tmp_path):
+    path = tmp_path / "traj.xyz"
+    _write(path, [2, 3, 4])
+    data = path.read_bytes()
+    for cut in [data.rindex(b"\n", 0, -1) + 1, data.rindex(b"4\n") + 2]:
+        path.write_bytes(data[:cut])
+        with pytest.raises(cextxyz.ExtXYZError, match="Truncated frame"):
+            read_last(path)
+        assert _steps(read_last(path, 2, on_truncated="drop")) == [0, 1]
+
+
+@pytest.mark.parametrize("n", [1, 2])
+def test_natoms_like_comment(tmp_path, n):
+    path = tmp_path / "traj.xyz"
+    _write(path, [2, 3, 4], comment="3\n")
+    got = read_last(path, n)
+    want = list(iread_dicts(path, slice(-n, None)))
+    assert [f.natoms for f in got] == [f.natoms for f in want] == [3, 4][-n:]
+    assert got[-1].info == want[-1].info
+
+
+@pytest.mark.parametrize("text", [
+    # an integer comment line larger than natoms
+    "3\n5\nH 0 0 0\nH 1 1 1\nH 2 2 2\n" * 2,
+    # atom lines of an integer-only Properties
+    "3\nProperties=z:I:1\n5\n7\n2\n" * 2,
+])
+def test_integer_lines_not_truncated(tmp_path, text):
+    path = tmp_path / "traj.xyz"
+    path.write_text(text)
+    want = read_dicts(path)
+    for n in (1, 2):
+        got = read_last(path, n)
+        assert [f.natoms for f in got] == [3] * n
+        for g, w in zip(got, want[-n:]):
+            assert g.info == w.info
+            for key in w.arrays:
+                np.testing.assert_array_equal(g.arrays[key], w.arrays[key])
+
+
+def test_bad_arguments(tmp_path):
+    with pytest.raises(ValueError):
+        read_last(tmp_path / "x.xyz", 0)
+    with pytest.raises(FileNotFoundError):
+        read_last(tmp_path / "x.xyz")
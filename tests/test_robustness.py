@@ -82,8 +82,9 @@ def test_malformed_properties_does_not_crash(tmp_path, props):
 def test_truncated_file_errors_cleanly(tmp_path):
     """natoms claims more rows than present -> the C parser bails after info and
     arrays are built (it frees the partial dicts; verified separately via
-    `leaks`). The high-level read treats the short frame as EOF, so this must
-    finish cleanly without crashing."""
+    `leaks`). The high-level read reports the short frame as a "Truncated
+    frame" ExtXYZError (or drops it with on_truncated='drop', see
+    test_truncated.py), so this must finish cleanly without crashing."""
     content = f"3\n{LATTICE} Properties=species:S:1:pos:R:3\nH 0 0 0\n"
     proc = _run_cextxyz_parse(tmp_path, content)
     assert proc.returncode not in CRASH_SIGNALS, (proc.stdout, proc.stderr)
@@ -0,0 +1,111 @@
+"""``extxyz.stats``: the C reader's per-phase timers and counters are off by
+default, and count what was read once enabled."""
+import numpy as np
+import pytest
+
+import extxyz
+from extxyz import Frame, cextxyz, read_dicts, stats, write_dicts
+
+
+@pytest.fixture
+def traj(tmp_path):
+    path = tmp_path / "traj.xyz"
+    write_dicts(path, [Frame(natoms=3, cell=np.eye(3) * 5,
+                             pbc=np.array([True] * 3), info={"step": k},
+                             arrays={"species": np.array(["O", "H", "H"]),
+                                     "pos": np.full((3, 3), k + 0.5)})
+                       for k in range(4)], use_cextxyz=True)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def _restore():
+    yield
+    stats.disable()
+
+
+def test_off_by_default(traj):
+    assert extxyz.stats is stats
+    assert not stats.enabled()
+    before = stats.snapshot()
+    read_dicts(traj)
+    assert stats.snapshot() == before
+
+
+@pytest.mark.parametrize("use_cleri", [True, False])
+def test_counts(traj, use_cleri):
+    with stats.measure() as got:
+        read_dicts(traj, use_cleri=use_cleri)
+    assert not stats.enabled()
+    assert list(got) == list(stats.NAMES)
+    assert got["frames"] == 4
+    assert got["lines"] == 4 * 5
+    assert got["bytes"] == traj.stat().st_size
+    assert got["comments_cleri" if use_cleri else "comments_dispatch"] == 4
+    # 9 positions per frame, plus the Lattice floats from the comment line
+    assert got["floats_fast"] >= 4 * 9
+    assert got["floats_strtod"] == 0
+    assert got["plans_built"] >= 1 and got["mallocs"] > 0
+    for name in ("line_io_ns", "comment_ns", "plan_ns", "tokenize_ns",
+                 "fields_ns"):
+        assert got[name] > 0, name
+    if cextxyz._HAVE_C_READ and not cextxyz._USE_LEGACY_MARSHAL:
+        assert got["marshal_ns"] > 0
+
+
+@pytest.mark.skipif(not cextxyz._HAVE_C_READ_STATE,
+                    reason="_extxyz built without ReadState")
+def test_cache_and_plan_reuse(traj):
+    with stats.measure() as got:
+        read_dicts(traj, comment_cache=8)
+    assert got["plans_built"] == 1
+    assert got["comments_cached"] == 0     # every comment line differs
+    with open(traj, "a") as fh:
+        fh.write("1\nProperties=species:S:1:pos:R:3 step=9\n"
+                 "H 0.12345678901234567890123 0 0\n")
+        fh.write("1\nProperties=species:S:1:pos:R:3 step=9\n"
+                 "H 0 0 0\n")
+    with stats.measure() as got:
+        read_dicts(traj, comment_cache=8)
+    assert got["comments_cached"] == 1
+    assert got["floats_strtod"] == 1
+
+
+def test_reset_and_enable(traj):
+    stats.enable()
+    read_dicts(traj)
+    assert stats.snapshot()["frames"] >= 4
+    stats.reset()
+    assert set(stats.snapshot().values()) == {0}
+    stats.disable()
+    read_dicts(traj)
+    assert stats.snapshot()["frames"] == 0
+
+
+def test_float_profile(tmp_path, capsys):
+    path = tmp_path / "mixed.xyz"
+    with open(path, "w") as fh:
+        for k in range(3):
+            fh.write("2\nProperties=species:S:1:pos:R:3:forces:R:3:tag:I:1\n")
+            fh.write(f"H 1.5 2.0D-3 .5 0.12345678901234567890 -1 0.25 {k}\n"
+                     f"H 3 1. +4e2 -10.12345678901234567890 0.000001 7 {k}\n")
+    profiles = stats.float_profile(path)
+    assert list(profiles) == ["pos", "forces"]
+    pos, forces = profiles.values()
+    assert (pos.floats, pos.fast, pos.recommendation()) == (18, 18, None)
+    assert (forces.floats, forces.fast) == (18, 12)
+    assert forces.slow_digits == {20: 3, 22: 3}
+    assert forces.slow_shapes == {"9.9{20}": 3, "-99.9{20}": 3}
+    assert forces.recommendation().startswith(
+        "column forces: 66.67% fast path, 20 significant digits")
+    # the same tokens miss the fast path in the reader itself
+    with stats.measure() as got:
+        read_dicts(path)
+    assert got["floats_strtod"] == 6
+    assert stats.float_profile(path, slice(1, 2))["forces"].floats == 6
+
+    from extxyz.cli import main
+    main(["profile", str(path), "-n", "1"])
+    out = capsys.readouterr().out
+    assert "1 frame(s)" in out and "-99.9{20} (16.7%)" in out
+    assert "* column forces: 66.67% fast path" in out
@@ -0,0 +1,89 @@
+"""Stress test: the C reader releases the GIL, so frames parsed from many
+threads at once (sharing the module's one compiled grammar) must come out
+exactly as they do when read serially, with either comment-line parser."""
+import threading
+
+import numpy as np
+import pytest
+
+from extxyz import Frame, cextxyz, read_dicts, write_dicts
+
+pytestmark = pytest.mark.skipif(not cextxyz._HAVE_C_READ,
+                                reason="C read path not built")
+
+N_THREADS = 8
+
+
+def _write(path, seed):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for k in range(40):
+        n = int(rng.integers(1, 6))
+        info = {"energy": float(rng.standard_normal()), "step": k,
+                "label": f"conf {seed}-{k}", "flags": [True, False, k % 2 == 0],
+                "virial": rng.standard_normal((3, 3))}
+        frames.append(Frame(natoms=n, cell=np.eye(3) * (5 + k),
+                            pbc=np.array([True, True, k % 3 == 0]), info=info,
+                            arrays={"species": rng.choice(["H", "O", "Fe"], n),
+                                    "pos": rng.random((n, 3)),
+                                    "tag": rng.integers(-9, 9, n)}))
+    write_dicts(path, frames, use_cextxyz=True)
+
+
+def _same(a, b):
+    assert len(a) == len(b)
+    for fa, fb in zip(a, b):
+        assert fa.info.keys() == fb.info.keys()
+        for key in fa.info:
+            np.testing.assert_array_equal(fa.info[key], fb.info[key])
+        for key in fa.arrays:
+            np.testing.assert_array_equal(fa.arrays[key], fb.arrays[key])
+        np.testing.assert_array_equal(fa.cell, fb.cell)
+
+
+def test_concurrent_reads_match_serial(tmp_path):
+    paths = []
+    for i in range(4):
+        paths.append(tmp_path / f"traj{i}.xyz")
+        _write(paths[-1], i)
+    modes = [dict(use_cleri=c, use_regex=r) for c in (True, False) for r in (False, True)]
+    want = {(str(p), i): read_dicts(p, **m) for p in paths for i, m in enumerate(modes)}
+
+    errors = []
+    start = threading.Barrier(N_THREADS)
+
+    def worker(t):
+        try:
+            start.wait()
+            for rep in range(6):
+                for j, p in enumerate(paths):
+                    i = (t + rep + j) % len(modes)
+                    _same(read_dicts(p, **modes[i]), want[(str(p), i)])
+        except Exception as exc:   # surfaced in the main thread below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(N_THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors, errors[0]
+
+
+def test_concurrent_writes(tmp_path):
+    rng = np.random.default_rng(40)
+    frame = Frame(natoms=3, cell=np.eye(3), pbc=np.array([True] * 3),
+                  info={"e": 1.5}, arrays={"species": np.array(["H"] * 3),
+                                           "pos": rng.random((3, 3))})
+
+    def worker(t):
+        write_dicts(tmp_path / f"w{t}.xyz", [frame] * 50, use_cextxyz=True)
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(N_THREADS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    want = (tmp_path / "w0.xyz").read_bytes()
+    for t in range(1, N_THREADS):
+        assert (tmp_path / f"w{t}.xyz").read_bytes() == want
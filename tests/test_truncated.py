@@ -0,0 +1,109 @@
+"""A last frame cut short by the end of the file -- a writer killed mid-frame,
+or a file still being written -- raises "Truncated frame" by default and is
+skipped with ``on_truncated='drop'``, for the C and pure-Python readers and
+for the ctypes read path. ``Writer(atomic=True)`` writes each frame with a
+single write so readers never see a partial frame from a live writer.
+"""
+import numpy as np
+import pytest
+
+from extxyz import Writer, cextxyz, iread_dicts, read_dicts, write_dicts
+
+
+@pytest.fixture
+def full(make_frames, tmp_path):
+    """Bytes of a complete three-frame, two-atom file."""
+    path = tmp_path / "full.xyz"
+    write_dicts(path, make_frames(), use_cextxyz=True)
+    return path.read_bytes()
+
+
+def _cut(tmp_path, data, nbytes):
+    path = tmp_path / "cut.xyz"
+    path.write_bytes(data[:nbytes])
+    return path
+
+
+def _last_frame_cuts(data):
+    """Cut points inside the last frame: after the natoms line, after the
+    comment line, after the first atom line (all on line boundaries) and in
+    the middle of the second atom line."""
+    start = data.rindex(b"\n2\n") + 1
+    lines = data[start:].split(b"\n")
+    ends = np.cumsum([len(line) + 1 for line in lines[:3]]) + start
+    return [int(e) for e in ends] + [int(ends[-1]) + len(lines[3]) // 2]
+
+
+@pytest.fixture(params=[True, False], ids=["c", "python"])
+def use_cextxyz(request):
+    return request.param
+
+
+@pytest.fixture(params=[False, True], ids=["capi", "ctypes"])
+def legacy_marshal(request, monkeypatch):
+    monkeypatch.setattr(cextxyz, "_USE_LEGACY_MARSHAL", request.param)
+    return request.param
+
+
+def test_truncated_raises(tmp_path, full, use_cextxyz, legacy_marshal):
+    for nbytes in _last_frame_cuts(full):
+        path = _cut(tmp_path, full, nbytes)
+        with pytest.raises(cextxyz.ExtXYZError, match="Truncated frame"):
+            read_dicts(path, use_cextxyz=use_cextxyz)
+
+
+def test_truncated_drop(tmp_path, full, use_cextxyz, legacy_marshal):
+    for nbytes in _last_frame_cuts(full):
+        path = _cut(tmp_path, full, nbytes)
+        frames = list(iread_dicts(path, use_cextxyz=use_cextxyz,
+                                  on_truncated="drop"))
+        assert [f.info["step"] for f in frames] == [0, 1]
+
+
+def test_missing_final_newline(tmp_path, full, use_cextxyz):
+    """A last atom line without its newline parses by default, but with
+    ``on_truncated='drop'`` it may still be growing, so the frame is held
+    back."""
+    path = _cut(tmp_path, full, len(full) - 1)
+    assert len(read_dicts(path, use_cextxyz=use_cextxyz)) == 3
+    frames = list(iread_dicts(path, use_cextxyz=use_cextxyz,
+                              on_truncated="drop"))
+    assert len(frames) == 2
+
+
+def test_complete_file_unchanged(tmp_path, full, use_cextxyz):
+    path = tmp_path / "full.xyz"
+    frames = list(iread_dicts(path, use_cextxyz=use_cextxyz,
+                              on_truncated="drop"))
+    assert [f.info["step"] for f in frames] == [0, 1, 2]
+
+
+def test_bad_on_truncated(tmp_path):
+    with pytest.raises(ValueError):
+        list(iread_dicts(tmp_path / "x.xyz", on_truncated="ignore"))
+
+
+@pytest.mark.parametrize("async_", [False, True])
+def test_atomic_writer_matches(tmp_path, make_frames, full, async_):
+    out = tmp_path / "out.xyz"
+    with Writer(out, atomic=True, async_=async_) as w:
+        w.write(make_frames())
+    assert out.read_bytes() == full
+
+
+def test_atomic_append_then_crash(tmp_path, make_frames, full):
+    """Frames appended atomically stay readable with ``on_truncated='drop'``
+    when a later write is cut short."""
+    path = tmp_path / "out.xyz"
+    with Writer(path, atomic=True) as w:
+        w.write(make_frames()[:1])
+    with Writer(path, "a", atomic=True) as w:
+        w.write(make_frames()[1:2])
+        w.flush()
+        assert len(list(iread_dicts(path, on_truncated="drop"))) == 2
+    with open(path, "ab") as fh:  # a non-atomic writer killed mid-frame
+        fh.write(full[full.rindex(b"\n2\n") + 1:_last_frame_cuts(full)[-1]])
+    frames = list(iread_dicts(path, on_truncated="drop"))
+    assert [f.info["step"] for f in frames] == [0, 1]
+    with pytest.raises(cextxyz.ExtXYZError, match="Truncated frame"):
+        read_dicts(path)
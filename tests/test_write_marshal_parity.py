@@ -0,0 +1,87 @@
+"""Parity tests: the C-API write marshalling (_extxyz.write_frame,
+libextxyz/pyext.c) must write byte-for-byte what the legacy ctypes
+marshalling (cextxyz.py_to_c_dict) writes. Both go through
+cextxyz.write_frame_dicts, which honours cextxyz._USE_LEGACY_MARSHAL per call,
+so we write each frame both ways and compare the files.
+"""
+import numpy as np
+import pytest
+
+from extxyz import Frame, cextxyz, read_dicts, write_dicts
+
+pytestmark = pytest.mark.skipif(
+    not cextxyz._HAVE_C_WRITE,
+    reason="C-API write path not built (numpy-less build)")
+
+
+def _frame(info=None, **arrays):
+    n = 3
+    base = {"species": np.array(["C", "Hh", "O"]),
+            "pos": np.arange(9, dtype=float).reshape(3, 3) / 7}
+    base.update(arrays)
+    return Frame(natoms=n, cell=np.diag([4.3, 3.3, 7.0]),
+                 pbc=np.array([True, True, False]), info=info or {},
+                 arrays=base)
+
+
+FRAMES = {
+    "minimal": _frame(),
+    "info_scalars": _frame({"str": "astring", "quot": 'quoted "value"',
+                            "false_value": False, "integer": 22,
+                            "floating": 1.1, "np_float": np.float64(-0.5),
+                            "zero_d": np.array(3)}),
+    "info_arrays": _frame({"int_array": [1, 2, 3], "float_array": (3.3, 4.4),
+                           "bool_array": np.array([True, False, True]),
+                           "virial": np.arange(9).reshape(3, 3),
+                           "stress": np.eye(3) * 0.25,
+                           "int64": np.array([2**31 - 1, -2**31]),
+                           "strings": ["a", "b c"]}),
+    "peratom": _frame(tag=np.array([5, -7, 0], dtype=np.int32),
+                      tag64=np.array([5, -7, 0]),
+                      flag=np.array([True, False, True]),
+                      force=np.array([[1.5, -2.5, 3.5], [0, 0, -0.0],
+                                      [9, 8, 7]]),
+                      f32=np.ones((3, 2), dtype=np.float32) / 3,
+                      fortran=np.asfortranarray(np.arange(6.).reshape(3, 2)),
+                      strided=np.arange(12.).reshape(3, 4)[:, ::2],
+                      utf8=np.array(["é", "日本", "x"])),
+}
+
+
+@pytest.fixture(autouse=True)
+def _restore_marshal_flag():
+    saved = cextxyz._USE_LEGACY_MARSHAL
+    yield
+    cextxyz._USE_LEGACY_MARSHAL = saved
+
+
+def _write(path, frames, legacy, **kw):
+    cextxyz._USE_LEGACY_MARSHAL = legacy
+    write_dicts(path, frames, use_cextxyz=True, **kw)
+    return path.read_bytes()
+
+
+@pytest.mark.parametrize("name", sorted(FRAMES))
+def test_capi_write_matches_legacy(tmp_path, name):
+    frames = [FRAMES[name]]
+    new = _write(tmp_path / "new.xyz", frames, False)
+    old = _write(tmp_path / "old.xyz", frames, True)
+    assert new == old
+
+
+def test_columns_and_format_dict_match_legacy(tmp_path):
+    frames = list(FRAMES.values())
+    kw = dict(columns=["pos", "species"],
+              format_dict={"R": "%.12f", "S": "%-4s"})
+    new = _write(tmp_path / "new.xyz", frames, False, **kw)
+    old = _write(tmp_path / "old.xyz", frames, True, **kw)
+    assert new == old
+    assert len(read_dicts(tmp_path / "new.xyz")) == len(frames)
+
+
+@pytest.mark.parametrize("legacy", [False, True])
+def test_unsupported_value_is_type_error(tmp_path, legacy):
+    frame = _frame({"obj": object()})
+    cextxyz._USE_LEGACY_MARSHAL = legacy
+    with pytest.raises(TypeError):
+        write_dicts(tmp_path / "bad.xyz", frame, use_cextxyz=True)
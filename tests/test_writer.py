@@ -0,0 +1,273 @@
+"""``extxyz.Writer`` keeps one file and the C writer state open across frames.
+
+It must write exactly what ``write_dicts`` writes — frame by frame, including
+when the column layout changes between frames (the cached Properties header is
+rebuilt) — whether it goes through the C-API ``_extxyz.Writer`` or the ctypes
+fallback. ``write_batch`` writes frames held as concatenated columns, with
+the same bytes as ``write_dicts`` of the equivalent ``Frame`` objects.
+"""
+import numpy as np
+import pytest
+
+from extxyz import (Frame, Writer, cextxyz, read_dicts, write_batch,
+                    write_dicts)
+
+
+def _frames():
+    rng = np.random.default_rng(3)
+    frames = []
+    for i, n in enumerate([3, 5, 4]):
+        arrays = {"species": rng.choice(["H", "C", "Cu"], size=n),
+                  "pos": rng.random((n, 3)) * 10,
+                  "tags": np.arange(n, dtype=np.int64)}
+        if i == 1:  # a different column layout mid-trajectory
+            arrays["forces"] = rng.standard_normal((n, 3))
+            arrays["fixed"] = rng.random(n) > 0.5
+        info = {"step": i, "energy": -1.5 * i, "converged": bool(i % 2),
+                "label": f"config {i}", "stress": rng.random((3, 3)),
+                "kinds": ["a", "bb"], "dipole": [0.1, 0.2, 0.3]}
+        frames.append(Frame(natoms=n, cell=np.eye(3) * (5 + i),
+                            pbc=np.array([True, True, i != 2]),
+                            info=info, arrays=arrays))
+    return frames
+
+
+def test_matches_write_dicts(tmp_path, backend):
+    frames = _frames()
+    ref, out = tmp_path / "ref.xyz", tmp_path / "out.xyz"
+    write_dicts(ref, frames, use_cextxyz=True)
+    with Writer(out) as w:
+        for frame in frames:
+            w.write(frame)
+    assert out.read_bytes() == ref.read_bytes()
+
+
+def test_write_many_and_append(tmp_path, backend):
+    frames = _frames()
+    ref, out = tmp_path / "ref.xyz", tmp_path / "out.xyz"
+    write_dicts(ref, frames + frames, use_cextxyz=True)
+    with Writer(out) as w:
+        w.write(frames)
+    with Writer(out, "a") as w:
+        w.write(iter(frames))
+    assert out.read_bytes() == ref.read_bytes()
+    assert len(read_dicts(out)) == 6
+
+
+def test_format_dict_and_columns(tmp_path, backend):
+    frames = _frames()[:1]
+    kw = dict(columns=["species", "tags", "pos"], format_dict={"R": "%.3f"})
+    ref, out = tmp_path / "ref.xyz", tmp_path / "out.xyz"
+    write_dicts(ref, frames, use_cextxyz=True, **kw)
+    with Writer(out, **kw) as w:
+        w.write(frames[0])
+    assert out.read_bytes() == ref.read_bytes()
+    assert "Properties=species:S:1:tags:I:1:pos:R:3" in out.read_text()
+
+
+def test_flush_makes_frames_visible(tmp_path, backend):
+    out = tmp_path / "out.xyz"
+    w = Writer(out)
+    w.write(_frames()[0])
+    w.flush()
+    assert read_dicts(out).natoms == 3
+    w.close()
+    w.close()  # idempotent
+    assert w.closed
+    with pytest.raises(ValueError):
+        w.write(_frames()[0])
+
+
+def test_bad_value_writes_nothing(tmp_path):
+    if not cextxyz._HAVE_C_WRITER:
+        pytest.skip("_extxyz built without the C-API writer")
+    frame = _frames()[0]
+    bad = Frame(natoms=frame.natoms, cell=frame.cell, pbc=frame.pbc,
+                info={"obj": object()}, arrays=frame.arrays)
+    out = tmp_path / "out.xyz"
+    with Writer(out) as w:
+        w.write(frame)
+        with pytest.raises(TypeError):
+            w.write(bad)
+        w.write(frame)
+    assert len(read_dicts(out)) == 2
+
+
+@pytest.mark.parametrize("last", ["short", "complex", "3d"])
+def test_bad_last_column_of_large_frame_writes_nothing(tmp_path, backend,
+                                                       last):
+    # well over the writer's 32 KB output blocks before the bad column
+    n = 2000
+    bad = {"short": np.zeros(n - 1), "complex": np.zeros(n, complex),
+           "3d": np.zeros((n, 2, 2))}[last]
+    frame = Frame(natoms=n, cell=np.eye(3), pbc=np.array([True] * 3),
+                  info={}, arrays={"species": np.array(["H"] * n),
+                                   "pos": np.ones((n, 3)), "bad": bad})
+    good = _frames()[0]
+    out = tmp_path / "out.xyz"
+    with Writer(out) as w:
+        w.write(good)
+        with pytest.raises((TypeError, ValueError)):
+            w.write(frame)
+        w.write(good)
+    assert len(read_dicts(out)) == 2
+    with pytest.raises((TypeError, ValueError)):
+        write_dicts(out, frame, use_cextxyz=True)
+
+
+def test_bad_mode(tmp_path):
+    with pytest.raises(ValueError):
+        Writer(tmp_path / "out.xyz", "r")
+
+
+def test_async_matches_sync(tmp_path, backend):
+    frames = _frames() * 5
+    ref, out = tmp_path / "ref.xyz", tmp_path / "out.xyz"
+    write_dicts(ref, frames, use_cextxyz=True)
+    with Writer(out, async_=True, queue_depth=2) as w:
+        for frame in frames:
+            w.write(frame)
+    assert out.read_bytes() == ref.read_bytes()
+
+
+def test_async_snapshots_frames(tmp_path, backend):
+    """Arrays updated in place after write() (an MD step) must not leak into
+    frames still waiting in the queue."""
+    frame = _frames()[0]
+    expected = []
+    with Writer(tmp_path / "out.xyz", async_=True, queue_depth=8) as w:
+        for step in range(20):
+            frame.arrays["pos"] += 1.0
+            frame.info["step"] = step
+            expected.append(frame.arrays["pos"].copy())
+            w.write(frame)
+    back = read_dicts(tmp_path / "out.xyz")
+    assert [f.info["step"] for f in back] == list(range(20))
+    for got, want in zip(back, expected):
+        np.testing.assert_allclose(got.arrays["pos"], want, atol=1e-8)
+
+
+def test_async_flush_and_batch(tmp_path, backend):
+    out = tmp_path / "out.xyz"
+    w = Writer(out, async_=True)
+    w.write(_frames())
+    ptr = np.array([0, 2, 5])
+    w.write_batch({"species": np.array(["H"] * 5), "pos": np.zeros((5, 3))},
+                  ptr, cell=np.eye(3), pbc=[True] * 3)
+    w.flush()
+    assert len(read_dicts(out)) == 5
+    w.close()
+    assert w.closed
+
+
+def test_async_error_surfaces(tmp_path):
+    frame = _frames()[0]
+    bad = Frame(natoms=frame.natoms, cell=frame.cell, pbc=frame.pbc,
+                info={"obj": object()}, arrays=frame.arrays)
+    w = Writer(tmp_path / "out.xyz", async_=True)
+    w.write(bad)
+    with pytest.raises(TypeError):
+        w.flush()
+    with pytest.raises(TypeError):
+        w.write(frame)
+    with pytest.raises(TypeError):
+        w.close()
+    assert w.closed
+
+
+def test_async_bad_queue_depth(tmp_path):
+    with pytest.raises(ValueError):
+        Writer(tmp_path / "out.xyz", async_=True, queue_depth=0)
+
+
+def _batch(nats=(3, 1, 4, 2)):
+    rng = np.random.default_rng(7)
+    total, nframes = sum(nats), len(nats)
+    frame_ptr = np.concatenate([[0], np.cumsum(nats)])
+    arrays = {"pos": rng.random((total, 3)) * 10,
+              "species": rng.choice(["H", "O", "Cu"], size=total),
+              "charge": rng.standard_normal(total),
+              "tags": np.arange(total, dtype=np.int64),
+              "fixed": rng.random((total, 3)) > 0.5}
+    info = {"energy": rng.standard_normal(nframes),
+            "step": np.arange(nframes),
+            "label": np.array([f"cfg{k}" for k in range(nframes)]),
+            "converged": np.arange(nframes) % 2 == 0,
+            "dipole": rng.random((nframes, 3)),
+            "virial": rng.random((nframes, 3, 3))}
+    cell = rng.random((nframes, 3, 3)) + np.eye(3) * 5
+    pbc = np.array([[True, True, k % 2 == 0] for k in range(nframes)])
+    return arrays, frame_ptr, info, cell, pbc
+
+
+def _batch_frames(arrays, frame_ptr, info, cell, pbc):
+    frames = []
+    for k in range(len(frame_ptr) - 1):
+        a, b = frame_ptr[k], frame_ptr[k + 1]
+        frames.append(Frame(
+            natoms=int(b - a), cell=cell[k], pbc=pbc[k],
+            info={key: (v[k].item() if v[k].ndim == 0 else v[k])
+                  for key, v in info.items()},
+            arrays={key: v[a:b] for key, v in arrays.items()}))
+    return frames
+
+
+def test_batch_matches_write_dicts(tmp_path, backend):
+    batch = _batch()
+    ref, out = tmp_path / "ref.xyz", tmp_path / "out.xyz"
+    write_dicts(ref, _batch_frames(*batch), use_cextxyz=True)
+    write_batch(out, *batch)
+    assert out.read_bytes() == ref.read_bytes()
+    back = read_dicts(out)
+    assert [f.natoms for f in back] == [3, 1, 4, 2]
+    assert list(back[2].arrays["species"]) == list(batch[0]["species"][4:8])
+
+
+def test_batch_shared_cell_columns_and_format(tmp_path, backend):
+    arrays, frame_ptr, info, cell, pbc = _batch()
+    kw = dict(columns=["species", "pos", "tags"], format_dict={"R": "%.4f"})
+    ref, out = tmp_path / "ref.xyz", tmp_path / "out.xyz"
+    frames = _batch_frames(arrays, frame_ptr, {},
+                     np.broadcast_to(cell[0], cell.shape), pbc)
+    write_dicts(ref, frames, use_cextxyz=True, **kw)
+    write_batch(out, arrays, frame_ptr, cell=cell[0], pbc=pbc, **kw)
+    assert out.read_bytes() == ref.read_bytes()
+
+
+def test_batch_no_cell_or_pbc(tmp_path, backend):
+    arrays, frame_ptr, _, _, _ = _batch()
+    out = tmp_path / "out.xyz"
+    write_batch(out, arrays, frame_ptr)
+    text = out.read_text()
+    assert "Lattice" not in text and "pbc" not in text
+    assert len(read_dicts(out)) == 4
+
+
+def test_batch_writer_append(tmp_path, backend):
+    batch = _batch()
+    ref, out = tmp_path / "ref.xyz", tmp_path / "out.xyz"
+    write_dicts(ref, _batch_frames(*batch) * 2, use_cextxyz=True)
+    with Writer(out) as w:
+        w.write_batch(*batch)
+    write_batch(out, *batch, append=True)
+    assert out.read_bytes() == ref.read_bytes()
+
+
+@pytest.mark.parametrize("frame_ptr", [[0, 3, 2, 10], [-1, 5, 10], []])
+def test_batch_bad_frame_ptr(tmp_path, backend, frame_ptr):
+    arrays = {"pos": np.zeros((10, 3))}
+    with pytest.raises(ValueError):
+        write_batch(tmp_path / "out.xyz", arrays, frame_ptr)
+
+
+@pytest.mark.parametrize("frame_ptr", [[0, 5, 10], [0, 2, 5]])
+def test_batch_column_length_mismatch(tmp_path, backend, frame_ptr):
+    arrays = {"species": np.array(["H"] * 3), "pos": np.zeros((3, 3))}
+    out = tmp_path / "out.xyz"
+    message = f"column 'species' has 3 rows, expected {frame_ptr[-1]}"
+    with pytest.raises(ValueError, match=message):
+        write_batch(out, arrays, frame_ptr)
+    with Writer(out, verbose=1) as w:
+        with pytest.raises(ValueError, match="has 3 rows"):
+            w.write_batch(arrays, frame_ptr)
+    assert out.read_bytes() == b""